@@ -0,0 +1,87 @@
+"""
+Atomic replacement of the files written by the sync, converter and generators.
+
+Each file is written to a temporary file next to it, then moved over it in
+one rename, so a reader never sees a partly written file:
+
+    temp_file = create_temp_file(path)
+    with temp_file:
+        temp_file.write(content)
+    replace_file(Path(temp_file.name), path)
+
+Temporary files are created with mode 0600. replace_file gives them the
+mode of the file they replace, or the mode a plain open() would have
+given a new file (0666 without the bits of the umask), before the rename.
+"""
+
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import IO, Any
+
+TEMP_SUFFIX = ".part"
+
+
+def get_umask() -> int:
+    """Return the umask of the process (setting it is the only way to read it)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# Read once at import, before any thread is started
+NEW_FILE_MODE = 0o666 & ~get_umask()
+
+
+def create_temp_file(path: Path, mode: str = "w+b", **kwargs: Any) -> IO[Any]:
+    """
+    Create the temporary file that ``path`` will be replaced with, in the same directory.
+
+    The file is named ``.<name>.<random>.part`` and is not deleted on close.
+    """
+    return tempfile.NamedTemporaryFile(
+        mode, dir=path.parent, prefix=f".{path.name}.", suffix=TEMP_SUFFIX, delete=False, **kwargs
+    )
+
+
+def replace_file(temp_path: Path, path: Path) -> None:
+    """
+    Move a fully written temporary file over ``path``, keeping the mode of the file it replaces.
+
+    Examples:
+        >>> directory = Path(tempfile.mkdtemp())
+        >>> path = directory / "controls.csv"
+        >>> temp_file = create_temp_file(path)
+        >>> with temp_file:
+        ...     _ = temp_file.write(b"ID,Name\\n")
+        >>> replace_file(Path(temp_file.name), path)
+        >>> stat.S_IMODE(path.stat().st_mode) == NEW_FILE_MODE, path.read_bytes()
+        (True, b'ID,Name\\n')
+        >>> path.chmod(0o640)
+        >>> temp_file = create_temp_file(path)
+        >>> temp_file.close()
+        >>> replace_file(Path(temp_file.name), path)
+        >>> oct(stat.S_IMODE(path.stat().st_mode)), [p.name for p in directory.iterdir()]
+        ('0o640', ['controls.csv'])
+    """
+    try:
+        file_mode = stat.S_IMODE(path.stat().st_mode)
+    except OSError:
+        file_mode = NEW_FILE_MODE
+    os.chmod(temp_path, file_mode)
+    os.replace(temp_path, path)
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py, csv2yaml.py and the page generators.")
+    print("Run it with --doctests to verify functionality.")
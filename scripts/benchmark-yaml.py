@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+YAML Benchmark for Secure Product Framework
+
+This script measures how much faster the libyaml-backed load and dump of
+yaml_io.py are than pure-Python PyYAML, on data/controls.yml scaled up to
+a large number of entries. It also checks that both dumpers produce
+byte-identical output.
+
+Usage:
+    ./scripts/benchmark-yaml.py [--entries N] [--repeat N] [--help] [--doctests]
+
+Options:
+    --entries  Number of controls in the scaled document (default: 100000)
+    --repeat   Runs of each measurement; the fastest one is reported (default: 1)
+    --help     Show this help message and exit
+    --doctests Run doctests and exit
+
+Examples:
+    ./scripts/benchmark-yaml.py
+        Benchmark load and dump of 100k controls
+
+    ./scripts/benchmark-yaml.py --entries 10000 --repeat 3
+        Quicker run on 10k controls, best of three
+
+    ./scripts/benchmark-yaml.py --doctests
+        Run all doctests to verify functionality
+"""
+
+import copy
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from yaml_io import LIBYAML, dump_yaml, load_yaml, load_yaml_file
+
+DEFAULT_ENTRIES = 100000
+DEFAULT_REPEAT = 1
+
+
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Examples:
+        >>> get_option_value(["benchmark-yaml.py", "--entries", "500"], "--entries")
+        '500'
+        >>> get_option_value(["benchmark-yaml.py"], "--repeat") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def scale_controls(data: Dict[str, Any], entries: int) -> Dict[str, Any]:
+    """
+    Repeat the controls of a controls.yml document until there are ``entries``.
+
+    Copies get a numbered ID and slug so every entry stays unique.
+
+    Examples:
+        >>> data = {"controls": [{"id": "C1", "slug": "rbac"}], "meta": {"count": 1}}
+        >>> scaled = scale_controls(data, 3)
+        >>> [control["id"] for control in scaled["controls"]]
+        ['C1', 'C1-1', 'C1-2']
+        >>> scaled["meta"]["count"]
+        3
+    """
+    source = data["controls"]
+    controls = []
+    for index in range(entries):
+        control = copy.deepcopy(source[index % len(source)])
+        round_number = index // len(source)
+        if round_number:
+            control["id"] = f"{control['id']}-{round_number}"
+            control["slug"] = f"{control['slug']}-{round_number}"
+        controls.append(control)
+    return {**data, "controls": controls, "meta": {**data["meta"], "count": entries}}
+
+
+def best_time(function: Callable[[], Any], repeat: int) -> float:
+    """
+    Return the fastest of ``repeat`` runs of a function, in seconds.
+
+    Examples:
+        >>> best_time(lambda: None, 2) >= 0
+        True
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def format_row(label: str, pure: float, accelerated: float) -> str:
+    """
+    Format one line of the results table.
+
+    Examples:
+        >>> format_row("load", 10.0, 1.0)
+        'load        10.00s        1.00s     10.0x'
+    """
+    return f"{label:<6} {pure:>10.2f}s {accelerated:>11.2f}s {pure / accelerated:>8.1f}x"
+
+
+def show_help() -> None:
+    """
+    Display help information.
+
+    Examples:
+        >>> import io
+        >>> old_stdout = sys.stdout
+        >>> sys.stdout = captured_output = io.StringIO()
+        >>> show_help()
+        >>> sys.stdout = old_stdout
+        >>> output = captured_output.getvalue()
+        >>> "YAML Benchmark for Secure Product Framework" in output
+        True
+        >>> "Usage:" in output
+        True
+    """
+    print(__doc__)
+
+
+def parse_positive_int(option: str, default: int) -> int:
+    """Return the positive integer given to an option, or the default."""
+    value = get_option_value(sys.argv, option)
+    if value is None:
+        return default
+    if not value.isdigit() or int(value) < 1:
+        print(f"❌ Error: {option} must be a positive integer, got '{value}'")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return int(value)
+
+
+def main() -> None:
+    """Main function to run the benchmark."""
+    if "--help" in sys.argv or "-h" in sys.argv:
+        show_help()
+        sys.exit(0)
+
+    entries = parse_positive_int("--entries", DEFAULT_ENTRIES)
+    repeat = parse_positive_int("--repeat", DEFAULT_REPEAT)
+
+    project_root = Path(__file__).parent.parent
+    controls_file = project_root / "data" / "controls.yml"
+    if not controls_file.exists():
+        print(f"❌ Error: {controls_file} not found")
+        print("💡 Tip: Run ./scripts/csv2yaml.py controls first to generate it")
+        sys.exit(1)
+
+    if not LIBYAML:
+        print("⚠️  PyYAML was built without libyaml: both paths are pure Python")
+
+    print(f"⏱️  Scaling {controls_file.name} to {entries} controls...")
+    data = scale_controls(load_yaml_file(controls_file), entries)
+
+    pure_text = dump_yaml(data, pure=True)
+    accelerated_text = dump_yaml(data)
+    print(f"📄 Document size: {len(pure_text.encode('utf-8')) / 1e6:.1f} MB")
+
+    dump_pure = best_time(lambda: dump_yaml(data, pure=True), repeat)
+    dump_accelerated = best_time(lambda: dump_yaml(data), repeat)
+    load_pure = best_time(lambda: load_yaml(pure_text, pure=True), repeat)
+    load_accelerated = best_time(lambda: load_yaml(pure_text), repeat)
+
+    print()
+    print(f"{'':<6} {'pure Python':>11} {'libyaml':>12} {'speed-up':>9}")
+    print(format_row("load", load_pure, load_accelerated))
+    print(format_row("dump", dump_pure, dump_accelerated))
+    print()
+
+    if pure_text == accelerated_text and load_yaml(pure_text) == data:
+        print("✅ Both dumpers produced byte-identical output")
+    else:
+        print("❌ The dumpers produced different output")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    main()
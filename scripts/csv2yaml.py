@@ -6,13 +6,18 @@ This script converts Control Framework CSV files to structured YAML format
 suitable for Hugo data files. Supports individual sheet conversion or all at once.
 
 Usage:
-    ./scripts/csv2yaml.py [SHEET] [--help] [--doctests]
+    ./scripts/csv2yaml.py [SHEET...] [--jobs N] [--mmap] [--shards] [--help] [--doctests]
 
 Arguments:
-    SHEET     Optional sheet to convert: assets, controls, governance
+    SHEET     Optional sheets to convert: assets, controls, governance
               If not specified, converts all CSV files
 
 Options:
+    --jobs     Number of sheets converted in parallel, each in its own process
+               (default: one per sheet, up to the number of CPUs)
+    --mmap     Read the CSV files through a memory map (for very large exports)
+    --shards   Also write one YAML file per category of controls and governance
+               (data/controls/network.yml), with an index of their counts and hashes
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -34,6 +39,15 @@ Examples:
     ./scripts/csv2yaml.py governance
         Convert only the Governance CSV to YAML
 
+    ./scripts/csv2yaml.py --jobs 1
+        Convert all CSV files one after another, in a single process
+
+    ./scripts/csv2yaml.py controls --mmap
+        Convert a very large Controls CSV through a memory map
+
+    ./scripts/csv2yaml.py controls --shards
+        Convert the Controls CSV and split it by category under data/controls/
+
     ./scripts/csv2yaml.py --doctests
         Run all doctests to verify functionality
 
@@ -42,23 +56,118 @@ The script will:
 2. Convert to structured YAML format
 3. Save as YAML file(s) in data/ directory
 4. Validate the conversion and provide feedback
+
+Rows are streamed: each one is read, converted and written as a YAML list
+item before the next one is read, so memory use stays flat however large
+the sheet is. The meta block, with the item count, follows the items.
+
+Items are keyed by ID (the asset name for assets) and hashed. Each run
+writes data/<sheet>.changes.json with the IDs added, removed and modified
+since the previous run; unchanged items are copied from the previous YAML
+file, and a YAML file without changes is not rewritten.
+
+Free-text control fields are also parsed once, here, next to their text:
+details_outline and inventory_outline hold the lines of multi-line cells
+with the bullets nested under them, parameters_parsed holds each parameter
+with its framework and required quantity ({"name": "timeout", "framework":
+"PCI", "requirement": "<= 15min", "operator": "<=", "value": 15, "unit":
+"minutes"}), and tested_on_assets lists the asset names.
+
+Slugs are unique within the output directory of their pages: a slug taken
+by an earlier item gets a numbered suffix ("pen-testing-2"). The slugs are
+saved in data/<sheet>.slugs.json, and items whose title did not change keep
+their slug on the next run, however the sheet is reordered.
+
+The items are also written to a binary model cache,
+data/.csv2yaml/<sheet>.model, headed by the hash of the YAML file. The page
+generators load it instead of parsing the YAML while the hashes match.
+
+With --shards, the controls and governance items are also split by
+category into data/<sheet>/<category>.yml, listed with their item counts
+and hashes in data/<sheet>/index.json. Only the shards whose content
+changed are rewritten.
 """
 
 import csv
-import yaml
+import io
+import mmap
 import os
 import sys
 import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import ExitStack, contextmanager, redirect_stdout
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from dataclasses import dataclass
 
+from atomic_files import create_temp_file, replace_file
+from row_index import (
+    ItemIndex,
+    ItemKeys,
+    build_changeset,
+    file_sha256,
+    get_changeset_path,
+    item_hash,
+    load_index,
+    save_index,
+    write_json_atomic,
+)
+from data_shards import ShardWriter, get_shard_dir
+from model_cache import ModelCacheWriter
+from slug_registry import SlugRegistry, category_of, get_slugs_path, load_slugs, slugify
+from yaml_io import dump_yaml
+
+# Options that take a value (used to tell option values apart from sheet names)
+VALUE_OPTIONS = ["--jobs"]
+
+
+# Kinds of field values: cleaned text, comma-separated list, bullet notes,
+# an outline of the cell's lines, parsed parameters, and a slug derived from
+# other fields
+TEXT = "text"
+LIST = "list"
+NOTES = "notes"
+OUTLINE = "outline"
+PARAMETERS = "parameters"
+SLUG = "slug"
+
+# Section header rows, e.g. "[[ Identity ]]" in the ID column
+SECTION_HEADER_RE = re.compile(r"^\s*\[\[\s+.+\s+\]\]\s*$", re.DOTALL)
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """
+    One key of the YAML items of a sheet and where its value comes from.
+
+    Examples:
+        >>> FieldSpec("tags", "Tags", LIST).keep_empty
+        False
+        >>> FieldSpec("slug", kind=SLUG, slug_of=("name",)).column is None
+        True
+    """
+
+    key: str
+    column: Optional[str] = None
+    kind: str = TEXT
+    # Write the key even when its value is empty
+    keep_empty: bool = False
+    # For SLUG fields: keys whose first non-empty value the slug is made of
+    slug_of: Tuple[str, ...] = ()
+
 
 @dataclass
 class SheetConverter:
     """
     Configuration for converting a specific CSV sheet to YAML.
 
+    ``fields`` lists the keys of each item in output order. Rows whose
+    ``required`` field is empty are skipped, and so are section header rows
+    when ``skip_section_headers`` is set. ``slug_namespace`` is the output
+    directory of the item pages, where slugs must be unique; ``{category}``
+    stands for the category of the item's ID.
+
     Examples:
         >>> converter = SheetConverter("assets", "Control Framework - Assets.csv", "assets.yml", "Assets")
         >>> converter.sheet_name
@@ -75,27 +184,76 @@ class SheetConverter:
     csv_filename: str
     yaml_filename: str
     title: str
+    description: str = ""
+    fields: Tuple[FieldSpec, ...] = ()
+    required: str = ""
+    skip_section_headers: bool = False
+    slug_namespace: str = ""
 
 
-# Configuration for all supported sheet conversions
+# Configuration for all supported sheet conversions. A new framework sheet
+# only needs an entry here: its CSV columns, the YAML key of each and how the
+# values are transformed.
 SHEET_CONVERTERS: Dict[str, SheetConverter] = {
     "assets": SheetConverter(
         sheet_name="assets",
         csv_filename="Control Framework - Assets.csv",
         yaml_filename="assets.yml",
         title="Secure Product Model Assets",
+        description="Foundational elements subject to control and oversight",
+        fields=(
+            FieldSpec("name", "Asset"),
+            FieldSpec("description", "Description", keep_empty=True),
+            FieldSpec("category", "Category"),
+            FieldSpec("tags", "Tags", LIST),
+            FieldSpec("notes", "Notes", NOTES),
+            FieldSpec("slug", kind=SLUG, slug_of=("name",), keep_empty=True),
+        ),
+        required="name",
+        slug_namespace="assets/",
     ),
     "controls": SheetConverter(
         sheet_name="controls",
         csv_filename="Control Framework - Controls.csv",
         yaml_filename="controls.yml",
         title="Secure Product Model Controls",
+        description="Security controls and measures for the product framework",
+        fields=(
+            FieldSpec("id", "ID"),
+            FieldSpec("name", "Title", keep_empty=True),
+            FieldSpec("slug", kind=SLUG, slug_of=("name", "id"), keep_empty=True),
+            FieldSpec("details", "Description"),
+            FieldSpec("details_outline", "Description", OUTLINE),
+            FieldSpec("parameters", "Parameters"),
+            FieldSpec("parameters_parsed", "Parameters", PARAMETERS),
+            FieldSpec("inventory", "Inventory"),
+            FieldSpec("inventory_outline", "Inventory", OUTLINE),
+            FieldSpec("control_type", "Control type"),
+            FieldSpec("tested_on_asset_inventory", "Tested on asset inventory"),
+            FieldSpec("tested_on_assets", "Tested on asset inventory", LIST),
+            FieldSpec("compliance_frameworks", "Compliance Frameworks", LIST),
+        ),
+        required="id",
+        skip_section_headers=True,
+        slug_namespace="controls/{category}/",
     ),
     "governance": SheetConverter(
         sheet_name="governance",
         csv_filename="Control Framework - Governance.csv",
         yaml_filename="governance.yml",
         title="Secure Product Model Governance",
+        description="Governance policies and expectations for the product framework",
+        fields=(
+            FieldSpec("id", "ID"),
+            FieldSpec("title", "Title", keep_empty=True),
+            FieldSpec("slug", kind=SLUG, slug_of=("title", "id"), keep_empty=True),
+            FieldSpec("description", "Description"),
+            FieldSpec("notes", "Notes"),
+            FieldSpec("compliance_frameworks", "Compliance Frameworks", LIST),
+        ),
+        required="id",
+        skip_section_headers=True,
+        slug_namespace="governance/{category}/",
     ),
 }
 
@@ -120,41 +278,9 @@ def clean_text(text: Optional[str]) -> str:
     """
     if not text:
         return ""
-    # Replace newlines and carriage returns with spaces, then normalize whitespace
-    import re
-
-    cleaned = text.strip().replace("\n", " ").replace("\r", " ")
-    return re.sub(r"\s+", " ", cleaned)
-
-
-def create_slug(name: str) -> str:
-    """
-    Generate a URL-friendly slug from a name.
-
-    Examples:
-        >>> create_slug("Cloud Environment")
-        'cloud-environment'
-        >>> create_slug("Secrets and Certificates")
-        'secrets-and-certificates'
-        >>> create_slug("PCI Sensitive (SAD, PAN)")
-        'pci-sensitive-sad-pan'
-        >>> create_slug("Self-developed services")
-        'self-developed-services'
-        >>> create_slug("Third-Party reports")
-        'third-party-reports'
-        >>> create_slug("Users")
-        'users'
-        >>> create_slug("RBAC")
-        'rbac'
-    """
-    return (
-        name.lower()
-        .replace(" ", "-")
-        .replace(",", "")
-        .replace("(", "")
-        .replace(")", "")
-        .replace("/", "-")
-    )
+    # Splitting on any whitespace trims, and turns newlines and runs of spaces
+    # into single spaces
+    return " ".join(text.split())
 
 
 def parse_notes(notes_text: Optional[str]) -> List[str]:
@@ -195,224 +321,626 @@ def parse_notes(notes_text: Optional[str]) -> List[str]:
     return [note for note in notes if note]  # Remove empty strings
 
 
-def convert_assets_csv(csv_file_path: Path) -> Dict[str, Any]:
-    """Convert Assets CSV to YAML structure."""
-    assets: List[Dict[str, Any]] = []
+def split_list(text: Optional[str]) -> List[str]:
+    """
+    Split comma-separated text into a list of cleaned, non-empty entries.
+
+    Examples:
+        >>> split_list(" ISO 27001, SOC 2 ,, PCI DSS")
+        ['ISO 27001', 'SOC 2', 'PCI DSS']
+        >>> split_list("")
+        []
+    """
+    return [entry.strip() for entry in clean_text(text).split(",") if entry.strip()]
+
+
+def clean_notes(text: Optional[str]) -> List[str]:
+    """
+    Clean text and parse it into a list of bullet points.
 
-    with open(csv_file_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
+    Examples:
+        >>> clean_notes("- First\\n- Second")
+        ['First', 'Second']
+    """
+    return parse_notes(clean_text(text))
 
-        for row in reader:
-            # Extract and clean data
-            name = clean_text(row.get("Asset", ""))
-            if not name:  # Skip empty rows
-                continue
 
-            description = clean_text(row.get("Description", ""))
-            notes_raw = clean_text(row.get("Notes", ""))
-            category = clean_text(row.get("Category", ""))
-            tags_raw = clean_text(row.get("Tags", ""))
+def parse_outline(text: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Parse the lines of a multi-line cell into an outline of entries and their items.
 
-            # Create asset object
-            asset: Dict[str, Any] = {"name": name, "description": description}
+    Unindented lines start an entry. Indented lines, and bullets following
+    a line that is not a bullet, are items of the entry above them. A cell
+    of a single line has no outline: its text says it all.
 
-            # Add category if present
-            if category:
-                asset["category"] = category
+    Examples:
+        >>> parse_outline("Users:\\n  Field: account status\\nLockout History:\\n  IT tickets")
+        [{'text': 'Users:', 'items': ['Field: account status']}, {'text': 'Lockout History:', 'items': ['IT tickets']}]
+        >>> parse_outline("Ideally:\\n- Network\\nAlternative:\\n- check logs\\n- tickets")
+        [{'text': 'Ideally:', 'items': ['Network']}, {'text': 'Alternative:', 'items': ['check logs', 'tickets']}]
+        >>> parse_outline("- Allow 443 only\\n- Exceptions require confirmation")
+        [{'text': 'Allow 443 only'}, {'text': 'Exceptions require confirmation'}]
+        >>> parse_outline("Only use personal accounts")
+        []
+    """
+    if not text or "\n" not in text.strip():
+        return []
 
-            # Parse tags into list if present
-            if tags_raw:
-                tags = [tag.strip() for tag in tags_raw.split(",") if tag.strip()]
-                if tags:
-                    asset["tags"] = tags
+    outline: List[Dict[str, Any]] = []
+    heading: Optional[Dict[str, Any]] = None
+    for line in text.splitlines():
+        indented = line[:1].isspace()
+        line = line.strip()
+        bullet = line.startswith("-")
+        line = clean_text(line[1:] if bullet else line)
+        if not line:
+            continue
+        if heading is not None and (indented or bullet):
+            heading.setdefault("items", []).append(line)
+            continue
+        entry: Dict[str, Any] = {"text": line}
+        outline.append(entry)
+        # Bullets only nest under a line that is not a bullet itself
+        heading = None if bullet else entry
+    return outline
+
+
+# Frequencies written as words, as a number of units
+FREQUENCY_WORDS = {
+    "daily": (1, "days"),
+    "weekly": (1, "weeks"),
+    "monthly": (1, "months"),
+    "quarterly": (3, "months"),
+    "yearly": (1, "years"),
+    "annually": (1, "years"),
+}
 
-            # Parse notes into list if present
-            notes = parse_notes(notes_raw)
-            if notes:
-                asset["notes"] = notes
+# Spellings of the units of a parameter requirement
+UNIT_NAMES = {
+    "min": "minutes", "mins": "minutes", "minute": "minutes", "minutes": "minutes",
+    "h": "hours", "hour": "hours", "hours": "hours",
+    "day": "days", "days": "days",
+    "week": "weeks", "weeks": "weeks",
+    "month": "months", "months": "months",
+    "year": "years", "years": "years",
+}
 
-            # Generate slug for URL-friendly reference
-            asset["slug"] = create_slug(name)
+# "[PCI <= 15min]": a framework and what it requires of a parameter
+PARAMETER_REQUIREMENT_RE = re.compile(r"\[\s*(?P<framework>[A-Za-z][\w-]*)\s+(?P<requirement>[^\]]+?)\s*\]")
+QUANTITY_RE = re.compile(r"^(?P<operator><=|>=|<|>|=)?\s*(?P<value>\d+(?:\.\d+)?)\s*(?P<unit>[A-Za-z]+)?$")
 
-            assets.append(asset)
 
-    return {
-        "assets": assets,
-        "meta": {
-            "title": "Secure Product Model Assets",
-            "description": "Foundational elements subject to control and oversight",
-            "count": len(assets),
-            "source": "Control Framework - Assets.csv",
-            "generated_by": "csv2yaml.py",
-        },
-    }
+def parse_requirement(requirement: str) -> Dict[str, Any]:
+    """
+    Parse the requirement of a parameter into an operator, a number and a unit.
 
+    Requirements that are not a quantity ("based on TRA") keep only their text.
+
+    Examples:
+        >>> parse_requirement("<= 15min")
+        {'operator': '<=', 'value': 15, 'unit': 'minutes'}
+        >>> parse_requirement("90 days")
+        {'value': 90, 'unit': 'days'}
+        >>> parse_requirement("4")
+        {'value': 4}
+        >>> parse_requirement("quarterly")
+        {'value': 3, 'unit': 'months'}
+        >>> parse_requirement("based on TRA")
+        {}
+    """
+    word = FREQUENCY_WORDS.get(requirement.lower())
+    if word is not None:
+        return {"value": word[0], "unit": word[1]}
+
+    match = QUANTITY_RE.match(requirement)
+    if match is None:
+        return {}
+    unit = match.group("unit")
+    if unit is not None and unit.lower() not in UNIT_NAMES:
+        return {}
+
+    number = float(match.group("value"))
+    parsed: Dict[str, Any] = {}
+    if match.group("operator"):
+        parsed["operator"] = match.group("operator")
+    parsed["value"] = int(number) if number.is_integer() else number
+    if unit is not None:
+        parsed["unit"] = UNIT_NAMES[unit.lower()]
+    return parsed
+
+
+def parse_parameters(text: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Parse a Parameters cell into one entry per parameter and framework.
 
-def convert_controls_csv(csv_file_path: Path) -> Dict[str, Any]:
-    """Convert Controls CSV to YAML structure."""
-    controls: List[Dict[str, Any]] = []
-
-    with open(csv_file_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-
-        for row in reader:
-            # Extract and clean data
-            control_id = clean_text(row.get("ID", ""))
-            if not control_id:  # Skip empty rows
-                continue
-
-            # Skip section headers in format [[ .+ ]] (allowing whitespace/newlines)
-            if re.match(r"^\s*\[\[\s+.+\s+\]\]\s*$", control_id, re.DOTALL):
-                continue
-
-            title = clean_text(row.get("Title", ""))
-            description = clean_text(row.get("Description", ""))
-            parameters = clean_text(row.get("Parameters", ""))
-            inventory = clean_text(row.get("Inventory", ""))
-            control_type = clean_text(row.get("Control type", ""))
-            tested_on_asset = clean_text(row.get("Tested on asset inventory", ""))
-            compliance_frameworks = clean_text(row.get("Compliance Frameworks", ""))
-
-            # Create control object
-            control: Dict[str, Any] = {
-                "id": control_id,
-                "name": title,
-                "slug": create_slug(title) if title else create_slug(control_id),
-            }
-
-            # Add optional fields if they have content
-            if description:
-                control["details"] = description
-            if parameters:
-                control["parameters"] = parameters
-            if inventory:
-                control["inventory"] = inventory
-            if control_type:
-                control["control_type"] = control_type
-            if tested_on_asset:
-                control["tested_on_asset_inventory"] = tested_on_asset
-            if compliance_frameworks:
-                # Split by comma and clean up each framework
-                frameworks = [
-                    framework.strip()
-                    for framework in compliance_frameworks.split(",")
-                    if framework.strip()
-                ]
-                control["compliance_frameworks"] = frameworks
-
-            controls.append(control)
+    Each line names a parameter followed by what frameworks require of it,
+    e.g. "- min duration [PCI >= 30min]". The requirement is kept as written
+    for display, next to its parsed quantity.
 
-    return {
-        "controls": controls,
-        "meta": {
-            "title": "Secure Product Model Controls",
-            "description": "Security controls and measures for the product framework",
-            "count": len(controls),
-            "source": "Control Framework - Controls.csv",
-            "generated_by": "csv2yaml.py",
-        },
-    }
+    Examples:
+        >>> parse_parameters("- max failed attemps [PCI <= 10]\\n- min duration [PCI >= 30min]")
+        [{'name': 'max failed attemps', 'framework': 'PCI', 'requirement': '<= 10', 'operator': '<=', 'value': 10}, {'name': 'min duration', 'framework': 'PCI', 'requirement': '>= 30min', 'operator': '>=', 'value': 30, 'unit': 'minutes'}]
+        >>> parse_parameters("frequency [PCI based on TRA]")
+        [{'name': 'frequency', 'framework': 'PCI', 'requirement': 'based on TRA'}]
+        >>> parse_parameters("Retention period")
+        [{'name': 'Retention period'}]
+    """
+    parameters: List[Dict[str, Any]] = []
+    for line in (text or "").splitlines():
+        line = line.strip()
+        if line.startswith("-"):
+            line = line[1:]
+        line = clean_text(line)
+        if not line:
+            continue
+        requirements = list(PARAMETER_REQUIREMENT_RE.finditer(line))
+        if not requirements:
+            parameters.append({"name": line})
+            continue
+        name = clean_text(line[: requirements[0].start()])
+        for match in requirements:
+            requirement = clean_text(match.group("requirement"))
+            parameters.append({
+                "name": name,
+                "framework": match.group("framework"),
+                "requirement": requirement,
+                **parse_requirement(requirement),
+            })
+    return parameters
+
+
+# Transform of the cell of each kind of non-text field
+FIELD_TRANSFORMS: Dict[str, Callable[[str], Any]] = {
+    LIST: split_list,
+    NOTES: clean_notes,
+    OUTLINE: parse_outline,
+    PARAMETERS: parse_parameters,
+}
+
+
+def build_row_converter(
+    converter: SheetConverter, header: List[str]
+) -> Callable[[List[str]], Optional[Dict[str, Any]]]:
+    """
+    Build a function converting one CSV row of a sheet to its item, or None for rows to skip.
+
+    Column names are resolved to positions once, from the header row, into
+    one (key, column index, transform) step per field, so converting a row
+    is a single pass over the steps with no lookups by name. A field without
+    a column (a slug, or a column the sheet lacks) has no index, and its
+    transform is given the item built so far instead of a cell.
+
+    Examples:
+        >>> convert = build_row_converter(SHEET_CONVERTERS["controls"],
+        ...                               ["ID", "Title", "Compliance Frameworks"])
+        >>> convert(["C1", " Role  based access ", "ISO, SOC2"])
+        {'id': 'C1', 'name': 'Role based access', 'slug': 'role-based-access', 'compliance_frameworks': ['ISO', 'SOC2']}
+        >>> convert(["C2"])
+        {'id': 'C2', 'name': '', 'slug': 'c2'}
+        >>> convert(["[[ Identity ]]", "", ""]) is None
+        True
+        >>> convert(["", "Untitled", ""]) is None
+        True
+        >>> build_row_converter(SheetConverter("x", "x.csv", "x.yml", "X", fields=(
+        ...     FieldSpec("slug", kind=SLUG, slug_of=("id",)), FieldSpec("id", "ID"))), ["ID"])
+        Traceback (most recent call last):
+        ...
+        ValueError: slug field 'slug' must follow the fields it is made of
+    """
+    # Like csv.DictReader, the last of duplicate column names wins
+    positions = {name: index for index, name in enumerate(header)}
+    width = len(header)
+    steps: List[Tuple[str, Optional[int], Callable[[Any], Any]]] = []
+    keys: List[str] = []
+    for spec in converter.fields:
+        index = positions.get(spec.column) if spec.column else None
+        if spec.kind == SLUG:
+            if not set(spec.slug_of) <= set(keys):
+                raise ValueError(f"slug field '{spec.key}' must follow the fields it is made of")
+            transform = partial(slug_of_item, spec.slug_of)
+        elif index is None:
+            transform = partial(missing_column, spec.kind)
+        elif spec.kind == TEXT:
+            transform = clean_text
+        else:
+            transform = partial(parse_cell, FIELD_TRANSFORMS[spec.kind])
+        steps.append((spec.key, index, transform))
+        keys.append(spec.key)
+
+    required = converter.required
+    skip_section_headers = converter.skip_section_headers
+    keep_empty = {spec.key for spec in converter.fields if spec.keep_empty}
+
+    def convert_row(row: List[str]) -> Optional[Dict[str, Any]]:
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        item: Dict[str, Any] = {}
+        for key, index, transform in steps:
+            value = transform(item if index is None else row[index])
+            if key == required:
+                if not value or (skip_section_headers and SECTION_HEADER_RE.match(value)):
+                    return None
+                item[key] = value
+            elif value or key in keep_empty:
+                item[key] = value
+        return item
+
+    return convert_row
+
+
+def parse_cell(transform: Callable[[str], Any], cell: str) -> Any:
+    """Apply a field transform to a cell; empty cells, the common case, skip the call."""
+    return transform(cell) if cell else []
+
+
+def missing_column(kind: str, item: Dict[str, Any]) -> Any:
+    """Give the empty value of a field whose column the sheet lacks."""
+    return "" if kind == TEXT else []
+
+
+def slug_of_item(keys: Tuple[str, ...], item: Dict[str, Any]) -> str:
+    """
+    Make the slug of an item from the first of its fields that is set.
+
+    Examples:
+        >>> slug_of_item(("name", "id"), {"id": "C.Auth.MFA"})
+        'c-auth-mfa'
+    """
+    for key in keys:
+        if item.get(key):
+            return slugify(item[key])
+    return ""
+
+
+def iter_items(converter: SheetConverter, rows: Iterable[List[str]]) -> Iterator[Dict[str, Any]]:
+    """
+    Convert CSV rows (header row first) to the YAML items of a sheet, one at a time.
+
+    Examples:
+        >>> rows = [["Asset", "Description", "Tags"], ["Users", "People", "iam, people"], ["", "empty row", ""]]
+        >>> list(iter_items(SHEET_CONVERTERS["assets"], rows))
+        [{'name': 'Users', 'description': 'People', 'tags': ['iam', 'people'], 'slug': 'users'}]
+        >>> list(iter_items(SHEET_CONVERTERS["governance"], [["ID", "Title", "Notes"], ["G1", "Policy", "Yearly"]]))
+        [{'id': 'G1', 'title': 'Policy', 'slug': 'policy', 'notes': 'Yearly'}]
+        >>> list(iter_items(SHEET_CONVERTERS["assets"], []))
+        []
+    """
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return
+    convert_row = build_row_converter(converter, header)
+    for row in rows:
+        item = convert_row(row)
+        if item is not None:
+            yield item
+
+
+def assign_slugs(
+    converter: SheetConverter, items: Iterable[Dict[str, Any]], registry: SlugRegistry
+) -> Iterator[Dict[str, Any]]:
+    """
+    Replace the slug of each item with the one the registry hands out in its namespace.
+
+    Examples:
+        >>> items = [{"id": "C.Network.ExternalPENTesting", "slug": "pen-testing"},
+        ...          {"id": "C.Network.InternalPENTesting", "slug": "pen-testing"}]
+        >>> registry = SlugRegistry()
+        >>> [item["slug"] for item in assign_slugs(SHEET_CONVERTERS["controls"], items, registry)]
+        ['pen-testing', 'pen-testing-2']
+        >>> list(registry.mapping())
+        ['controls/network/']
+    """
+    slug_key = next((spec.key for spec in converter.fields if spec.kind == SLUG), None)
+    if slug_key is None or not converter.slug_namespace:
+        yield from items
+        return
+
+    by_category = "{category}" in converter.slug_namespace
+    keys = ItemKeys()
+    for item in items:
+        identifier = str(item[converter.required])
+        namespace = converter.slug_namespace
+        if by_category:
+            namespace = namespace.format(category=category_of(identifier))
+        item[slug_key] = registry.assign(namespace, keys.next(identifier), item[slug_key])
+        yield item
+
+
+@contextmanager
+def open_csv_lines(csv_file_path: Path, use_mmap: bool = False) -> Iterator[Iterable[str]]:
+    """
+    Open a CSV file as an iterable of text lines for csv.reader.
 
+    With ``use_mmap``, the file is memory-mapped and read line by line from
+    the mapping instead of through a buffered file object, which lets the OS
+    page very large exports in and out on demand.
 
-def convert_governance_csv(csv_file_path: Path) -> Dict[str, Any]:
-    """Convert Governance CSV to YAML structure."""
-    governance: List[Dict[str, Any]] = []
-
-    with open(csv_file_path, "r", encoding="utf-8") as csvfile:
-        reader = csv.DictReader(csvfile)
-
-        for row in reader:
-            # Extract and clean data
-            gov_id = clean_text(row.get("ID", ""))
-            if not gov_id:  # Skip empty rows
-                continue
-
-            # Skip section headers in format [[ .+ ]] (allowing whitespace/newlines)
-            if re.match(r"^\s*\[\[\s+.+\s+\]\]\s*$", gov_id, re.DOTALL):
-                continue
-
-            description = clean_text(row.get("Description", ""))
-            title = clean_text(row.get("Title", ""))
-            notes = clean_text(row.get("Notes", ""))
-            compliance_frameworks = clean_text(row.get("Compliance Frameworks", ""))
-
-            # Create governance object
-            governance_item: Dict[str, Any] = {
-                "id": gov_id,
-                "title": title,
-                "slug": create_slug(title) if title else create_slug(gov_id),
-            }
-
-            # Add optional fields if they have content
-            if description:
-                governance_item["description"] = description
-            if notes:
-                governance_item["notes"] = notes
-            if compliance_frameworks:
-                # Split by comma and clean up each framework
-                frameworks = [
-                    framework.strip()
-                    for framework in compliance_frameworks.split(",")
-                    if framework.strip()
-                ]
-                governance_item["compliance_frameworks"] = frameworks
-
-            governance.append(governance_item)
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     path = Path(tmp) / "a.csv"
+        ...     _ = path.write_bytes(b"ID,Name\\r\\nA,\\xc3\\x89t\\xc3\\xa9")
+        ...     with open_csv_lines(path, use_mmap=True) as lines:
+        ...         list(csv.reader(lines))
+        [['ID', 'Name'], ['A', 'Été']]
+    """
+    if not use_mmap:
+        with open(csv_file_path, "r", encoding="utf-8") as csvfile:
+            yield csvfile
+        return
+
+    with open(csv_file_path, "rb") as csvfile:
+        # Empty files cannot be mapped
+        if os.fstat(csvfile.fileno()).st_size == 0:
+            yield iter(())
+            return
+        with mmap.mmap(csvfile.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield (line.decode("utf-8") for line in iter(mapped.readline, b""))
+
+
+def write_yaml_items(
+    items_key: str, fragments: Iterable[bytes], meta: Dict[str, Any], output: BinaryIO
+) -> List[Tuple[int, int]]:
+    """
+    Write ``{items_key: [items...], meta: {...}}`` as YAML, one item at a time.
+
+    ``fragments`` are the items already dumped as one-item YAML lists (see
+    render_items). The output is identical to dumping the whole document at
+    once, but only one item is held in memory. ``count`` is added to ``meta``
+    once all items have been written, since the meta block comes after them.
+
+    Returns:
+        The byte offset and length of each item in the output
+
+    Examples:
+        >>> import io
+        >>> buffer = io.BytesIO()
+        >>> write_yaml_items("assets", iter([b"- name: Users\\n", b"- name: Data\\n"]),
+        ...                  {"title": "Assets"}, buffer)
+        [(8, 14), (22, 13)]
+        >>> print(buffer.getvalue().decode(), end="")
+        assets:
+        - name: Users
+        - name: Data
+        meta:
+          title: Assets
+          count: 2
+        >>> buffer = io.BytesIO()
+        >>> write_yaml_items("assets", iter([]), {"title": "Assets"}, buffer)
+        []
+        >>> print(buffer.getvalue().decode(), end="")
+        assets: []
+        meta:
+          title: Assets
+          count: 0
+    """
+    spans: List[Tuple[int, int]] = []
+    offset = 0
+    for fragment in fragments:
+        if not spans:
+            header = f"{items_key}:\n".encode("utf-8")
+            output.write(header)
+            offset = len(header)
+        output.write(fragment)
+        spans.append((offset, len(fragment)))
+        offset += len(fragment)
+    if not spans:
+        output.write(dump_yaml({items_key: []}).encode("utf-8"))
+
+    # An existing count key keeps its position in the meta block
+    output.write(dump_yaml({"meta": {**meta, "count": len(spans)}}).encode("utf-8"))
+    return spans
+
+
+def render_items(
+    converter: SheetConverter,
+    items: Iterable[Dict[str, Any]],
+    previous: Optional[ItemIndex],
+    previous_yaml: Optional[BinaryIO],
+    entries: List[Tuple[str, str]],
+) -> Iterator[bytes]:
+    """
+    Dump each item as a one-item YAML list, reusing the previous YAML when unchanged.
 
+    A one-item list dumps exactly like that item inside the whole list. Items
+    whose key and hash are in the previous index are copied from the
+    previous YAML file instead of being dumped again. The key and hash of
+    every item are appended to ``entries``.
+
+    Examples:
+        >>> entries = []
+        >>> items = [{"name": "Users", "slug": "users"}]
+        >>> list(render_items(SHEET_CONVERTERS["assets"], items, None, None, entries))
+        [b'- name: Users\\n  slug: users\\n']
+        >>> entries == [("Users", item_hash(items[0]))]
+        True
+    """
+    keys = ItemKeys()
+    previous_entries = previous.entries if previous and previous_yaml else {}
+    for item in items:
+        key = keys.next(str(item[converter.required]))
+        digest = item_hash(item)
+        entries.append((key, digest))
+        entry = previous_entries.get(key)
+        if entry is not None and entry[0] == digest and previous_yaml is not None:
+            previous_yaml.seek(entry[1])
+            yield previous_yaml.read(entry[2])
+        else:
+            yield dump_yaml([item]).encode("utf-8")
+
+
+def tee_shards(
+    fragments: Iterable[bytes], entries: List[Tuple[str, str]], shards: ShardWriter
+) -> Iterator[bytes]:
+    """
+    Pass the fragments of render_items through, copying each one to the shard of its category.
+
+    The key of each fragment's item is the last one render_items appended to
+    ``entries``.
+    """
+    for fragment in fragments:
+        shards.add(category_of(entries[-1][0]), fragment)
+        yield fragment
+
+
+@dataclass
+class ConversionResult:
+    """
+    Outcome of converting one sheet.
+
+    Examples:
+        >>> result = ConversionResult("controls", 3, {"added": ["C3"], "removed": [], "modified": ["C1"]})
+        >>> result.summary()
+        '1 added, 0 removed, 1 modified'
+    """
+
+    sheet_name: str
+    count: int
+    changeset: Dict[str, Any]
+
+    def summary(self) -> str:
+        """Describe the changeset in one line."""
+        return ", ".join(
+            f"{len(self.changeset[kind])} {kind}" for kind in ("added", "removed", "modified")
+        )
+
+
+def build_meta(converter: SheetConverter) -> Dict[str, Any]:
+    """
+    Build the meta block of a sheet's YAML file (without the item count).
+
+    Examples:
+        >>> build_meta(SHEET_CONVERTERS["assets"])["source"]
+        'Control Framework - Assets.csv'
+    """
     return {
-        "governance": governance,
-        "meta": {
-            "title": "Secure Product Model Governance",
-            "description": "Governance policies and expectations for the product framework",
-            "count": len(governance),
-            "source": "Control Framework - Governance.csv",
-            "generated_by": "csv2yaml.py",
-        },
+        "title": converter.title,
+        "description": converter.description,
+        "count": 0,
+        "source": converter.csv_filename,
+        "generated_by": "csv2yaml.py",
     }
 
 
-def convert_csv_to_yaml(
-    csv_file_path: Path, yaml_file_path: Path, sheet_name: str
-) -> bool:
-    """Convert CSV file to YAML format based on sheet type."""
-    try:
-        # Choose the appropriate converter based on sheet name
-        if sheet_name == "assets":
-            yaml_data = convert_assets_csv(csv_file_path)
-        elif sheet_name == "controls":
-            yaml_data = convert_controls_csv(csv_file_path)
-        elif sheet_name == "governance":
-            yaml_data = convert_governance_csv(csv_file_path)
-        else:
-            print(f"❌ Error: Unknown sheet type '{sheet_name}'")
-            return False
+@dataclass
+class ConvertOptions:
+    """
+    Parsed command line options.
 
-    except FileNotFoundError:
-        print(f"❌ Error: CSV file not found at {csv_file_path}")
-        return False
-    except Exception as e:
-        print(f"❌ Error reading CSV file: {e}")
-        return False
+    Examples:
+        >>> options = ConvertOptions(["assets"], 1)
+        >>> options.use_mmap, options.shards
+        (False, False)
+    """
 
-    # Write YAML file
+    sheets: List[str]
+    jobs: int
+    use_mmap: bool = False
+    shards: bool = False
+
+
+def convert_csv_to_yaml(
+    csv_file_path: Path,
+    yaml_file_path: Path,
+    sheet_name: str,
+    use_mmap: bool = False,
+    shards: bool = False,
+) -> Optional[ConversionResult]:
+    """
+    Convert a CSV file to YAML format based on sheet type.
+
+    Rows are read, converted and written one at a time, so memory use does
+    not grow with the size of the sheet. Items that did not change since the
+    previous conversion are copied from the previous YAML file. The YAML file
+    is written to a temporary file and only moved into place if it differs.
+    The item index and the changeset of the conversion are saved next to it,
+    with a binary model cache of the items for the page generators. Slugs
+    are made unique in the output directory of their pages, and the slugs
+    handed out are saved for the next conversion to keep. With ``shards``,
+    the items of a sheet with categories are also written to one YAML file
+    per category.
+
+    Returns:
+        The item count and changeset, or None if the conversion failed
+    """
+    if sheet_name not in SHEET_CONVERTERS:
+        print(f"❌ Error: Unknown sheet type '{sheet_name}'")
+        return None
+    converter = SHEET_CONVERTERS[sheet_name]
+
+    # Unchanged items can only be copied from the file the index describes
+    previous = load_index(yaml_file_path)
+    previous_sha256 = file_sha256(yaml_file_path)
+    reusable = previous is not None and previous.yaml_sha256 == previous_sha256
+
+    slugs_path = get_slugs_path(yaml_file_path)
+    registry = SlugRegistry(load_slugs(slugs_path))
+
+    # Only sheets whose pages are grouped by category are sharded
+    sharded = shards and "{category}" in converter.slug_namespace
+    if shards and not sharded:
+        print(f"ℹ️  {sheet_name} has no categories, not sharded")
+    shard_index: Optional[Dict[str, Any]] = None
+
+    temp_path: Optional[Path] = None
+    entries: List[Tuple[str, str]] = []
     try:
         os.makedirs(os.path.dirname(yaml_file_path), exist_ok=True)
-
-        with open(yaml_file_path, "w", encoding="utf-8") as yamlfile:
-            yaml.dump(
-                yaml_data,
-                yamlfile,
-                default_flow_style=False,
-                allow_unicode=True,
-                sort_keys=False,
-                indent=2,
+        with ExitStack() as stack:
+            lines = stack.enter_context(open_csv_lines(csv_file_path, use_mmap))
+            previous_yaml = stack.enter_context(open(yaml_file_path, "rb")) if reusable else None
+            yamlfile = stack.enter_context(
+create_temp_file(yaml_file_path, "wb"))
+            temp_path = Path(yamlfile.name)
+            cache = stack.enter_context(ModelCacheWriter(yaml_file_path, sheet_name))
+            items = assign_slugs(converter, iter_items(converter, csv.reader(lines)), registry)
+            items = cache.record(items)
+            fragments = render_items(converter, items, previous, previous_yaml, entries)
+            if sharded:
+                shard_writer = stack.enter_context(ShardWriter(yaml_file_path, sheet_name))
+                fragments = tee_shards(fragments, entries, shard_writer)
+            meta = build_meta(converter)
+            spans = write_yaml_items(sheet_name, fragments, meta, yamlfile)
+            yamlfile.close()
+
+            current = ItemIndex(file_sha256(temp_path))
+            for (key, digest), (offset, length) in zip(entries, spans):
+                current.add(key, digest, offset, length)
+            rewritten = current.yaml_sha256 != previous_sha256
+            if rewritten:
+                replace_file(temp_path, yaml_file_path)
+            cache.commit({**meta, "count": len(spans)}, current.yaml_sha256)
+            if sharded:
+                shard_index = shard_writer.commit(meta, current.yaml_sha256)
+
+        if shard_index is not None:
+            print(
+                f"🧩 Shards: {len(shard_index['shards'])} in {get_shard_dir(yaml_file_path)}/, "
+                f"{len(shard_writer.rewritten)} rewritten"
             )
 
-        return True
+        for warning in registry.collision_warnings():
+            print(f"⚠️  Warning: {warning}")
+
+        changeset = build_changeset(sheet_name, previous, current, rewritten)
+        save_index(yaml_file_path, current)
+        write_json_atomic(slugs_path, registry.mapping())
+        write_json_atomic(get_changeset_path(yaml_file_path), changeset)
+        return ConversionResult(sheet_name, len(spans), changeset)
 
+    except FileNotFoundError:
+        print(f"❌ Error: CSV file not found at {csv_file_path}")
+        return None
+    except (csv.Error, UnicodeDecodeError) as e:
+        print(f"❌ Error reading CSV file: {e}")
+        return None
     except Exception as e:
         print(f"❌ Error writing YAML file: {e}")
-        return False
+        return None
+    finally:
+        if temp_path is not None:
+            temp_path.unlink(missing_ok=True)
 
 
 def show_help() -> None:
@@ -441,13 +969,18 @@ This script converts Control Framework CSV files to structured YAML format
 suitable for Hugo data files. Supports individual sheet conversion or all at once.
 
 Usage:
-    ./scripts/csv2yaml.py [SHEET] [--help] [--doctests]
+    ./scripts/csv2yaml.py [SHEET...] [--jobs N] [--mmap] [--shards] [--help] [--doctests]
 
 Arguments:
-    SHEET     Optional sheet to convert: assets, controls, governance
+    SHEET     Optional sheets to convert: assets, controls, governance
               If not specified, converts all CSV files
 
 Options:
+    --jobs     Number of sheets converted in parallel, each in its own process
+               (default: one per sheet, up to the number of CPUs)
+    --mmap     Read the CSV files through a memory map (for very large exports)
+    --shards   Also write one YAML file per category of controls and governance
+               (data/controls/network.yml), with an index of their counts and hashes
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -469,6 +1002,15 @@ Examples:
     ./scripts/csv2yaml.py governance
         Convert only the Governance CSV to YAML
 
+    ./scripts/csv2yaml.py --jobs 1
+        Convert all CSV files one after another, in a single process
+
+    ./scripts/csv2yaml.py controls --mmap
+        Convert a very large Controls CSV through a memory map
+
+    ./scripts/csv2yaml.py controls --shards
+        Convert the Controls CSV and split it by category under data/controls/
+
     ./scripts/csv2yaml.py --doctests
         Run all doctests to verify functionality
 
@@ -476,12 +1018,33 @@ Note: CSV files must exist in the data/ directory and will be converted to YAML
 """)
 
 
-def parse_arguments() -> List[str]:
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Examples:
+        >>> get_option_value(["csv2yaml.py", "--jobs", "2"], "--jobs")
+        '2'
+        >>> get_option_value(["csv2yaml.py", "assets"], "--jobs") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def parse_arguments() -> ConvertOptions:
     """
     Parse command line arguments.
 
     Returns:
-        List of sheets to convert
+        ConvertOptions with the sheets to convert and how
 
     Note:
         This function modifies sys.argv and therefore cannot be easily tested
@@ -492,8 +1055,16 @@ def parse_arguments() -> List[str]:
         show_help()
         sys.exit(0)
 
-    # Remove flags from argv to get positional arguments
-    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    # Remove flags and their values from argv to get positional arguments
+    args: List[str] = []
+    skip_next = False
+    for arg in sys.argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg in VALUE_OPTIONS:
+            skip_next = True
+        elif not arg.startswith("--"):
+            args.append(arg)
 
     sheets_to_convert: List[str] = []
 
@@ -511,30 +1082,36 @@ def parse_arguments() -> List[str]:
     if not sheets_to_convert:
         sheets_to_convert = list(SHEET_CONVERTERS.keys())
 
-    return sheets_to_convert
-
-
-def main() -> None:
-    """Main function to orchestrate the conversions."""
-    sheets_to_convert = parse_arguments()
+    jobs = min(len(sheets_to_convert), os.cpu_count() or 1)
+    jobs_value = get_option_value(sys.argv, "--jobs")
+    if jobs_value is not None:
+        if not jobs_value.isdigit() or int(jobs_value) < 1:
+            print(f"❌ Error: --jobs must be a positive integer, got '{jobs_value}'")
+            print("Use --help for usage information")
+            sys.exit(1)
+        jobs = int(jobs_value)
 
-    # Get script directory and project root
-    script_dir = Path(__file__).parent
-    project_root = script_dir.parent
+    return ConvertOptions(sheets_to_convert, jobs, "--mmap" in sys.argv, "--shards" in sys.argv)
 
-    print("🔄 Converting CSV to YAML...")
-    print(f"📋 Sheets to convert: {', '.join(sheets_to_convert)}")
 
-    all_successful = True
-    converted_count = 0
+def convert_sheet(
+    sheet_name: str, data_dir: Path, use_mmap: bool = False, shards: bool = False
+) -> Tuple[Optional[ConversionResult], str]:
+    """
+    Convert one sheet, capturing what it prints.
 
-    for sheet_name in sheets_to_convert:
-        converter = SHEET_CONVERTERS[sheet_name]
+    Runs in a worker process when sheets are converted in parallel; the
+    captured output is printed by the main process so sheets don't interleave.
 
-        # Define file paths
-        csv_file = project_root / "data" / converter.csv_filename
-        yaml_file = project_root / "data" / converter.yaml_filename
+    Returns:
+        Tuple of (result, or None if the conversion failed; printed output)
+    """
+    converter = SHEET_CONVERTERS[sheet_name]
+    csv_file = data_dir / converter.csv_filename
+    yaml_file = data_dir / converter.yaml_filename
 
+    output = io.StringIO()
+    with redirect_stdout(output):
         print(f"\n📊 Converting {sheet_name}...")
         print(f"📂 Source: {csv_file}")
         print(f"📄 Target: {yaml_file}")
@@ -542,42 +1119,93 @@ def main() -> None:
         # Check if source file exists
         if not csv_file.exists():
             print(f"❌ Error: Source CSV file not found at {csv_file}")
-            all_successful = False
-            continue
+            return None, output.getvalue()
 
         # Perform conversion
-        success = convert_csv_to_yaml(csv_file, yaml_file, sheet_name)
+        result = convert_csv_to_yaml(csv_file, yaml_file, sheet_name, use_mmap, shards)
 
-        if success:
-            print(f"✅ Successfully converted {sheet_name} CSV to YAML!")
+        if result is not None:
+            if result.changeset["rewritten"]:
+                print(f"✅ Successfully converted {sheet_name} CSV to YAML!")
+            else:
+                print(f"✅ {sheet_name} YAML is already up to date, left untouched")
 
             # Display some stats
-            try:
-                with open(yaml_file, "r") as f:
-                    data = yaml.safe_load(f)
-                    assert isinstance(data, dict)
-                    items_key = list(data.keys())[
-                        0
-                    ]  # First key (assets, controls, governance)
-                    item_count = len(data.get(items_key, []))
-                    print(f"📈 Converted {item_count} {items_key}")
-                    converted_count += item_count
-            except Exception:
-                pass
+            print(f"📈 Converted {result.count} {sheet_name}")
+            print(f"🧾 Changes: {result.summary()} ({get_changeset_path(yaml_file).name})")
         else:
             print(f"❌ Failed to convert {sheet_name}!")
-            all_successful = False
+    return result, output.getvalue()
+
+
+def convert_sheets(
+    options: ConvertOptions, data_dir: Path
+) -> Iterator[Tuple[str, Optional[ConversionResult], str]]:
+    """
+    Convert sheets on a process pool, yielding each one as it completes.
+
+    A sheet that fails, even by crashing its worker, is reported as failed
+    without cancelling the others. With one job or one sheet, the sheets are
+    converted in this process.
+
+    Yields:
+        Tuples of (sheet name, result or None, printed output)
+    """
+    if options.jobs == 1 or len(options.sheets) == 1:
+        for sheet_name in options.sheets:
+            yield (sheet_name, *convert_sheet(sheet_name, data_dir, options.use_mmap, options.shards))
+        return
+
+    with ProcessPoolExecutor(max_workers=options.jobs) as pool:
+        futures = {
+            pool.submit(
+                convert_sheet, sheet_name, data_dir, options.use_mmap, options.shards
+            ): sheet_name
+            for sheet_name in options.sheets
+        }
+        for future in as_completed(futures):
+            sheet_name = futures[future]
+            try:
+                result, output = future.result()
+            except Exception as e:
+                result = None
+                output = f"\n📊 Converting {sheet_name}...\n❌ Error: conversion worker failed: {e!r}\n"
+            yield sheet_name, result, output
+
+
+def main() -> None:
+    """Main function to orchestrate the conversions."""
+    options = parse_arguments()
+
+    # Get script directory and project root
+    script_dir = Path(__file__).parent
+    project_root = script_dir.parent
+
+    print("🔄 Converting CSV to YAML...")
+    print(f"📋 Sheets to convert: {', '.join(options.sheets)}")
+    if len(options.sheets) > 1 and options.jobs > 1:
+        print(f"⚙️  Workers: {min(options.jobs, len(options.sheets))}")
+
+    failed: List[str] = []
+    converted_count = 0
+
+    for sheet_name, result, output in convert_sheets(options, project_root / "data"):
+        print(output, end="")
+        if result is None:
+            failed.append(sheet_name)
+        else:
+            converted_count += result.count
 
     # Final summary
-    print(f"\n{'✅' if all_successful else '⚠️'} Conversion Summary:")
-    print(f"📊 Processed {len(sheets_to_convert)} sheet(s)")
+    print(f"\n{'⚠️' if failed else '✅'} Conversion Summary:")
+    print(f"📊 Processed {len(options.sheets)} sheet(s)")
     if converted_count > 0:
         print(f"📈 Total items converted: {converted_count}")
 
-    if all_successful:
+    if not failed:
         print("🎉 All conversions completed successfully!")
     else:
-        print("❌ Some conversions failed!")
+        print(f"❌ Some conversions failed: {', '.join(sheet for sheet in options.sheets if sheet in failed)}")
         sys.exit(1)
 
 
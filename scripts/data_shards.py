@@ -0,0 +1,182 @@
+"""
+Per-category shards of the YAML data files written by csv2yaml.py.
+
+With --shards, csv2yaml.py also splits a sheet by category, the middle part
+of the item IDs (C.Network.IDS is in "network"), into one YAML file per
+category with the same layout as the whole file, plus an index:
+
+    data/controls/network.yml
+    data/controls/index.json
+    {"sheet": "controls", "yaml_sha256": "...",
+     "shards": {"network": {"file": "network.yml", "count": 12, "sha256": "..."}}}
+
+A tool that only needs one category loads its shard with load_shard(). A
+shard whose content did not change is not rewritten, so its hash in the
+index and its modification time only change when its own category does.
+
+The index records the hash of the whole YAML file the shards were split
+from. Once that file is converted again without --shards, it no longer
+matches, and the shards are treated as missing rather than served stale.
+"""
+
+import json
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional
+
+from atomic_files import create_temp_file, replace_file
+from row_index import file_sha256, write_json_atomic
+from yaml_io import dump_yaml, load_yaml_file
+
+SHARD_INDEX_FILENAME = "index.json"
+SHARD_SUFFIX = ".yml"
+
+
+def get_shard_dir(yaml_path: Path) -> Path:
+    """
+    Return the directory holding the shards of a YAML file.
+
+    Examples:
+        >>> get_shard_dir(Path("data/controls.yml")).as_posix()
+        'data/controls'
+    """
+    return yaml_path.parent / yaml_path.stem
+
+
+class ShardWriter:
+    """
+    Write the items of a sheet to one YAML file per category as they stream by.
+
+    Items arrive as the one-item YAML lists dumped for the whole file, and
+    are copied as they are. commit() finishes every shard, moves the changed
+    ones into place, removes the shards of categories that are gone and
+    writes the index.
+
+    Examples:
+        >>> import tempfile
+        >>> yaml_path = Path(tempfile.mkdtemp()) / "controls.yml"
+        >>> with ShardWriter(yaml_path, "controls") as shards:
+        ...     shards.add("network", b"- id: C.Network.IDS\\n")
+        ...     shards.add("auth", b"- id: C.Auth.MFA\\n")
+        ...     shards.add("network", b"- id: C.Network.WAF\\n")
+        ...     index = shards.commit({"title": "Controls", "count": 0}, file_sha256(yaml_path))
+        >>> {name: shard["count"] for name, shard in index["shards"].items()}
+        {'network': 2, 'auth': 1}
+        >>> shards.rewritten
+        ['network', 'auth']
+        >>> load_shard(yaml_path, "network")
+        {'controls': [{'id': 'C.Network.IDS'}, {'id': 'C.Network.WAF'}], 'meta': {'title': 'Controls', 'count': 2, 'category': 'network'}}
+        >>> with ShardWriter(yaml_path, "controls") as shards:
+        ...     shards.add("network", b"- id: C.Network.IDS\\n")
+        ...     shards.add("network", b"- id: C.Network.WAF\\n")
+        ...     index = shards.commit({"title": "Controls", "count": 0}, file_sha256(yaml_path))
+        >>> shards.rewritten, list(index["shards"])
+        ([], ['network'])
+        >>> sorted(path.name for path in get_shard_dir(yaml_path).iterdir())
+        ['index.json', 'network.yml']
+        >>> load_shard(yaml_path, "auth") is None
+        True
+
+    Shards of an earlier version of the YAML file are not loaded:
+
+        >>> _ = yaml_path.write_text("controls: []\\n", encoding="utf-8")
+        >>> load_shard_index(yaml_path) is None, load_shard(yaml_path, "network") is None
+        (True, True)
+    """
+
+    def __init__(self, yaml_path: Path, items_key: str) -> None:
+        self.directory = get_shard_dir(yaml_path)
+        self.items_key = items_key
+        self.files: Dict[str, IO[bytes]] = {}
+        self.counts: Dict[str, int] = {}
+        self.rewritten: List[str] = []
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        for temp_file in self.files.values():
+            temp_file.close()
+            Path(temp_file.name).unlink(missing_ok=True)
+
+    def add(self, shard: str, fragment: bytes) -> None:
+        """Append an item, dumped as a one-item YAML list, to a shard."""
+        temp_file = self.files.get(shard)
+        if temp_file is None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            temp_file = self.files[shard] = create_temp_file(self.directory / f"{shard}{SHARD_SUFFIX}", "wb")
+            temp_file.write(f"{self.items_key}:\n".encode("utf-8"))
+            self.counts[shard] = 0
+        temp_file.write(fragment)
+        self.counts[shard] += 1
+
+    def commit(self, meta: Dict[str, Any], yaml_sha256: Optional[str]) -> Dict[str, Any]:
+        """
+        Finish the shards, move the changed ones into place and write the index.
+
+        ``yaml_sha256`` is the hash of the whole YAML file the shards are
+        split from, recorded for the loaders to check.
+        """
+        shards: Dict[str, Dict[str, Any]] = {}
+        for shard, temp_file in self.files.items():
+            count = self.counts[shard]
+            temp_file.write(dump_yaml({"meta": {**meta, "count": count, "category": shard}}).encode("utf-8"))
+            temp_file.close()
+
+            path = self.directory / f"{shard}{SHARD_SUFFIX}"
+            digest = file_sha256(Path(temp_file.name))
+            if digest != file_sha256(path):
+                replace_file(Path(temp_file.name), path)
+                self.rewritten.append(shard)
+            else:
+                Path(temp_file.name).unlink()
+            shards[shard] = {"file": path.name, "count": count, "sha256": digest}
+        self.files = {}
+
+        # Categories without items any more
+        if self.directory.exists():
+            for path in self.directory.glob(f"*{SHARD_SUFFIX}"):
+                if path.name[: -len(SHARD_SUFFIX)] not in shards:
+                    path.unlink()
+
+        index = {"sheet": self.items_key, "yaml_sha256": yaml_sha256, "shards": shards}
+        write_json_atomic(self.directory / SHARD_INDEX_FILENAME, index)
+        return index
+
+
+def load_shard_index(yaml_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    Load the shard index of a YAML file.
+
+    Returns None if the file has no shards, or if they were split from an
+    earlier version of it.
+    """
+    try:
+        with open(get_shard_dir(yaml_path) / SHARD_INDEX_FILENAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(index, dict) or index.get("yaml_sha256") != file_sha256(yaml_path):
+        return None
+    return index
+
+
+def load_shard(yaml_path: Path, category: str) -> Optional[Any]:
+    """Load the YAML document of one category of a sheet, or None if it has no current shard."""
+    index = load_shard_index(yaml_path)
+    if index is None or category not in index["shards"]:
+        return None
+    return load_yaml_file(get_shard_dir(yaml_path) / index["shards"][category]["file"])
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by csv2yaml.py --shards.")
+    print("Run it with --doctests to verify functionality.")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Snapshot Browser for Secure Product Framework
+
+Every run of framework-sync.py records the synced CSV files in a local
+content-addressed store (data/.framework-sync/snapshots). This script lists
+those snapshots, restores any of them into data/ and diffs two of them, all
+without network access.
+
+Usage:
+    ./scripts/framework-snapshots.py list [--dir DIR]
+    ./scripts/framework-snapshots.py restore SNAPSHOT [SHEET...] [--dir DIR]
+    ./scripts/framework-snapshots.py diff [OLD [NEW]] [SHEET...] [--context N] [--dir DIR]
+    ./scripts/framework-snapshots.py [--help] [--doctests]
+
+Commands:
+    list      List snapshots, oldest first, with the hash of each sheet
+    restore   Write the CSV files of a snapshot back into the data directory
+    diff      Show a unified diff of the CSV files of two snapshots
+              (default: the previous snapshot against the latest one)
+
+Arguments:
+    SNAPSHOT  Snapshot ID, unique ID prefix, "latest", or "~N" for the
+              Nth snapshot before the latest one
+    SHEET     Optional sheets to restore or diff: assets, controls, governance
+              If not specified, all sheets of the snapshot
+
+Options:
+    --dir      Data directory holding the CSV files (default: data/)
+    --context  Number of context lines in diffs (default: 0)
+    --help     Show this help message and exit
+    --doctests Run doctests and exit
+
+Examples:
+    ./scripts/framework-snapshots.py list
+        List every recorded snapshot
+
+    ./scripts/framework-snapshots.py diff
+        Show what the latest sync changed
+
+    ./scripts/framework-snapshots.py diff 20240101 latest controls
+        Show how the Controls sheet changed since the first snapshot of 2024-01-01
+
+    ./scripts/framework-snapshots.py restore ~1
+        Roll data/ back to the snapshot before the latest one
+
+    ./scripts/framework-snapshots.py --doctests
+        Run all doctests to verify functionality
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sheet_config import SHEETS_CONFIG, SYNC_STATE_DIRNAME
+from snapshot_store import SNAPSHOTS_DIRNAME, Snapshot, SnapshotStore
+
+# CSV file of each sheet, as written by framework-sync.py
+SHEET_FILENAMES = {name: sheet.filename for name, sheet in SHEETS_CONFIG.items()}
+
+COMMANDS = ["list", "restore", "diff"]
+
+# Options that take a value (used to tell option values apart from arguments)
+VALUE_OPTIONS = ["--dir", "--context"]
+
+
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Examples:
+        >>> get_option_value(["framework-snapshots.py", "diff", "--context", "3"], "--context")
+        '3'
+        >>> get_option_value(["framework-snapshots.py", "list"], "--dir") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def split_arguments(arguments: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Split positional arguments into snapshot references and sheet names.
+
+    Examples:
+        >>> split_arguments(["~1", "latest", "controls"])
+        (['~1', 'latest'], ['controls'])
+        >>> split_arguments([])
+        ([], [])
+    """
+    references = [argument for argument in arguments if argument not in SHEET_FILENAMES]
+    sheets = [argument for argument in arguments if argument in SHEET_FILENAMES]
+    return references, sheets
+
+
+def selected_files(snapshot: Snapshot, sheets: List[str]) -> List[str]:
+    """
+    Return the file names of the requested sheets (all sheets if none requested).
+
+    Examples:
+        >>> snapshot = Snapshot("s", 0.0, {"Control Framework - Assets.csv": "a"})
+        >>> selected_files(snapshot, [])
+        ['Control Framework - Assets.csv']
+        >>> selected_files(snapshot, ["controls"])
+        ['Control Framework - Controls.csv']
+    """
+    if not sheets:
+        return sorted(snapshot.files)
+    return [SHEET_FILENAMES[sheet] for sheet in sheets]
+
+
+def format_snapshot(snapshot: Snapshot) -> str:
+    """
+    Format a snapshot as one line of the list command.
+
+    Examples:
+        >>> format_snapshot(Snapshot("20240101T000000Z", 1704067200.0,
+        ...                          {"Control Framework - Assets.csv": "0123456789abcdef"}))
+        '20240101T000000Z  2024-01-01 00:00:00 UTC  assets:0123456789ab'
+    """
+    taken_at = time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime(snapshot.taken_at))
+    sheets = [
+        f"{sheet}:{snapshot.files[filename][:12]}"
+        for sheet, filename in SHEET_FILENAMES.items()
+        if filename in snapshot.files
+    ]
+    return f"{snapshot.id}  {taken_at}  {' '.join(sheets)}"
+
+
+def list_command(store: SnapshotStore) -> None:
+    """Print every snapshot, oldest first."""
+    snapshots = store.list_snapshots()
+    if not snapshots:
+        print("📭 No snapshots recorded yet. Run ./scripts/framework-sync.py first.")
+        return
+    for snapshot in snapshots:
+        print(format_snapshot(snapshot))
+    print(f"🗄️  {len(snapshots)} snapshots in {store.root}")
+
+
+def restore_command(
+    store: SnapshotStore, data_dir: Path, reference: str, sheets: List[str]
+) -> None:
+    """Write the CSV files of a snapshot back into the data directory."""
+    snapshot = store.resolve(reference)
+    for filename in selected_files(snapshot, sheets):
+        if filename not in snapshot.files:
+            print(f"⚠️  {filename} is not part of snapshot {snapshot.id}, skipped")
+            continue
+        store.restore_file(snapshot, filename, data_dir / filename)
+        print(f"✅ Restored {filename} from snapshot {snapshot.id}")
+    print("💡 Tip: Run 'make data-convert' to regenerate the YAML data files")
+
+
+def diff_command(
+    store: SnapshotStore, references: List[str], sheets: List[str], context: int
+) -> bool:
+    """
+    Print a unified diff between two snapshots.
+
+    Returns:
+        True if the snapshots differ for the selected sheets
+    """
+    old_reference = references[0] if references else "~1"
+    new_reference = references[1] if len(references) > 1 else "latest"
+    old = store.resolve(old_reference)
+    new = store.resolve(new_reference)
+
+    filenames = sorted(set(selected_files(old, sheets)) | set(selected_files(new, sheets)))
+    changed = False
+    for filename in filenames:
+        for line in store.diff(old, new, filename, context):
+            sys.stdout.write(line)
+            changed = True
+    if not changed:
+        print(f"✅ No differences between {old.id} and {new.id}")
+    return changed
+
+
+def show_help() -> None:
+    """
+    Display help information.
+
+    Examples:
+        >>> import io
+        >>> old_stdout = sys.stdout
+        >>> sys.stdout = captured_output = io.StringIO()
+        >>> show_help()
+        >>> sys.stdout = old_stdout
+        >>> output = captured_output.getvalue()
+        >>> "Snapshot Browser for Secure Product Framework" in output
+        True
+        >>> "Usage:" in output
+        True
+    """
+    print(__doc__)
+
+
+def main() -> None:
+    """Main function to dispatch the snapshot commands."""
+    if "--help" in sys.argv or "-h" in sys.argv or len(sys.argv) < 2:
+        show_help()
+        sys.exit(0)
+
+    positional: List[str] = []
+    skip_next = False
+    for arg in sys.argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg in VALUE_OPTIONS:
+            skip_next = True
+        elif not arg.startswith("--"):
+            positional.append(arg)
+
+    if not positional or positional[0] not in COMMANDS:
+        print(f"❌ Error: expected a command: {', '.join(COMMANDS)}")
+        print("Use --help for usage information")
+        sys.exit(1)
+    command = positional[0]
+
+    project_root = Path(__file__).parent.parent
+    data_dir = Path(get_option_value(sys.argv, "--dir") or project_root / "data")
+    context_value = get_option_value(sys.argv, "--context") or "0"
+    if not context_value.isdigit():
+        print(f"❌ Error: --context must be a non-negative integer, got '{context_value}'")
+        sys.exit(1)
+
+    store = SnapshotStore(data_dir / SYNC_STATE_DIRNAME / SNAPSHOTS_DIRNAME)
+    references, sheets = split_arguments(positional[1:])
+
+    try:
+        if command == "list":
+            list_command(store)
+        elif command == "restore":
+            if len(references) != 1:
+                print("❌ Error: restore expects exactly one SNAPSHOT")
+                sys.exit(1)
+            restore_command(store, data_dir, references[0], sheets)
+        else:
+            if len(references) > 2:
+                print("❌ Error: diff expects at most two SNAPSHOTs")
+                sys.exit(1)
+            diff_command(store, references, sheets, int(context_value))
+    except KeyError as e:
+        print(f"❌ Error: {e.args[0]}")
+        sys.exit(1)
+    except OSError as e:
+        print(f"❌ Error reading snapshot store {store.root}: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    import doctest
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    main()
@@ -6,15 +6,55 @@ This script downloads framework sheets from the Google Spreadsheet and saves the
 as CSV files. It supports downloading individual sheets or all sheets at once.
 
 Usage:
-    ./scripts/framework-sync.py [SHEET] [--test] [--url URL] [--help] [--doctests]
+    ./scripts/framework-sync.py [SHEET] [--test [--report FILE]] [--url URL]
+                                [--jobs N] [--force] [--workbook] [--manifest FILE]
+                                [--exit-unchanged] [--mark-built] [--retries N]
+                                [--timeout SECONDS]
+                                [--hedge] [--record DIR | --replay DIR]
+                                [--watch [--interval SECONDS] [--max-interval SECONDS]
+                                         [--debounce SECONDS]]
+                                [--help] [--doctests]
 
 Arguments:
     SHEET     Optional sheet to download: assets, controls, governance
               If not specified, downloads all sheets
 
 Options:
-    --test     Test the URL and connection without downloading
+    --test     Test the URL and connection without downloading: every sheet is
+               probed concurrently and reported with its status, redirect
+               target (login, download, other), time to first byte and total time
+    --report   With --test, also write the report as JSON to FILE
     --url      Use a custom Google Sheets URL instead of the default
+    --jobs     Maximum number of sheets fetched concurrently (default: 4)
+    --force    Ignore the sync cache and re-download and rewrite every sheet
+    --workbook Download the whole spreadsheet as one XLSX workbook and split it
+               locally into the per-sheet CSV files (one request instead of one
+               per sheet); a sheet with formatted numbers or dates is still
+               downloaded from its CSV export
+    --manifest Sync every spreadsheet listed in a YAML manifest (see below)
+               through one bounded worker pool, rate limited per host
+    --exit-unchanged
+               Exit with status 3 when no sheet changed since the last sync and
+               every sheet was converted and generated since (see --mark-built)
+    --mark-built
+               Record that the CSV files of the sheets, as last synced, were
+               converted and generated, without downloading anything
+    --retries  Retries after a network error, timeout, 429 or 5xx response,
+               with jittered exponential backoff (default: 2)
+    --timeout  Timeout of each export request in seconds (default: 30)
+    --hedge    Send a second request for a sheet (or the workbook) whose response
+               takes longer than its p95 latency so far, and use whichever
+               answers first
+    --record   Record every export response (headers, redirects, status) to DIR
+    --replay   Serve every request from a recording in DIR, without network access
+    --watch    Keep polling the sheets and, once edits settle, convert the sheets
+               that changed and regenerate their pages (until Ctrl+C)
+    --interval With --watch, shortest time between polls in seconds (default: 5);
+               polls back off from it while nothing changes
+    --max-interval
+               With --watch, longest time between polls in seconds (default: 300)
+    --debounce With --watch, seconds without further changes before the
+               downstream stages run (default: 5)
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -26,13 +66,57 @@ Supported Sheets:
 The script will:
 1. Parse the Google Sheets URL to extract spreadsheet ID
 2. Build the CSV export URL for each requested sheet
-3. Download the specified sheet(s) from the Google Spreadsheet
+3. Download the specified sheet(s) concurrently over a shared keep-alive session
 4. Save them as CSV files in the data/ directory
 5. Verify the downloads were successful and contain expected content
 
+Unchanged sheets are detected with conditional requests (ETag/Last-Modified)
+and content hashes recorded in data/.framework-sync/cache.json. Their CSV files
+are left untouched, so downstream stages can skip them.
+
+A sheet only counts as unchanged for --exit-unchanged once its CSV was also
+converted and generated: --mark-built, run by make data-pipeline after the
+last stage succeeded, records the hash of each CSV it built in
+data/.framework-sync/built.json. A sheet synced but never built, because a
+later stage failed, is rebuilt by the next pipeline run.
+
+Retries, hedges and the recent response times of each sheet are recorded in
+data/.framework-sync/metrics.json. --hedge uses the p95 of those response
+times as the delay before hedging, once a sheet has at least 5 samples.
+
+Watch mode:
+    --watch runs the sync in a loop. Each poll is a conditional request per
+    sheet, so an unchanged sheet costs a 304 response or a hash comparison and
+    no disk write. The interval grows by half after every poll without changes,
+    up to --max-interval, and drops back to --interval after an edit. Edits
+    are collected until none has arrived for --debounce seconds, then
+    csv2yaml.py, validate-references.py and the page generators run once,
+    for the changed sheets only. A sheet whose rebuild failed is tried again
+    after a delay that doubles with each failure, up to --max-interval, or
+    as soon as it is edited again.
+
+Manifest:
+    A manifest syncs N spreadsheets x M sheets in one run. Sheets that changed
+    most recently are fetched first, every host gets a token-bucket rate limit,
+    and throughput and p50/p95 fetch latency are reported at the end.
+
+        jobs: 8                       # concurrent fetches (default: 4)
+        rate_limit:                   # per host (default: 5 requests/s, burst 5)
+          requests_per_second: 2
+          burst: 4
+        spreadsheets:
+          - name: retail
+            url: https://docs.google.com/spreadsheets/d/ABC123/edit
+            output_dir: retail        # relative to the manifest file
+            sheets: [assets, controls]  # default: all sheets
+          - name: cloud
+            url: https://docs.google.com/spreadsheets/d/DEF456/edit
+            output_dir: cloud
+
 Requirements:
 - The Google Sheet must be publicly accessible (shared with "anyone with the link")
-- Internet connection is required for downloading
+- Internet connection is required for downloading (except with --replay or a
+  local stand-in server started with ./scripts/sheets-export-server.py)
 
 Examples:
     # Download all framework sheets
@@ -50,9 +134,40 @@ Examples:
     # Test a specific sheet
     ./scripts/framework-sync.py assets --test
 
+    # Pre-flight check of every spreadsheet of a manifest, with a JSON report
+    ./scripts/framework-sync.py --manifest forks.yml --test --report preflight.json
+
     # Use a custom Google Sheets URL
     ./scripts/framework-sync.py --url "https://docs.google.com/spreadsheets/d/ABC123/edit"
 
+    # Fetch at most two sheets at a time
+    ./scripts/framework-sync.py --jobs 2
+
+    # Fetch every sheet with a single workbook request
+    ./scripts/framework-sync.py --workbook
+
+    # Sync every spreadsheet of a manifest
+    ./scripts/framework-sync.py --manifest forks.yml
+
+    # Scheduled sync: retry harder and hedge slow exports
+    ./scripts/framework-sync.py --retries 4 --hedge
+
+    # Sync, exiting with status 3 if nothing changed (used by make data-pipeline)
+    ./scripts/framework-sync.py --exit-unchanged
+
+    # Once the data and pages are rebuilt, record the synced sheets as built
+    ./scripts/framework-sync.py --mark-built
+
+    # Rebuild the data and pages of each sheet shortly after it is edited
+    ./scripts/framework-sync.py --watch
+
+    # Record the export responses, then replay them offline
+    ./scripts/framework-sync.py --record recordings/sheets
+    ./scripts/framework-sync.py --replay recordings/sheets
+
+    # Sync from a local stand-in server (see sheets-export-server.py)
+    ./scripts/framework-sync.py --url "http://127.0.0.1:8765/spreadsheets/d/ABC123/edit"
+
     # Run doctests to verify functionality
     ./scripts/framework-sync.py --doctests
 
@@ -63,69 +178,276 @@ Error Handling:
 """
 
 import requests
+import yaml
+import contextlib
+import hashlib
+import io
+import json
 import os
+import subprocess
 import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from dataclasses import dataclass
-from typing import Dict, List
+from dataclasses import asdict, dataclass, field, fields
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from requests.adapters import HTTPAdapter
+from xml.etree.ElementTree import ParseError
+from sheets_replay import Recording, RecordingAdapter, ReplayAdapter
+from workbook_export import WorkbookReader
+from yaml_io import load_yaml_file
+from sync_scheduler import (
+    FetchHistory,
+    FetchStats,
+    HostRateLimiter,
+    RateLimitedSession,
+    AdaptiveInterval,
+    ChangeDebouncer,
+    OrderedOutput,
+    RetryPolicy,
+    hedged_get,
+    parse_retry_after,
+    percentile,
+)
+from snapshot_store import SNAPSHOTS_DIRNAME, Snapshot, SnapshotStore
+from atomic_files import create_temp_file, replace_file
+from sheet_config import SHEETS_CONFIG, SYNC_STATE_DIRNAME, SheetConfig
+
+
+# Origin of the Google Sheets export endpoint
+GOOGLE_SHEETS_BASE_URL = "https://docs.google.com"
+
+# Default Google Sheets URL
+DEFAULT_SHEETS_URL = "https://docs.google.com/spreadsheets/d/1XE1bytd649pIb6vyesIq5rNmSna4YpaywiCFVW8IrYM/edit"
+
+# Default number of sheets fetched concurrently
+DEFAULT_JOBS = 4
+
+# Options that take a value (used to tell option values apart from sheet names)
+VALUE_OPTIONS = [
+    '--url', '--jobs', '--record', '--replay', '--manifest', '--retries', '--timeout', '--report',
+    '--interval', '--max-interval', '--debounce',
+]
+
+# Exit status used with --exit-unchanged when no sheet changed since it was last built
+EXIT_UNCHANGED = 3
+
+# Local sync state (validators and content hashes), kept next to the CSV files
+# in SYNC_STATE_DIRNAME
+SYNC_CACHE_FILENAME = 'cache.json'
+SYNC_METRICS_FILENAME = 'metrics.json'
+SYNC_BUILT_FILENAME = 'built.json'
+
+# Timeout of each export request, and retries after a failed attempt
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 2
+
+# Whole-spreadsheet XLSX export kept in the sync state by --workbook
+WORKBOOK_FILENAME = 'workbook.xlsx'
+
+# Polling of --watch: shortest and longest interval, and quiet period after an edit
+DEFAULT_WATCH_INTERVAL = 5.0
+DEFAULT_WATCH_MAX_INTERVAL = 300.0
+DEFAULT_DEBOUNCE = 5.0
+
+# Downstream stages run by --watch, in the order of make data-pipeline: the
+# changed sheets are converted, the references checked, then their pages generated
+CONVERT_SCRIPT = 'csv2yaml.py'
+VALIDATE_SCRIPT = 'validate-references.py'
+GENERATE_SCRIPTS: Dict[str, str] = {
+    'assets': 'generate-assets-page.py',
+    'controls': 'generate-control-pages.py',
+    'governance': 'generate-governance-pages.py',
+}
+
+# Timeout of each accessibility probe (--test)
+PROBE_TIMEOUT = 10.0
+
+# Default per-host rate limit of a manifest sync (requests per second, burst)
+DEFAULT_RATE_LIMIT = 5.0
+DEFAULT_RATE_BURST = 5
+
+# Size of the chunks streamed from the export endpoint to disk
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Outcome of a single sheet download
+STATUS_CHANGED = 'changed'
+STATUS_UNCHANGED = 'unchanged'
+STATUS_FAILED = 'failed'
+
+
+@dataclass
+class FetchOptions:
+    """
+    How sheet exports are requested: timeout, retries and hedging.
+
+    Examples:
+        >>> options = FetchOptions()
+        >>> options.timeout == DEFAULT_TIMEOUT, options.retry_policy.attempts == DEFAULT_RETRIES + 1
+        (True, True)
+        >>> options.hedge
+        False
+    """
+    timeout: float = DEFAULT_TIMEOUT
+    retry_policy: RetryPolicy = field(default_factory=lambda: RetryPolicy(attempts=DEFAULT_RETRIES + 1))
+    hedge: bool = False
 
 
 @dataclass
-class SheetConfig:
+class SyncOptions:
     """
-    Configuration for a framework sheet.
+    Options for a sync run, as parsed from the command line.
 
     Examples:
-        >>> config = SheetConfig("Assets", "123", "assets.csv", ["ID", "Name"])
-        >>> config.name
-        'Assets'
-        >>> config.gid
-        '123'
-        >>> config.filename
-        'assets.csv'
-        >>> config.expected_headers
-        ['ID', 'Name']
+        >>> options = SyncOptions(["assets"], False, DEFAULT_SHEETS_URL)
+        >>> options.sheets
+        ['assets']
+        >>> options.jobs == DEFAULT_JOBS
+        True
+    """
+    sheets: List[str]
+    test_mode: bool
+    sheets_url: str
+    jobs: int = DEFAULT_JOBS
+    force: bool = False
+    exit_unchanged: bool = False
+    mark_built: bool = False
+    record_dir: Optional[Path] = None
+    replay_dir: Optional[Path] = None
+    workbook: bool = False
+    manifest: Optional[Path] = None
+    fetch: FetchOptions = field(default_factory=FetchOptions)
+    report_path: Optional[Path] = None
+    watch: bool = False
+    watch_interval: float = DEFAULT_WATCH_INTERVAL
+    watch_max_interval: float = DEFAULT_WATCH_MAX_INTERVAL
+    debounce: float = DEFAULT_DEBOUNCE
+
+
+@dataclass
+class CacheEntry:
+    """
+    Validators and content hash recorded for a sheet after a successful sync.
+
+    ``size`` and ``mtime_ns`` describe the CSV file as written by the sync, so a
+    file edited or removed locally is never mistaken for an unchanged download.
+
+    Examples:
+        >>> entry = CacheEntry(url="https://example.com/export", sha256="abc", etag='"v1"')
+        >>> entry.etag
+        '"v1"'
+        >>> entry.last_modified is None
+        True
+    """
+    url: str
+    sha256: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    size: int = -1
+    mtime_ns: int = -1
+    changed_at: float = 0.0
+
+    def matches_file(self, path: Path) -> bool:
+        """
+        Check that the file on disk is still the one this entry describes.
+
+        Examples:
+            >>> CacheEntry(url="u", sha256="x").matches_file(Path("/nonexistent.csv"))
+            False
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+
+@dataclass
+class DownloadResult:
+    """
+    Outcome of downloading a single sheet.
+
+    Examples:
+        >>> result = DownloadResult("assets", STATUS_UNCHANGED)
+        >>> result.ok
+        True
+        >>> DownloadResult("assets", STATUS_FAILED).ok
+        False
+    """
+    sheet: str
+    status: str
+    cache_entry: Optional[CacheEntry] = None
+    verified: bool = False
+    bytes_received: int = 0
+    attempts: int = 1
+    hedged: bool = False
+    hedge_won: bool = False
+    latency: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        """True unless the download failed."""
+        return self.status != STATUS_FAILED
+
+
+@dataclass
+class ProbeResult:
+    """
+    Outcome of probing the export endpoint of one sheet.
+
+    ``ttfb`` is the time until the response headers arrived; ``total`` also
+    includes waiting for a pooled connection and the rate limit.
+
+    Examples:
+        >>> probe = ProbeResult("", "Assets", "https://docs.google.com/...", 307,
+        ...                     redirect="download", accessible=True)
+        >>> probe.accessible, probe.redirect
+        (True, 'download')
+    """
+    spreadsheet: str
+    sheet: str
+    url: str
+    status_code: Optional[int] = None
+    redirect: Optional[str] = None
+    location: Optional[str] = None
+    accessible: bool = False
+    ttfb: Optional[float] = None
+    total: Optional[float] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class SpreadsheetTarget:
+    """
+    One spreadsheet of a sync manifest and the sheets to fetch from it.
+
+    Examples:
+        >>> target = SpreadsheetTarget("retail", DEFAULT_SHEETS_URL, Path("data/retail"), ["assets"])
+        >>> target.output_dir.as_posix()
+        'data/retail'
     """
     name: str
-    gid: str
-    filename: str
-    expected_headers: List[str]
-
-
-# Configuration for all framework sheets
-#
-# To find the correct GID for each sheet:
-# 1. Open the Google Spreadsheet in your browser
-# 2. Click on the tab/sheet you want (e.g., "Controls", "Governance")
-# 3. Look at the URL in your browser - it will contain "#gid=XXXXXXX"
-# 4. The number after "gid=" is the GID for that sheet
-# 5. Update the gid values below with the correct numbers
-#
-# Example: https://docs.google.com/spreadsheets/d/.../edit#gid=123456789
-#          The GID would be "123456789"
-SHEETS_CONFIG: Dict[str, SheetConfig] = {
-    'assets': SheetConfig(
-        name='Assets',
-        gid='1448922229',  # Known GID for Assets sheet
-        filename='Control Framework - Assets.csv',
-        expected_headers=['Asset', 'Description', 'Notes', 'Category', 'Tags']
-    ),
-    'controls': SheetConfig(
-        name='Controls',
-        gid='2012626515',
-        filename='Control Framework - Controls.csv',
-        expected_headers=['ID', 'Name', 'Details', 'Parameters', 'Inventory', 'Control type', 'Tested on asset inventory']
-    ),
-    'governance': SheetConfig(
-        name='Governance',
-        gid='627966053',
-        filename='Control Framework - Governance.csv',
-        expected_headers=['ID', 'Expectation', 'Details']
-    )
-}
+    url: str
+    output_dir: Path
+    sheets: List[str]
 
-# Default Google Sheets URL
-DEFAULT_SHEETS_URL = "https://docs.google.com/spreadsheets/d/1XE1bytd649pIb6vyesIq5rNmSna4YpaywiCFVW8IrYM/edit"
+
+@dataclass
+class SyncManifest:
+    """
+    Spreadsheets to sync together, with the pool size and per-host rate limit.
+
+    Examples:
+        >>> manifest = SyncManifest([])
+        >>> manifest.jobs == DEFAULT_JOBS, manifest.rate_limit == DEFAULT_RATE_LIMIT
+        (True, True)
+    """
+    spreadsheets: List[SpreadsheetTarget]
+    jobs: int = DEFAULT_JOBS
+    rate_limit: float = DEFAULT_RATE_LIMIT
+    burst: int = DEFAULT_RATE_BURST
 
 
 def extract_spreadsheet_id(url: str) -> str:
@@ -158,13 +480,44 @@ def extract_spreadsheet_id(url: str) -> str:
     return sheet_id
 
 
-def build_csv_export_url(spreadsheet_id: str, gid: str) -> str:
+def extract_base_url(url: str) -> str:
+    """
+    Extract the origin (scheme and host) of a Google Sheets URL.
+
+    This lets --url point at a local stand-in export server.
+
+    Args:
+        url: Google Sheets URL
+
+    Returns:
+        Origin of the URL, or the Google Sheets origin if it has none
+
+    Examples:
+        >>> extract_base_url("https://docs.google.com/spreadsheets/d/ABC123/edit")
+        'https://docs.google.com'
+
+        >>> extract_base_url("http://127.0.0.1:8765/spreadsheets/d/ABC123/edit")
+        'http://127.0.0.1:8765'
+
+        >>> extract_base_url("/spreadsheets/d/ABC123/edit")
+        'https://docs.google.com'
+    """
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return GOOGLE_SHEETS_BASE_URL
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def build_csv_export_url(
+    spreadsheet_id: str, gid: str, base_url: str = GOOGLE_SHEETS_BASE_URL
+) -> str:
     """
     Build the CSV export URL for a Google Sheets document.
 
     Args:
         spreadsheet_id: The Google Sheets document ID
         gid: The sheet GID (tab identifier)
+        base_url: Origin of the export endpoint
 
     Returns:
         CSV export URL
@@ -175,78 +528,791 @@ def build_csv_export_url(spreadsheet_id: str, gid: str) -> str:
 
         >>> build_csv_export_url("ABC123", "0")
         'https://docs.google.com/spreadsheets/d/ABC123/export?format=csv&gid=0'
+
+        >>> build_csv_export_url("ABC123", "0", "http://127.0.0.1:8765")
+        'http://127.0.0.1:8765/spreadsheets/d/ABC123/export?format=csv&gid=0'
     """
-    return f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/export?format=csv&gid={gid}"
+    return f"{base_url}/spreadsheets/d/{spreadsheet_id}/export?format=csv&gid={gid}"
 
 
-def test_sheet_accessibility(url: str, sheet_config: SheetConfig) -> bool:
+def build_workbook_export_url(
+    spreadsheet_id: str, base_url: str = GOOGLE_SHEETS_BASE_URL
+) -> str:
     """
-    Test if a Google Sheet is accessible without downloading.
+    Build the XLSX export URL for a whole Google Sheets document.
+
+    Examples:
+        >>> build_workbook_export_url("ABC123")
+        'https://docs.google.com/spreadsheets/d/ABC123/export?format=xlsx'
+
+        >>> build_workbook_export_url("ABC123", "http://127.0.0.1:8765")
+        'http://127.0.0.1:8765/spreadsheets/d/ABC123/export?format=xlsx'
+    """
+    return f"{base_url}/spreadsheets/d/{spreadsheet_id}/export?format=xlsx"
+
+
+def create_session(
+    pool_size: int = DEFAULT_JOBS,
+    record_dir: Optional[Path] = None,
+    replay_dir: Optional[Path] = None,
+    rate_limiter: Optional[HostRateLimiter] = None,
+) -> requests.Session:
+    """
+    Create a keep-alive HTTP session shared by all sheet fetches.
+
+    The connection pool is sized to the number of concurrent fetches so that
+    every worker can reuse an open TLS connection instead of handshaking again.
+
+    With ``record_dir`` every response (including redirect hops) is recorded
+    when the session is closed; with ``replay_dir`` no network access is made
+    and responses are served from a previous recording. With ``rate_limiter``
+    every request waits for a token of its host first.
+
+    Args:
+        pool_size: Maximum number of connections kept open per host
+        record_dir: Optional directory to record responses to
+        replay_dir: Optional directory to replay responses from
+        rate_limiter: Optional per-host token-bucket rate limit
+
+    Returns:
+        Configured requests session
+
+    Examples:
+        >>> session = create_session(8)
+        >>> session.get_adapter("https://docs.google.com")._pool_maxsize
+        8
+        >>> session.close()
+    """
+    session = requests.Session() if rate_limiter is None else RateLimitedSession(rate_limiter)
+    adapter: requests.adapters.BaseAdapter
+    if replay_dir is not None:
+        adapter = ReplayAdapter(Recording(replay_dir))
+    elif record_dir is not None:
+        adapter = RecordingAdapter(
+            Recording(record_dir), pool_connections=pool_size, pool_maxsize=pool_size
+        )
+    else:
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class CsvStreamVerifier:
+    """
+    Check, count and hash CSV content in a single pass over its byte chunks.
+
+    Examples:
+        >>> verifier = CsvStreamVerifier()
+        >>> verifier.feed(b"ID,Name\\r\\nA,")
+        >>> verifier.feed(b"Alpha\\r\\nB,Beta")
+        >>> verifier.header
+        'ID,Name'
+        >>> verifier.line_count
+        3
+        >>> verifier.size
+        24
+        >>> verifier.sha256 == hashlib.sha256(b"ID,Name\\r\\nA,Alpha\\r\\nB,Beta").hexdigest()
+        True
+    """
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self._header = bytearray()
+        self._header_complete = False
+        self._newlines = 0
+        self._last_byte = b''
+        self.size = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Account for the next chunk of content."""
+        if not chunk:
+            return
+        self._hash.update(chunk)
+        self._newlines += chunk.count(b'\n')
+        self._last_byte = chunk[-1:]
+        self.size += len(chunk)
+
+        if not self._header_complete:
+            end = chunk.find(b'\n')
+            if end == -1:
+                self._header += chunk
+            else:
+                self._header += chunk[:end]
+                self._header_complete = True
+
+    @property
+    def header(self) -> str:
+        """The first line of the content, stripped."""
+        return self._header.decode('utf-8', errors='replace').strip()
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines, counting a final line without a trailing newline."""
+        if self.size == 0:
+            return 0
+        return self._newlines + (0 if self._last_byte == b'\n' else 1)
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 digest of the content seen so far."""
+        return self._hash.hexdigest()
+
+    def check(self, sheet_config: SheetConfig) -> bool:
+        """
+        Report whether the content has the expected headers and some data rows.
+
+        Examples:
+            >>> verifier = CsvStreamVerifier()
+            >>> verifier.feed(b"ID,Name\\n")
+            >>> verifier.check(SheetConfig("Test", "0", "test.csv", ["ID"]))
+            ⚠️  Warning: Test CSV appears to be empty or only contains headers
+            False
+        """
+        # Check if first line contains expected headers
+        first_line = self.header
+        if not all(header in first_line for header in sheet_config.expected_headers):
+            print(f"⚠️  Warning: {sheet_config.name} CSV headers may not match expected format")
+            print(f"   Expected headers containing: {sheet_config.expected_headers}")
+            print(f"   Got: {first_line}")
+            return False
+
+        # Ensure we have content
+        line_count = self.line_count
+        if line_count < 2:  # Header + at least one data row
+            print(f"⚠️  Warning: {sheet_config.name} CSV appears to be empty or only contains headers")
+            return False
+
+        print(f"✅ {sheet_config.name} CSV verification passed: {line_count} lines (including header)")
+        return True
+
+
+class VerifyingWriter:
+    """
+    Binary file wrapper that feeds everything written to a CsvStreamVerifier.
+
+    Examples:
+        >>> import io
+        >>> verifier = CsvStreamVerifier()
+        >>> writer = VerifyingWriter(io.BytesIO(), verifier)
+        >>> writer.write(b"ID,Name\\r\\nA,B")
+        12
+        >>> verifier.header
+        'ID,Name'
+    """
+
+    def __init__(self, output: BinaryIO, verifier: CsvStreamVerifier):
+        self.output = output
+        self.verifier = verifier
+
+    def write(self, data: bytes) -> int:
+        self.verifier.feed(data)
+        return self.output.write(data)
+
+
+def get_sync_cache_path(output_dir: Path) -> Path:
+    """
+    Return the location of the sync cache for an output directory.
+
+    Examples:
+        >>> get_sync_cache_path(Path("data")).as_posix()
+        'data/.framework-sync/cache.json'
+    """
+    return output_dir / SYNC_STATE_DIRNAME / SYNC_CACHE_FILENAME
+
+
+def load_sync_cache(cache_path: Path) -> Dict[str, CacheEntry]:
+    """
+    Load the sync cache, keyed by CSV filename.
+
+    A missing or unreadable cache is treated as empty, which simply makes the
+    next sync download every sheet in full.
+
+    Examples:
+        >>> load_sync_cache(Path("/nonexistent/cache.json"))
+        {}
+    """
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            raw_cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    known_fields = {field.name for field in fields(CacheEntry)}
+    cache: Dict[str, CacheEntry] = {}
+    for filename, raw_entry in raw_cache.get('sheets', {}).items():
+        try:
+            cache[filename] = CacheEntry(
+                **{key: value for key, value in raw_entry.items() if key in known_fields}
+            )
+        except TypeError:
+            continue
+    return cache
+
+
+def save_sync_cache(cache_path: Path, cache: Dict[str, CacheEntry]) -> None:
+    """
+    Atomically write the sync cache.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     path = Path(tmp) / SYNC_STATE_DIRNAME / SYNC_CACHE_FILENAME
+        ...     save_sync_cache(path, {"a.csv": CacheEntry(url="u", sha256="x")})
+        ...     load_sync_cache(path)["a.csv"].sha256
+        'x'
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = cache_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'sheets': {name: asdict(entry) for name, entry in sorted(cache.items())}},
+            f,
+            indent=2,
+        )
+    os.replace(temp_path, cache_path)
+
+
+def get_fetch_metrics_path(output_dir: Path) -> Path:
+    """
+    Return the location of the per-sheet fetch metrics for an output directory.
+
+    Examples:
+        >>> get_fetch_metrics_path(Path("data")).as_posix()
+        'data/.framework-sync/metrics.json'
+    """
+    return output_dir / SYNC_STATE_DIRNAME / SYNC_METRICS_FILENAME
+
+
+def load_fetch_history(metrics_path: Path) -> Dict[str, FetchHistory]:
+    """
+    Load the retry, hedge and latency history of each sheet, keyed by CSV filename.
+
+    Examples:
+        >>> load_fetch_history(Path("/nonexistent/metrics.json"))
+        {}
+    """
+    try:
+        with open(metrics_path, 'r', encoding='utf-8') as f:
+            raw_metrics = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    known_fields = {field.name for field in fields(FetchHistory)}
+    history: Dict[str, FetchHistory] = {}
+    for filename, raw_entry in raw_metrics.get('sheets', {}).items():
+        try:
+            history[filename] = FetchHistory(
+                **{key: value for key, value in raw_entry.items() if key in known_fields}
+            )
+        except TypeError:
+            continue
+    return history
+
+
+def save_fetch_history(metrics_path: Path, history: Dict[str, FetchHistory]) -> None:
+    """
+    Atomically write the fetch history of each sheet.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     path = Path(tmp) / SYNC_STATE_DIRNAME / SYNC_METRICS_FILENAME
+        ...     save_fetch_history(path, {"a.csv": FetchHistory(fetches=3, retries=1)})
+        ...     load_fetch_history(path)["a.csv"].retries
+        1
+    """
+    metrics_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = metrics_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(
+            {'sheets': {name: asdict(entry) for name, entry in sorted(history.items())}},
+            f,
+            indent=2,
+        )
+    os.replace(temp_path, metrics_path)
+
+
+def get_hedge_delays(output_dir: Path, fetch_options: FetchOptions) -> Dict[str, float]:
+    """
+    Return the hedge delay of each sheet with enough latency history.
+
+    The delay is the p95 of the recent time-to-response of the sheet, so about
+    one request in twenty is hedged. Without --hedge, nothing is hedged.
+
+    Examples:
+        >>> get_hedge_delays(Path("/nonexistent"), FetchOptions(hedge=True))
+        {}
+    """
+    if not fetch_options.hedge:
+        return {}
+    delays: Dict[str, float] = {}
+    for filename, history in load_fetch_history(get_fetch_metrics_path(output_dir)).items():
+        delay = history.hedge_delay()
+        if delay is not None:
+            delays[filename] = delay
+    return delays
+
+
+def record_fetch_metrics(output_dir: Path, results: Dict[str, DownloadResult]) -> None:
+    """
+    Add the retries, hedges and latency of this sync to the fetch history.
+
+    Args:
+        output_dir: Directory holding the CSV files
+        results: Results of this sync, keyed by CSV filename
+    """
+    metrics_path = get_fetch_metrics_path(output_dir)
+    history = load_fetch_history(metrics_path)
+    for filename, result in results.items():
+        history.setdefault(filename, FetchHistory()).record(
+            result.latency,
+            retries=result.attempts - 1,
+            hedged=result.hedged,
+            hedge_won=result.hedge_won,
+            failed=not result.ok,
+        )
+    try:
+        save_fetch_history(metrics_path, history)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not save fetch metrics {metrics_path}: {e}")
+
+
+def get_snapshot_dir(output_dir: Path) -> Path:
+    """
+    Return the location of the snapshot store for an output directory.
+
+    Examples:
+        >>> get_snapshot_dir(Path("data")).as_posix()
+        'data/.framework-sync/snapshots'
+    """
+    return output_dir / SYNC_STATE_DIRNAME / SNAPSHOTS_DIRNAME
+
+
+def record_snapshot(output_dir: Path, cache: Dict[str, CacheEntry]) -> Optional[Snapshot]:
+    """
+    Snapshot the sheet CSVs of an output directory into its snapshot store.
+
+    Only CSVs still matching their cache entry are included, so the recorded
+    hashes are those of the files on disk and need not be computed again.
+    Nothing is recorded when the CSVs are identical to the latest snapshot.
+
+    Args:
+        output_dir: Directory holding the CSV files
+        cache: Sync cache of the directory
+
+    Returns:
+        The new Snapshot, or None if nothing was recorded
+    """
+    files: Dict[str, Path] = {}
+    hashes: Dict[str, str] = {}
+    for sheet_config in SHEETS_CONFIG.values():
+        entry = cache.get(sheet_config.filename)
+        path = output_dir / sheet_config.filename
+        if entry is not None and entry.matches_file(path):
+            files[sheet_config.filename] = path
+            hashes[sheet_config.filename] = entry.sha256
+    if not files:
+        return None
+
+    try:
+        snapshot = SnapshotStore(get_snapshot_dir(output_dir)).record(files, hashes)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not record snapshot in {get_snapshot_dir(output_dir)}: {e}")
+        return None
+    if snapshot is not None:
+        print(f"🗄️  Snapshot {snapshot.id} recorded ({len(files)} files)")
+    return snapshot
+
+
+def save_sync_state(output_dir: Path, entries: Dict[str, CacheEntry]) -> None:
+    """
+    Merge new cache entries into the sync cache and snapshot the synced CSVs.
+
+    Args:
+        output_dir: Directory holding the CSV files
+        entries: Cache entries of this sync, keyed by file name
+    """
+    cache_path = get_sync_cache_path(output_dir)
+    cache = load_sync_cache(cache_path)
+    cache.update(entries)
+    try:
+        save_sync_cache(cache_path, cache)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not save sync cache {cache_path}: {e}")
+    record_snapshot(output_dir, cache)
+
+
+def get_built_stamp_path(output_dir: Path) -> Path:
+    """
+    Return where the hashes of the CSV files last converted and generated are kept.
+
+    Examples:
+        >>> get_built_stamp_path(Path("data")).as_posix()
+        'data/.framework-sync/built.json'
+    """
+    return output_dir / SYNC_STATE_DIRNAME / SYNC_BUILT_FILENAME
+
+
+def load_built_stamp(stamp_path: Path) -> Dict[str, str]:
+    """
+    Load the SHA-256 of each CSV file last converted and generated, keyed by file name.
+
+    Examples:
+        >>> load_built_stamp(Path("/nonexistent/built.json"))
+        {}
+    """
+    try:
+        with open(stamp_path, 'r', encoding='utf-8') as f:
+            sheets = json.load(f).get('sheets', {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return {name: digest for name, digest in sheets.items() if isinstance(digest, str)}
+
+
+def mark_built(output_dir: Path, sheet_names: List[str]) -> List[str]:
+    """
+    Record the CSV files of sheets, as last synced, as converted and generated.
+
+    A CSV file changed locally since its sync is not marked.
+
+    Returns:
+        The sheets marked
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     output_dir = Path(tmp)
+        ...     path = output_dir / SHEETS_CONFIG["assets"].filename
+        ...     _ = path.write_text("Name,Type", encoding="utf-8")
+        ...     stat = path.stat()
+        ...     entry = CacheEntry("u", "x", size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        ...     save_sync_cache(get_sync_cache_path(output_dir), {path.name: entry})
+        ...     before = find_unbuilt_sheets(output_dir, ["assets", "controls"])
+        ...     marked = mark_built(output_dir, ["assets", "controls"])
+        ...     before, marked, find_unbuilt_sheets(output_dir, ["assets", "controls"])
+        (['assets'], ['assets'], [])
+    """
+    cache = load_sync_cache(get_sync_cache_path(output_dir))
+    stamp_path = get_built_stamp_path(output_dir)
+    stamp = load_built_stamp(stamp_path)
+    marked: List[str] = []
+    for name in sheet_names:
+        filename = SHEETS_CONFIG[name].filename
+        entry = cache.get(filename)
+        if entry is not None and entry.matches_file(output_dir / filename):
+            stamp[filename] = entry.sha256
+            marked.append(name)
+
+    stamp_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = stamp_path.with_suffix('.tmp')
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'sheets': dict(sorted(stamp.items()))}, f, indent=2)
+    os.replace(temp_path, stamp_path)
+    return marked
+
+
+def find_unbuilt_sheets(output_dir: Path, sheet_names: List[str]) -> List[str]:
+    """Return the sheets whose last synced CSV was not converted and generated since."""
+    cache = load_sync_cache(get_sync_cache_path(output_dir))
+    stamp = load_built_stamp(get_built_stamp_path(output_dir))
+    unbuilt: List[str] = []
+    for name in sheet_names:
+        filename = SHEETS_CONFIG[name].filename
+        entry = cache.get(filename)
+        if entry is not None and stamp.get(filename) != entry.sha256:
+            unbuilt.append(name)
+    return unbuilt
+
+
+def build_conditional_headers(
+    cache_entry: Optional[CacheEntry], csv_url: str, output_path: Path
+) -> Dict[str, str]:
+    """
+    Build the conditional request headers for a sheet download.
+
+    Validators are only sent when they were recorded for the same export URL
+    and the CSV on disk is still the file that sync wrote.
+
+    Examples:
+        >>> build_conditional_headers(None, "u", Path("x.csv"))
+        {}
+        >>> entry = CacheEntry(url="u", sha256="x", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        >>> build_conditional_headers(entry, "other-url", Path("x.csv"))
+        {}
+    """
+    if cache_entry is None or cache_entry.url != csv_url:
+        return {}
+    if not cache_entry.matches_file(output_path):
+        return {}
+
+    headers: Dict[str, str] = {}
+    if cache_entry.etag:
+        headers['If-None-Match'] = cache_entry.etag
+    if cache_entry.last_modified:
+        headers['If-Modified-Since'] = cache_entry.last_modified
+    return headers
+
+
+def is_not_modified(response: requests.Response, headers: Dict[str, str]) -> bool:
+    """
+    Tell whether an export response is a 304 answering the validators sent in ``headers``.
+
+    Raises for any other status but 200: a 304 to an unconditional request,
+    or any other 3xx or 2xx, has no export to stream.
+
+    Raises:
+        requests.exceptions.HTTPError: If the response is neither
+
+    Examples:
+        >>> response = requests.Response()
+        >>> response.status_code, response.reason, response.url = 304, "Not Modified", "u"
+        >>> is_not_modified(response, {'If-None-Match': '"v1"'})
+        True
+        >>> is_not_modified(response, {})
+        Traceback (most recent call last):
+        ...
+        requests.exceptions.HTTPError: 304 Not Modified for url: u, no export to download
+        >>> response.status_code = 200
+        >>> is_not_modified(response, {})
+        False
+    """
+    if response.status_code == 304 and headers:
+        return True
+    response.raise_for_status()
+    if response.status_code != 200:
+        raise requests.exceptions.HTTPError(
+            f"{response.status_code} {response.reason} for url: {response.url}, no export to download",
+            response=response,
+        )
+    return False
+
+
+def print_sharing_steps() -> None:
+    """
+    Print the steps that make a Google Sheet readable by the export endpoint.
+
+    Examples:
+        >>> print_sharing_steps()
+           1. Open the Google Sheet
+           2. Click 'Share' in the top right
+           3. Click 'Change to anyone with the link'
+           4. Set permission to 'Viewer'
+           5. Click 'Done' and try again
+    """
+    print("   1. Open the Google Sheet")
+    print("   2. Click 'Share' in the top right")
+    print("   3. Click 'Change to anyone with the link'")
+    print("   4. Set permission to 'Viewer'")
+    print("   5. Click 'Done' and try again")
+
+
+def classify_redirect(status_code: Optional[int], location: str) -> Optional[str]:
+    """
+    Classify where an export redirect points to.
+
+    Returns:
+        None if the response is not a redirect, otherwise ``login`` (the sheet
+        is private), ``download`` (the export is served from a download host)
+        or ``other``
+
+    Examples:
+        >>> classify_redirect(200, "") is None
+        True
+        >>> classify_redirect(302, "https://accounts.google.com/ServiceLogin?continue=...")
+        'login'
+        >>> classify_redirect(307, "https://doc-0g-9k-sheets.googleusercontent.com/export/abc")
+        'download'
+        >>> classify_redirect(302, "https://example.com/elsewhere")
+        'other'
+    """
+    if status_code is None or not 300 <= status_code < 400:
+        return None
+    if 'ServiceLogin' in location or 'accounts.google.com' in location:
+        return 'login'
+    host = urlsplit(location).netloc
+    if host.endswith('googleusercontent.com') or '/export' in location:
+        return 'download'
+    return 'other'
+
+
+def probe_sheet(
+    url: str,
+    sheet_config: SheetConfig,
+    session: Optional[requests.Session] = None,
+    spreadsheet: str = '',
+) -> ProbeResult:
+    """
+    Probe the export endpoint of a sheet with a HEAD request, without downloading.
 
     Args:
         url: Google Sheets URL
         sheet_config: Configuration for the sheet to test
+        session: Optional shared HTTP session (a one-off request is made otherwise)
+        spreadsheet: Optional spreadsheet label (manifest name) for the report
 
     Returns:
-        True if accessible, False otherwise
+        ProbeResult with the status, redirect classification and timings
     """
+    result = ProbeResult(spreadsheet, sheet_config.name, url)
+    started = time.perf_counter()
     try:
         # Extract spreadsheet ID from URL
         sheet_id = extract_spreadsheet_id(url)
 
         # Build CSV export URL
-        csv_url = build_csv_export_url(sheet_id, sheet_config.gid)
+        result.url = build_csv_export_url(sheet_id, sheet_config.gid, extract_base_url(url))
 
-        print(f"🔍 Testing {sheet_config.name} sheet accessibility: {csv_url}")
+        print(f"🔍 Testing {sheet_config.name} sheet accessibility: {result.url}")
 
         # Make a HEAD request to test accessibility
-        response = requests.head(csv_url, timeout=10)
+        http = session if session is not None else requests
+        response = http.head(result.url, timeout=PROBE_TIMEOUT)
+        result.total = time.perf_counter() - started
+        result.ttfb = response.elapsed.total_seconds()
+        result.status_code = response.status_code
+        result.location = response.headers.get('location')
+        result.redirect = classify_redirect(response.status_code, result.location or '')
 
         if response.status_code == 200:
             print(f"✅ {sheet_config.name} sheet is accessible!")
-            return True
+            result.accessible = True
         elif response.status_code in [302, 307]:
             # Check if redirect is to login page
-            location = response.headers.get('location', '')
-            if 'ServiceLogin' in location or 'accounts.google.com' in location:
+            if result.redirect == 'login':
                 print(f"❌ {sheet_config.name} sheet requires authentication (private)")
-                return False
             else:
                 print(f"✅ {sheet_config.name} sheet is accessible (redirect to download)!")
-                return True
+                result.accessible = True
         else:
             print(f"❌ {sheet_config.name} sheet: Unexpected status code: {response.status_code}")
-            return False
 
     except Exception as e:
+        result.total = time.perf_counter() - started
+        result.error = str(e)
         print(f"❌ Error testing {sheet_config.name} sheet accessibility: {e}")
-        return False
+    return result
 
 
-def download_sheet_as_csv(url: str, sheet_config: SheetConfig, output_dir: Path) -> bool:
+def test_sheet_accessibility(
+    url: str, sheet_config: SheetConfig, session: Optional[requests.Session] = None
+) -> bool:
     """
-    Download a Google Sheet as CSV and save to specified directory.
+    Test if a Google Sheet is accessible without downloading.
 
     Args:
         url: Google Sheets URL
-        sheet_config: Configuration for the sheet to download
-        output_dir: Directory where to save the CSV file
+        sheet_config: Configuration for the sheet to test
+        session: Optional shared HTTP session (a one-off request is made otherwise)
 
     Returns:
-        True if successful, False otherwise
+        True if accessible, False otherwise
     """
-    try:
-        # Extract spreadsheet ID from URL
-        sheet_id = extract_spreadsheet_id(url)
+    return probe_sheet(url, sheet_config, session).accessible
 
-        # Build CSV export URL
-        csv_url = build_csv_export_url(sheet_id, sheet_config.gid)
 
-        print(f"📥 Downloading {sheet_config.name} sheet from: {csv_url}")
+def install_csv(
+    temp_path: Path,
+    output_path: Path,
+    verifier: CsvStreamVerifier,
+    sheet_config: SheetConfig,
+    new_entry: CacheEntry,
+    cache_entry: Optional[CacheEntry] = None,
+) -> DownloadResult:
+    """
+    Move a completely written temporary CSV into place, unless it is unchanged or invalid.
+
+    The temporary file must live in the same directory as the output file so
+    that the replacement is atomic. When its hash matches the previous sync
+    and the file on disk is untouched, the old file is kept as is. A CSV
+    without the expected headers or without data rows is deleted, and the
+    previous CSV is kept for csv2yaml.py.
+
+    Args:
+        temp_path: Fully written and flushed temporary CSV
+        output_path: Final location of the CSV
+        verifier: Verifier fed with the content of the temporary CSV
+        sheet_config: SheetConfig of the sheet
+        new_entry: Cache entry describing the new content
+        cache_entry: Cache entry from the previous sync, if any
 
-        # Download the CSV
-        response = requests.get(csv_url, timeout=30)
-        response.raise_for_status()
+    Returns:
+        DownloadResult describing the outcome
+    """
+    # Same content as the file written by the previous sync: leave it alone
+    if (
+        cache_entry is not None
+        and cache_entry.sha256 == new_entry.sha256
+        and cache_entry.matches_file(output_path)
+    ):
+        new_entry.size = cache_entry.size
+        new_entry.mtime_ns = cache_entry.mtime_ns
+        new_entry.changed_at = cache_entry.changed_at
+        print(f"✅ {sheet_config.name} sheet content unchanged since last sync")
+        return DownloadResult(
+            sheet_config.name, STATUS_UNCHANGED, new_entry, bytes_received=verifier.size
+        )
+
+    if not verifier.check(sheet_config):
+        temp_path.unlink(missing_ok=True)
+        print(f"❌ {sheet_config.name} sheet failed verification, keeping the previous CSV")
+        return DownloadResult(sheet_config.name, STATUS_FAILED, bytes_received=verifier.size)
+
+    # Atomically replace the previous CSV with the complete download
+    replace_file(temp_path, output_path)
+
+    stat = output_path.stat()
+    new_entry.size = stat.st_size
+    new_entry.mtime_ns = stat.st_mtime_ns
+    new_entry.changed_at = time.time()
+
+    print(f"✅ {sheet_config.name} sheet downloaded successfully!")
+    return DownloadResult(sheet_config.name, STATUS_CHANGED, new_entry, True, verifier.size)
+
+
+def fetch_sheet_export(
+    http: Any,
+    csv_url: str,
+    sheet_config: SheetConfig,
+    output_dir: Path,
+    cache_entry: Optional[CacheEntry],
+    timeout: float,
+    hedge_delay: Optional[float] = None,
+) -> DownloadResult:
+    """
+    Make one attempt at streaming a CSV export into place.
+
+    Args:
+        http: requests session (or the requests module) to fetch with
+        csv_url: CSV export URL of the sheet
+        sheet_config: Configuration for the sheet to download
+        output_dir: Directory where to save the CSV file
+        cache_entry: Optional validators and hash recorded by the previous sync
+        timeout: Connect and read timeout, in seconds
+        hedge_delay: Send a hedge request if no response arrived after this delay
+
+    Returns:
+        DownloadResult with the status, cache entry and hedge outcome
+
+    Raises:
+        requests.exceptions.RequestException: On network errors and HTTP errors
+    """
+    output_path = output_dir / sheet_config.filename
+
+    # Stream the CSV, conditional on the validators of the previous sync
+    headers = build_conditional_headers(cache_entry, csv_url, output_path)
+    started = time.perf_counter()
+    response, hedged, hedge_won = hedged_get(
+        http, csv_url, hedge_delay, timeout=timeout, headers=headers, stream=True
+    )
+    latency = time.perf_counter() - started
+    with response:
+        if is_not_modified(response, headers):
+            print(f"✅ {sheet_config.name} sheet not modified since last sync")
+            return DownloadResult(
+                sheet_config.name, STATUS_UNCHANGED, cache_entry,
+                hedged=hedged, hedge_won=hedge_won, latency=latency,
+            )
 
         # Check if we got HTML instead of CSV (common with permission issues)
         content_type = response.headers.get('content-type', '')
@@ -256,47 +1322,155 @@ def download_sheet_as_csv(url: str, sheet_config: SheetConfig, output_dir: Path)
             print("   - The URL is incorrect")
             print("   - The sheet doesn't exist")
             print("\n💡 To fix this:")
-            print("   1. Open the Google Sheet")
-            print("   2. Click 'Share' in the top right")
-            print("   3. Click 'Change to anyone with the link'")
-            print("   4. Set permission to 'Viewer'")
-            print("   5. Click 'Done' and try again")
-            return False
+            print_sharing_steps()
+            return DownloadResult(sheet_config.name, STATUS_FAILED, hedged=hedged, hedge_won=hedge_won)
+
+        # Ensure output directory exists
+        os.makedirs(output_dir, exist_ok=True)
+
+        # Stream to a temporary file next to the target, checking headers,
+        # counting lines and hashing in the same pass
+        verifier = CsvStreamVerifier()
+        temp_file = create_temp_file(output_path)
+        temp_path = Path(temp_file.name)
+        try:
+            with temp_file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    verifier.feed(chunk)
+                    temp_file.write(chunk)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+
+            new_entry = CacheEntry(
+                url=csv_url,
+                sha256=verifier.sha256,
+                etag=response.headers.get('etag'),
+                last_modified=response.headers.get('last-modified'),
+            )
+            result = install_csv(temp_path, output_path, verifier, sheet_config, new_entry, cache_entry)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    result.hedged = hedged
+    result.hedge_won = hedge_won
+    result.latency = latency
+    return result
+
+
+def get_retry_delay(
+    label: str, error: requests.exceptions.RequestException, attempt: int, policy: RetryPolicy
+) -> Optional[float]:
+    """
+    Decide whether a failed attempt is tried again, and announce it.
+
+    Returns:
+        Seconds to wait before the next attempt, or None if the error is
+        not retried (not retryable, or no attempt left)
+    """
+    if attempt >= policy.attempts or not policy.should_retry(error):
+        return None
+    response = getattr(error, 'response', None)
+    retry_after = parse_retry_after(
+        response.headers.get('retry-after') if response is not None else None
+    )
+    delay = policy.backoff(attempt - 1, retry_after)
+    print(f"🔁 {label}: {error}")
+    print(f"   Retrying in {delay:.1f}s (attempt {attempt + 1}/{policy.attempts})")
+    return delay
+
+
+def download_sheet_as_csv(
+    url: str,
+    sheet_config: SheetConfig,
+    output_dir: Path,
+    session: Optional[requests.Session] = None,
+    cache_entry: Optional[CacheEntry] = None,
+    fetch_options: Optional[FetchOptions] = None,
+    hedge_delay: Optional[float] = None,
+) -> DownloadResult:
+    """
+    Download a Google Sheet as CSV and save to specified directory.
+
+    The export is streamed in chunks to a temporary file while its headers are
+    checked, its lines counted and its content hashed, then atomically renamed
+    over the previous CSV. A failed download never leaves a partial CSV behind,
+    and a CSV without the expected headers or rows never replaces the previous one.
+
+    When a cache entry from a previous sync is given, the request is made
+    conditional on its validators and the CSV is only replaced if the content
+    hash differs, so unchanged sheets keep their file (and mtime) untouched.
+
+    Network errors, timeouts, 429 and 5xx responses are retried according to
+    the retry policy, with jittered exponential backoff. With ``hedge_delay``,
+    an attempt whose response has not arrived after that delay is raced
+    against a second identical request.
+
+    Args:
+        url: Google Sheets URL
+        sheet_config: Configuration for the sheet to download
+        output_dir: Directory where to save the CSV file
+        session: Optional shared HTTP session (a one-off request is made otherwise)
+        cache_entry: Optional validators and hash recorded by the previous sync
+        fetch_options: Timeout and retry policy (defaults to FetchOptions())
+        hedge_delay: Optional delay after which a hedge request is sent
+
+    Returns:
+        DownloadResult with the status, the cache entry to record and the
+        retry and hedge counts
+    """
+    options = fetch_options or FetchOptions()
+    policy = options.retry_policy
+    attempt = 1
+    try:
+        # Extract spreadsheet ID from URL
+        sheet_id = extract_spreadsheet_id(url)
 
-        # Ensure output directory exists
-        os.makedirs(output_dir, exist_ok=True)
+        # Build CSV export URL
+        csv_url = build_csv_export_url(sheet_id, sheet_config.gid, extract_base_url(url))
 
-        # Save the CSV content
-        output_path = output_dir / sheet_config.filename
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(response.text)
+        print(f"📥 Downloading {sheet_config.name} sheet from: {csv_url}")
 
-        print(f"✅ {sheet_config.name} sheet downloaded successfully!")
-        return True
+        http = session if session is not None else requests
+        while True:
+            try:
+                result = fetch_sheet_export(
+                    http, csv_url, sheet_config, output_dir, cache_entry, options.timeout, hedge_delay
+                )
+            except requests.exceptions.RequestException as e:
+                delay = get_retry_delay(sheet_config.name, e, attempt, policy)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            result.attempts = attempt
+            if result.hedged:
+                winner = "hedge" if result.hedge_won else "first request"
+                print(f"🏁 {sheet_config.name}: hedged after {hedge_delay:.2f}s, {winner} answered first")
+            return result
 
     except requests.exceptions.RequestException as e:
         print(f"❌ Network error downloading {sheet_config.name} sheet: {e}")
         if "401" in str(e) or "Unauthorized" in str(e):
             print("\n💡 This is likely a permissions issue. The Google Sheet needs to be public.")
             print("   To make it public:")
-            print("   1. Open the Google Sheet")
-            print("   2. Click 'Share' in the top right")
-            print("   3. Click 'Change to anyone with the link'")
-            print("   4. Set permission to 'Viewer'")
-            print("   5. Click 'Done' and try again")
-        return False
+            print_sharing_steps()
+        return DownloadResult(sheet_config.name, STATUS_FAILED, attempts=attempt)
     except ValueError as e:
         print(f"❌ URL parsing error for {sheet_config.name}: {e}")
-        return False
+        return DownloadResult(sheet_config.name, STATUS_FAILED, attempts=attempt)
     except Exception as e:
         print(f"❌ Unexpected error downloading {sheet_config.name}: {e}")
-        return False
+        return DownloadResult(sheet_config.name, STATUS_FAILED, attempts=attempt)
 
 
 def verify_csv_content(csv_path: Path, sheet_config: SheetConfig) -> bool:
     """
     Verify that the downloaded CSV has the expected structure.
 
+    The file is read once, in chunks, through CsvStreamVerifier.
+
     Args:
         csv_path: Path to the CSV file
         sheet_config: Configuration for the sheet including expected headers
@@ -339,30 +1513,755 @@ def verify_csv_content(csv_path: Path, sheet_config: SheetConfig) -> bool:
         >>> os.unlink(temp_path2)
     """
     try:
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            first_line = f.readline().strip()
+        verifier = CsvStreamVerifier()
+        with open(csv_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+                verifier.feed(chunk)
+        return verifier.check(sheet_config)
 
-        # Check if first line contains expected headers
-        if not all(header in first_line for header in sheet_config.expected_headers):
-            print(f"⚠️  Warning: {sheet_config.name} CSV headers may not match expected format")
-            print(f"   Expected headers containing: {sheet_config.expected_headers}")
-            print(f"   Got: {first_line}")
-            return False
+    except Exception as e:
+        print(f"❌ Error verifying {sheet_config.name} CSV: {e}")
+        return False
 
-        # Count lines to ensure we have content
-        with open(csv_path, 'r', encoding='utf-8') as f:
-            line_count = sum(1 for _ in f)
 
-        if line_count < 2:  # Header + at least one data row
-            print(f"⚠️  Warning: {sheet_config.name} CSV appears to be empty or only contains headers")
-            return False
+def sync_sheet(
+    url: str,
+    sheet_config: SheetConfig,
+    output_dir: Path,
+    session: requests.Session,
+    cache_entry: Optional[CacheEntry] = None,
+    fetch_options: Optional[FetchOptions] = None,
+    hedge_delay: Optional[float] = None,
+) -> DownloadResult:
+    """
+    Download a single sheet and report on its verification.
 
-        print(f"✅ {sheet_config.name} CSV verification passed: {line_count} lines (including header)")
-        return True
+    Args:
+        url: Google Sheets URL
+        sheet_config: Configuration for the sheet to download
+        output_dir: Directory where to save the CSV file
+        session: Shared HTTP session
+        cache_entry: Optional validators and hash recorded by the previous sync
+        fetch_options: Timeout and retry policy
+        hedge_delay: Optional delay after which a hedge request is sent
 
-    except Exception as e:
-        print(f"❌ Error verifying {sheet_config.name} CSV: {e}")
-        return False
+    Returns:
+        DownloadResult for the sheet
+    """
+    output_path = output_dir / sheet_config.filename
+
+    # Check if output file already exists
+    if output_path.exists():
+        print(f"📄 Existing file: {output_path}")
+        print("   This will be overwritten if download succeeds.")
+
+    # Download the sheet (the content is verified while it streams to disk)
+    result = download_sheet_as_csv(
+        url, sheet_config, output_dir, session, cache_entry, fetch_options, hedge_delay
+    )
+    if result.status == STATUS_CHANGED:
+        print(f"📄 {sheet_config.name} file saved to: {output_path}")
+    return result
+
+
+def sync_sheets(
+    url: str,
+    sheet_names: List[str],
+    output_dir: Path,
+    jobs: int,
+    force: bool = False,
+    session: Optional[requests.Session] = None,
+    fetch_options: Optional[FetchOptions] = None,
+) -> List[DownloadResult]:
+    """
+    Download several sheets concurrently over one keep-alive session.
+
+    Sheets are fetched by a pool of at most ``jobs`` worker threads, so the
+    wall-clock time is close to that of the slowest sheet rather than the sum
+    of all of them. Validators and hashes from the previous sync are used to
+    skip sheets that have not changed, unless ``force`` is set. Retries,
+    hedges and latency of each sheet are added to its fetch history. What
+    each sheet prints is shown in one piece, in the order of ``sheet_names``.
+
+    Args:
+        url: Google Sheets URL
+        sheet_names: Keys of SHEETS_CONFIG to download
+        output_dir: Directory where to save the CSV files
+        jobs: Maximum number of concurrent fetches
+        force: Ignore the sync cache and rewrite every sheet
+        session: Optional HTTP session to use (a pooled one is created otherwise)
+        fetch_options: Timeout, retry policy and hedging
+
+    Returns:
+        One DownloadResult per sheet, in the order of ``sheet_names``
+    """
+    fetch_options = fetch_options or FetchOptions()
+    cache = {} if force else load_sync_cache(get_sync_cache_path(output_dir))
+    hedge_delays = get_hedge_delays(output_dir, fetch_options)
+
+    workers = max(1, min(jobs, len(sheet_names)))
+    http = session if session is not None else create_session(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, OrderedOutput() as output:
+            futures = []
+            for name in sheet_names:
+                sheet_config = SHEETS_CONFIG[name]
+                futures.append(executor.submit(
+                    output.buffered(sync_sheet),
+                    url,
+                    sheet_config,
+                    output_dir,
+                    http,
+                    cache.get(sheet_config.filename),
+                    fetch_options,
+                    hedge_delays.get(sheet_config.filename),
+                ))
+            results = output.collect(futures)
+    finally:
+        if session is None:
+            http.close()
+
+    # Record the validators of every successful download for the next run
+    save_sync_state(output_dir, {
+        SHEETS_CONFIG[name].filename: result.cache_entry
+        for name, result in zip(sheet_names, results)
+        if result.cache_entry is not None
+    })
+    record_fetch_metrics(output_dir, {
+        SHEETS_CONFIG[name].filename: result for name, result in zip(sheet_names, results)
+    })
+
+    return results
+
+
+def fetch_workbook_export(
+    http: Any,
+    workbook_url: str,
+    workbook_path: Path,
+    cache_entry: Optional[CacheEntry],
+    timeout: float,
+    hedge_delay: Optional[float] = None,
+) -> Optional[DownloadResult]:
+    """
+    Make one attempt at streaming the XLSX export into the sync state.
+
+    Args:
+        http: requests session (or the requests module) to fetch with
+        workbook_url: XLSX export URL of the spreadsheet
+        workbook_path: Where the workbook is kept
+        cache_entry: Optional validators and hash recorded by the previous sync
+        timeout: Connect and read timeout, in seconds
+        hedge_delay: Send a hedge request if no response arrived after this delay
+
+    Returns:
+        DownloadResult for the workbook, or None if the response is not a workbook
+
+    Raises:
+        requests.exceptions.RequestException: On network errors and HTTP errors
+    """
+    headers = build_conditional_headers(cache_entry, workbook_url, workbook_path)
+    started = time.perf_counter()
+    response, hedged, hedge_won = hedged_get(
+        http, workbook_url, hedge_delay, timeout=timeout, headers=headers, stream=True
+    )
+    latency = time.perf_counter() - started
+    with response:
+        if is_not_modified(response, headers):
+            print("✅ Workbook not modified since last sync")
+            return DownloadResult(
+                WORKBOOK_FILENAME, STATUS_UNCHANGED, cache_entry,
+                hedged=hedged, hedge_won=hedge_won, latency=latency,
+            )
+
+        content_type = response.headers.get('content-type', '')
+        if 'text/html' in content_type:
+            print("❌ Error downloading workbook: Received HTML instead of XLSX.")
+            print("   The spreadsheet is probably not publicly accessible.")
+            print("\n💡 To fix this:")
+            print_sharing_steps()
+            return None
+
+        workbook_path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        temp_file = create_temp_file(workbook_path)
+        temp_path = Path(temp_file.name)
+        try:
+            with temp_file:
+                for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    temp_file.write(chunk)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+
+            if not zipfile.is_zipfile(temp_path):
+                print("❌ Error downloading workbook: the response is not an XLSX file")
+                return None
+
+            new_entry = CacheEntry(
+                url=workbook_url,
+                sha256=digest.hexdigest(),
+                etag=response.headers.get('etag'),
+                last_modified=response.headers.get('last-modified'),
+            )
+            if (
+                cache_entry is not None
+                and cache_entry.sha256 == new_entry.sha256
+                and cache_entry.matches_file(workbook_path)
+            ):
+                new_entry.size = cache_entry.size
+                new_entry.mtime_ns = cache_entry.mtime_ns
+                new_entry.changed_at = cache_entry.changed_at
+                print("✅ Workbook content unchanged since last sync")
+                return DownloadResult(
+                    WORKBOOK_FILENAME, STATUS_UNCHANGED, new_entry,
+                    hedged=hedged, hedge_won=hedge_won, latency=latency,
+                )
+
+            replace_file(temp_path, workbook_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    stat = workbook_path.stat()
+    new_entry.size = stat.st_size
+    new_entry.mtime_ns = stat.st_mtime_ns
+    new_entry.changed_at = time.time()
+    print(f"✅ Workbook downloaded successfully! ({stat.st_size} bytes)")
+    return DownloadResult(
+        WORKBOOK_FILENAME, STATUS_CHANGED, new_entry, True,
+        hedged=hedged, hedge_won=hedge_won, latency=latency,
+    )
+
+
+def download_workbook(
+    url: str,
+    output_dir: Path,
+    session: requests.Session,
+    cache_entry: Optional[CacheEntry] = None,
+    fetch_options: Optional[FetchOptions] = None,
+    hedge_delay: Optional[float] = None,
+) -> Optional[DownloadResult]:
+    """
+    Download the whole spreadsheet as one XLSX workbook into the sync state.
+
+    The workbook is kept in data/.framework-sync/ so that a later sync can
+    ask for it conditionally and split it again without another request.
+    It is fetched with the timeout, retry policy and hedging of the CSV
+    exports.
+
+    Args:
+        url: Google Sheets URL
+        output_dir: Directory where the CSV files are saved
+        session: Shared HTTP session
+        cache_entry: Optional validators and hash recorded by the previous sync
+        fetch_options: Timeout and retry policy (defaults to FetchOptions())
+        hedge_delay: Optional delay after which a hedge request is sent
+
+    Returns:
+        DownloadResult for the workbook, or None if the download failed
+    """
+    options = fetch_options or FetchOptions()
+    attempt = 1
+    try:
+        sheet_id = extract_spreadsheet_id(url)
+        workbook_url = build_workbook_export_url(sheet_id, extract_base_url(url))
+        workbook_path = output_dir / SYNC_STATE_DIRNAME / WORKBOOK_FILENAME
+
+        print(f"📥 Downloading workbook from: {workbook_url}")
+
+        while True:
+            try:
+                result = fetch_workbook_export(
+                    session, workbook_url, workbook_path, cache_entry, options.timeout, hedge_delay
+                )
+            except requests.exceptions.RequestException as e:
+                delay = get_retry_delay("Workbook", e, attempt, options.retry_policy)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+            if result is not None:
+                result.attempts = attempt
+                if result.hedged:
+                    winner = "hedge" if result.hedge_won else "first request"
+                    print(f"🏁 Workbook: hedged after {hedge_delay:.2f}s, {winner} answered first")
+            return result
+
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Network error downloading workbook: {e}")
+        return None
+    except ValueError as e:
+        print(f"❌ URL parsing error for workbook: {e}")
+        return None
+    except OSError as e:
+        print(f"❌ Error saving workbook: {e}")
+        return None
+
+
+def split_workbook_sheet_to_csv(
+    workbook: WorkbookReader,
+    workbook_entry: CacheEntry,
+    sheet_config: SheetConfig,
+    output_dir: Path,
+    cache_entry: Optional[CacheEntry] = None,
+) -> Optional[DownloadResult]:
+    """
+    Extract one sheet of the downloaded workbook into its CSV file.
+
+    The CSV is written to a temporary file through the same verifier as a
+    direct download, and only replaces the previous CSV if its hash changed.
+
+    Args:
+        workbook: Reader of the downloaded XLSX workbook
+        workbook_entry: Cache entry of the workbook
+        sheet_config: Configuration for the sheet, whose name is the tab name
+        output_dir: Directory where to save the CSV file
+        cache_entry: Cache entry recorded for the CSV by the previous sync
+
+    Returns:
+        DownloadResult for the sheet, or None if it has cells shown with a
+        number format, which the CSV export applies but the split does not
+    """
+    output_path = output_dir / sheet_config.filename
+    verifier = CsvStreamVerifier()
+    temp_file = create_temp_file(output_path)
+    temp_path = Path(temp_file.name)
+    try:
+        with temp_file:
+            output = VerifyingWriter(temp_file, verifier)
+            try:
+                found = workbook.write_sheet(sheet_config.name, output)
+            except ValueError as e:
+                print(f"ℹ️  {sheet_config.name} sheet cannot be split from the workbook: {e}")
+                return None
+            if not found:
+                print(f"❌ Error: Workbook has no '{sheet_config.name}' sheet")
+                return DownloadResult(sheet_config.name, STATUS_FAILED)
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+
+        new_entry = CacheEntry(url=workbook_entry.url, sha256=verifier.sha256)
+        return install_csv(temp_path, output_path, verifier, sheet_config, new_entry, cache_entry)
+    except (OSError, zipfile.BadZipFile, ParseError) as e:
+        print(f"❌ Error extracting {sheet_config.name} sheet from workbook: {e}")
+        return DownloadResult(sheet_config.name, STATUS_FAILED)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def sync_workbook(
+    url: str,
+    sheet_names: List[str],
+    output_dir: Path,
+    force: bool = False,
+    session: Optional[requests.Session] = None,
+    fetch_options: Optional[FetchOptions] = None,
+) -> List[DownloadResult]:
+    """
+    Sync sheets from a single XLSX export of the whole spreadsheet.
+
+    One request replaces one request per sheet, made with the same timeout,
+    retries and hedging as the CSV exports. When the workbook itself is
+    unchanged, sheets whose CSV is still the one extracted from it are
+    reported unchanged without opening the workbook: the reader only opens
+    it when a sheet has to be extracted. A sheet with cells
+    shown with a number format (dates, percentages, currencies) is
+    downloaded from its own CSV export instead, which applies the format.
+
+    Args:
+        url: Google Sheets URL
+        sheet_names: Keys of SHEETS_CONFIG to extract
+        output_dir: Directory where to save the CSV files
+        force: Ignore the sync cache and rewrite every sheet
+        session: Optional HTTP session to use (one is created otherwise)
+        fetch_options: Timeout, retry policy and hedging
+
+    Returns:
+        One DownloadResult per sheet, in the order of ``sheet_names``
+    """
+    fetch_options = fetch_options or FetchOptions()
+    cache_path = get_sync_cache_path(output_dir)
+    cache = {} if force else load_sync_cache(cache_path)
+    hedge_delays = get_hedge_delays(output_dir, fetch_options)
+
+    http = session if session is not None else create_session(1)
+    try:
+        workbook = download_workbook(
+            url, output_dir, http, cache.get(WORKBOOK_FILENAME),
+            fetch_options, hedge_delays.get(WORKBOOK_FILENAME),
+        )
+        if workbook is None:
+            record_fetch_metrics(output_dir, {WORKBOOK_FILENAME: DownloadResult(WORKBOOK_FILENAME, STATUS_FAILED)})
+            return [DownloadResult(SHEETS_CONFIG[name].name, STATUS_FAILED) for name in sheet_names]
+
+        results: List[DownloadResult] = []
+        # Opens the workbook on the first sheet that has to be extracted
+        with WorkbookReader(output_dir / SYNC_STATE_DIRNAME / WORKBOOK_FILENAME) as reader:
+            for name in sheet_names:
+                sheet_config = SHEETS_CONFIG[name]
+                cache_entry = cache.get(sheet_config.filename)
+                if (
+                    workbook.status == STATUS_UNCHANGED
+                    and cache_entry is not None
+                    and cache_entry.url == workbook.cache_entry.url
+                    and cache_entry.matches_file(output_dir / sheet_config.filename)
+                ):
+                    print(f"✅ {sheet_config.name} sheet unchanged since last sync")
+                    results.append(DownloadResult(sheet_config.name, STATUS_UNCHANGED, cache_entry))
+                    continue
+
+                result = split_workbook_sheet_to_csv(
+                    reader, workbook.cache_entry, sheet_config, output_dir, cache_entry
+                )
+                if result is None:
+                    results.append(sync_sheet(
+                        url, sheet_config, output_dir, http, cache_entry,
+                        fetch_options, hedge_delays.get(sheet_config.filename),
+                    ))
+                    continue
+                if result.status == STATUS_CHANGED:
+                    print(f"📄 {sheet_config.name} file saved to: {output_dir / sheet_config.filename}")
+                results.append(result)
+    finally:
+        if session is None:
+            http.close()
+
+    entries = {WORKBOOK_FILENAME: workbook.cache_entry}
+    for name, result in zip(sheet_names, results):
+        if result.cache_entry is not None:
+            entries[SHEETS_CONFIG[name].filename] = result.cache_entry
+    save_sync_state(output_dir, entries)
+    record_fetch_metrics(output_dir, {WORKBOOK_FILENAME: workbook})
+
+    return results
+
+
+def parse_manifest(raw: Any, base_dir: Path) -> SyncManifest:
+    """
+    Validate a sync manifest loaded from YAML.
+
+    Relative output directories are resolved against ``base_dir``, the
+    directory of the manifest file. Sheets default to every sheet.
+
+    Args:
+        raw: Parsed YAML document
+        base_dir: Directory relative output directories are resolved against
+
+    Returns:
+        SyncManifest
+
+    Raises:
+        ValueError: If the manifest is malformed
+
+    Examples:
+        >>> manifest = parse_manifest({
+        ...     "jobs": 8,
+        ...     "rate_limit": {"requests_per_second": 2, "burst": 4},
+        ...     "spreadsheets": [
+        ...         {"name": "retail", "url": DEFAULT_SHEETS_URL, "output_dir": "retail",
+        ...          "sheets": ["assets"]},
+        ...         {"name": "cloud", "url": DEFAULT_SHEETS_URL, "output_dir": "/srv/cloud"},
+        ...     ],
+        ... }, Path("/manifests"))
+        >>> manifest.jobs, manifest.rate_limit, manifest.burst
+        (8, 2.0, 4)
+        >>> [(t.name, t.output_dir.as_posix(), t.sheets) for t in manifest.spreadsheets]
+        [('retail', '/manifests/retail', ['assets']), ('cloud', '/srv/cloud', ['assets', 'controls', 'governance'])]
+
+        >>> parse_manifest({"spreadsheets": [{"name": "a", "url": "u", "output_dir": "d",
+        ...                                   "sheets": ["nope"]}]}, Path("."))
+        Traceback (most recent call last):
+        ...
+        ValueError: spreadsheet 'a': unknown sheet 'nope'
+    """
+    if not isinstance(raw, dict) or not isinstance(raw.get('spreadsheets'), list):
+        raise ValueError("manifest must be a mapping with a 'spreadsheets' list")
+
+    rate_limit = raw.get('rate_limit') or {}
+    try:
+        jobs = int(raw.get('jobs', DEFAULT_JOBS))
+        rate = float(rate_limit.get('requests_per_second', DEFAULT_RATE_LIMIT))
+        burst = int(rate_limit.get('burst', DEFAULT_RATE_BURST))
+    except (AttributeError, TypeError, ValueError):
+        raise ValueError("'jobs', 'rate_limit.requests_per_second' and 'rate_limit.burst' must be numbers")
+    if jobs < 1 or rate <= 0 or burst < 1:
+        raise ValueError("'jobs', 'rate_limit.requests_per_second' and 'rate_limit.burst' must be positive")
+
+    targets: List[SpreadsheetTarget] = []
+    seen_names = set()
+    seen_dirs = set()
+    for index, entry in enumerate(raw['spreadsheets']):
+        if not isinstance(entry, dict):
+            raise ValueError(f"spreadsheet #{index + 1} must be a mapping")
+        name = str(entry.get('name') or f"#{index + 1}")
+        for key in ('url', 'output_dir'):
+            if not entry.get(key):
+                raise ValueError(f"spreadsheet '{name}': missing '{key}'")
+        sheets = entry.get('sheets') or list(SHEETS_CONFIG.keys())
+        for sheet in sheets:
+            if sheet not in SHEETS_CONFIG:
+                raise ValueError(f"spreadsheet '{name}': unknown sheet '{sheet}'")
+
+        output_dir = Path(entry['output_dir'])
+        if not output_dir.is_absolute():
+            output_dir = base_dir / output_dir
+        # Each spreadsheet owns its directory: CSV names and the sync cache would collide
+        if name in seen_names or output_dir in seen_dirs:
+            raise ValueError(f"spreadsheet '{name}': duplicate name or output_dir")
+        seen_names.add(name)
+        seen_dirs.add(output_dir)
+        targets.append(SpreadsheetTarget(name, str(entry['url']), output_dir, list(sheets)))
+
+    return SyncManifest(targets, jobs, rate, burst)
+
+
+def load_manifest(manifest_path: Path) -> SyncManifest:
+    """
+    Load and validate a sync manifest file.
+
+    Raises:
+        ValueError: If the file cannot be read or is malformed
+    """
+    try:
+        raw = load_yaml_file(manifest_path)
+    except (OSError, yaml.YAMLError) as e:
+        raise ValueError(f"cannot read manifest {manifest_path}: {e}")
+    return parse_manifest(raw, manifest_path.resolve().parent)
+
+
+def order_by_recent_change(
+    tasks: List[Tuple[SpreadsheetTarget, str]],
+    caches: Dict[Path, Dict[str, CacheEntry]],
+) -> List[Tuple[SpreadsheetTarget, str]]:
+    """
+    Order (spreadsheet, sheet) fetches so that recently changed sheets go first.
+
+    Sheets never synced before have no change time and go last; ties keep the
+    manifest order.
+
+    Examples:
+        >>> a = SpreadsheetTarget("a", "u", Path("a"), ["assets", "controls"])
+        >>> caches = {Path("a"): {
+        ...     "Control Framework - Assets.csv": CacheEntry(url="u", sha256="x", changed_at=100.0),
+        ...     "Control Framework - Controls.csv": CacheEntry(url="u", sha256="y", changed_at=200.0),
+        ... }}
+        >>> [sheet for _, sheet in order_by_recent_change(
+        ...     [(a, "governance"), (a, "assets"), (a, "controls")], caches)]
+        ['controls', 'assets', 'governance']
+    """
+    def changed_at(task: Tuple[SpreadsheetTarget, str]) -> float:
+        target, sheet = task
+        entry = caches[target.output_dir].get(SHEETS_CONFIG[sheet].filename)
+        return entry.changed_at if entry is not None else 0.0
+
+    return sorted(tasks, key=lambda task: -changed_at(task))
+
+
+def sync_manifest(
+    manifest: SyncManifest,
+    force: bool = False,
+    session: Optional[requests.Session] = None,
+    fetch_options: Optional[FetchOptions] = None,
+) -> Tuple[List[Tuple[SpreadsheetTarget, DownloadResult]], FetchStats, float]:
+    """
+    Sync every sheet of every spreadsheet in a manifest through one worker pool.
+
+    All fetches share a bounded pool of ``manifest.jobs`` threads and one
+    keep-alive session whose requests are rate limited per host. Fetches are
+    submitted most recently changed first, so the sheets most likely to have
+    changed again are refreshed earliest. What each fetch prints is shown in
+    one piece, in that order.
+
+    Args:
+        manifest: Spreadsheets to sync
+        force: Ignore the sync caches and rewrite every sheet
+        session: Optional HTTP session to use (a rate-limited one is created otherwise)
+        fetch_options: Timeout, retry policy and hedging
+
+    Returns:
+        Tuple of ((spreadsheet, result) in fetch order, fetch statistics, wall-clock time)
+    """
+    fetch_options = fetch_options or FetchOptions()
+    caches: Dict[Path, Dict[str, CacheEntry]] = {}
+    hedge_delays: Dict[Path, Dict[str, float]] = {}
+    tasks: List[Tuple[SpreadsheetTarget, str]] = []
+    for target in manifest.spreadsheets:
+        caches[target.output_dir] = {} if force else load_sync_cache(get_sync_cache_path(target.output_dir))
+        hedge_delays[target.output_dir] = get_hedge_delays(target.output_dir, fetch_options)
+        tasks.extend((target, sheet) for sheet in target.sheets)
+    tasks = order_by_recent_change(tasks, caches)
+
+    stats = FetchStats()
+
+    def fetch(target: SpreadsheetTarget, sheet: str) -> DownloadResult:
+        sheet_config = SHEETS_CONFIG[sheet]
+        started = time.perf_counter()
+        result = sync_sheet(
+            target.url,
+            sheet_config,
+            target.output_dir,
+            http,
+            caches[target.output_dir].get(sheet_config.filename),
+            fetch_options,
+            hedge_delays[target.output_dir].get(sheet_config.filename),
+        )
+        throttled = limiter.take_waited() if limiter is not None else 0.0
+        stats.add(time.perf_counter() - started - throttled, result.bytes_received, throttled)
+        return result
+
+    workers = max(1, min(manifest.jobs, len(tasks)))
+    http = session if session is not None else create_session(
+        workers, rate_limiter=HostRateLimiter(manifest.rate_limit, manifest.burst)
+    )
+    limiter: Optional[HostRateLimiter] = getattr(http, 'limiter', None)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, OrderedOutput() as output:
+            futures = [executor.submit(output.buffered(fetch), target, sheet) for target, sheet in tasks]
+            results = output.collect(futures)
+    finally:
+        if session is None:
+            http.close()
+    elapsed = time.perf_counter() - started
+
+    # Record the validators of every successful download, per output directory
+    for target in manifest.spreadsheets:
+        save_sync_state(target.output_dir, {
+            SHEETS_CONFIG[sheet].filename: result.cache_entry
+            for (task_target, sheet), result in zip(tasks, results)
+            if task_target is target and result.cache_entry is not None
+        })
+        record_fetch_metrics(target.output_dir, {
+            SHEETS_CONFIG[sheet].filename: result
+            for (task_target, sheet), result in zip(tasks, results)
+            if task_target is target
+        })
+
+    return [(target, result) for (target, _), result in zip(tasks, results)], stats, elapsed
+
+
+def probe_sheets(
+    probes: List[Tuple[str, str, SheetConfig]],
+    jobs: int,
+    session: Optional[requests.Session] = None,
+) -> Tuple[List[ProbeResult], float]:
+    """
+    Probe many sheets concurrently over one keep-alive session.
+
+    All probes are in flight at once (up to ``jobs``), so checking any number
+    of sheets takes about as long as the slowest round trip. What each probe
+    prints is shown in one piece, in the order of ``probes``.
+
+    Args:
+        probes: (spreadsheet label, Google Sheets URL, sheet) triples
+        jobs: Maximum number of concurrent probes
+        session: Optional HTTP session to use (a pooled one is created otherwise)
+
+    Returns:
+        Tuple of (one ProbeResult per probe in order, wall-clock time)
+    """
+    workers = max(1, min(jobs, len(probes)))
+    http = session if session is not None else create_session(workers)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor, OrderedOutput() as output:
+            futures = [
+                executor.submit(output.buffered(probe_sheet), url, sheet_config, http, label)
+                for label, url, sheet_config in probes
+            ]
+            results = output.collect(futures)
+    finally:
+        if session is None:
+            http.close()
+    return results, time.perf_counter() - started
+
+
+def test_sheets(
+    url: str,
+    sheet_names: List[str],
+    jobs: int,
+    session: Optional[requests.Session] = None,
+) -> bool:
+    """
+    Test the accessibility of several sheets over one keep-alive session.
+
+    Args:
+        url: Google Sheets URL
+        sheet_names: Keys of SHEETS_CONFIG to test
+        jobs: Maximum number of concurrent probes
+        session: Optional HTTP session to use (a pooled one is created otherwise)
+
+    Returns:
+        True if every sheet is accessible, False otherwise
+    """
+    results, _ = probe_sheets(
+        [('', url, SHEETS_CONFIG[name]) for name in sheet_names], jobs, session
+    )
+    return all(result.accessible for result in results)
+
+
+def build_probe_report(results: List[ProbeResult], elapsed: float) -> Dict[str, Any]:
+    """
+    Build the machine-readable report of an accessibility test.
+
+    Examples:
+        >>> report = build_probe_report(
+        ...     [ProbeResult("", "Assets", "u", 200, accessible=True, ttfb=0.12, total=0.15),
+        ...      ProbeResult("", "Controls", "u", 302, redirect="login", ttfb=0.3, total=0.31)],
+        ...     elapsed=0.32)
+        >>> report["accessible"], report["summary"]
+        (False, {'probes': 2, 'accessible': 1, 'elapsed': 0.32, 'ttfb_p50': 0.12, 'ttfb_p95': 0.3})
+        >>> report["probes"][1]["redirect"]
+        'login'
+    """
+    ttfbs = [result.ttfb for result in results if result.ttfb is not None]
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'accessible': all(result.accessible for result in results),
+        'summary': {
+            'probes': len(results),
+            'accessible': sum(result.accessible for result in results),
+            'elapsed': round(elapsed, 4),
+            'ttfb_p50': round(percentile(ttfbs, 50), 4),
+            'ttfb_p95': round(percentile(ttfbs, 95), 4),
+        },
+        'probes': [
+            {
+                key: round(value, 4) if isinstance(value, float) else value
+                for key, value in asdict(result).items()
+            }
+            for result in results
+        ],
+    }
+
+
+def print_probe_table(results: List[ProbeResult]) -> None:
+    """
+    Print one line per probe with its status, redirect and timings.
+
+    Examples:
+        >>> print_probe_table([ProbeResult("retail", "Assets", "u", 307, redirect="download",
+        ...                                accessible=True, ttfb=0.1234, total=0.2)])
+           ✅ retail/Assets  307 download  ttfb 0.123s  total 0.200s
+    """
+    for result in results:
+        label = f"{result.spreadsheet}/{result.sheet}" if result.spreadsheet else result.sheet
+        status = result.status_code if result.status_code is not None else 'error'
+        ttfb = f"{result.ttfb:.3f}s" if result.ttfb is not None else '-'
+        total = f"{result.total:.3f}s" if result.total is not None else '-'
+        print(
+            f"   {'✅' if result.accessible else '❌'} {label}  {status} "
+            f"{result.redirect or '-'}  ttfb {ttfb}  total {total}"
+        )
+
+
+def write_probe_report(report_path: Path, report: Dict[str, Any]) -> None:
+    """Write the accessibility report as JSON."""
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+        f.write('\n')
 
 
 def show_help() -> None:
@@ -391,15 +2290,55 @@ This script downloads framework sheets from the Google Spreadsheet and saves the
 as CSV files. It supports downloading individual sheets or all sheets at once.
 
 Usage:
-    ./scripts/framework-sync.py [SHEET] [--test] [--url URL] [--help] [--doctests]
+    ./scripts/framework-sync.py [SHEET] [--test [--report FILE]] [--url URL]
+                                [--jobs N] [--force] [--workbook] [--manifest FILE]
+                                [--exit-unchanged] [--mark-built] [--retries N]
+                                [--timeout SECONDS]
+                                [--hedge] [--record DIR | --replay DIR]
+                                [--watch [--interval SECONDS] [--max-interval SECONDS]
+                                         [--debounce SECONDS]]
+                                [--help] [--doctests]
 
 Arguments:
     SHEET     Optional sheet to download: assets, controls, governance
               If not specified, downloads all sheets
 
 Options:
-    --test     Test the URL and connection without downloading
+    --test     Test the URL and connection without downloading: every sheet is
+               probed concurrently and reported with its status, redirect
+               target (login, download, other), time to first byte and total time
+    --report   With --test, also write the report as JSON to FILE
     --url      Use a custom Google Sheets URL instead of the default
+    --jobs     Maximum number of sheets fetched concurrently (default: 4)
+    --force    Ignore the sync cache and re-download and rewrite every sheet
+    --workbook Download the whole spreadsheet as one XLSX workbook and split it
+               locally into the per-sheet CSV files (one request instead of one
+               per sheet); a sheet with formatted numbers or dates is still
+               downloaded from its CSV export
+    --manifest Sync every spreadsheet listed in a YAML manifest (see below)
+               through one bounded worker pool, rate limited per host
+    --exit-unchanged
+               Exit with status 3 when no sheet changed since the last sync and
+               every sheet was converted and generated since (see --mark-built)
+    --mark-built
+               Record that the CSV files of the sheets, as last synced, were
+               converted and generated, without downloading anything
+    --retries  Retries after a network error, timeout, 429 or 5xx response,
+               with jittered exponential backoff (default: 2)
+    --timeout  Timeout of each export request in seconds (default: 30)
+    --hedge    Send a second request for a sheet (or the workbook) whose response
+               takes longer than its p95 latency so far, and use whichever
+               answers first
+    --record   Record every export response (headers, redirects, status) to DIR
+    --replay   Serve every request from a recording in DIR, without network access
+    --watch    Keep polling the sheets and, once edits settle, convert the sheets
+               that changed and regenerate their pages (until Ctrl+C)
+    --interval With --watch, shortest time between polls in seconds (default: 5);
+               polls back off from it while nothing changes
+    --max-interval
+               With --watch, longest time between polls in seconds (default: 300)
+    --debounce With --watch, seconds without further changes before the
+               downstream stages run (default: 5)
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -408,6 +2347,17 @@ Supported Sheets:
     controls    Downloads "Control Framework - Controls.csv" from the Controls sheet
     governance  Downloads "Control Framework - Governance.csv" from the Governance sheet
 
+Manifest (YAML):
+    jobs: 8                       # concurrent fetches (default: 4)
+    rate_limit:                   # per host (default: 5 requests/s, burst 5)
+      requests_per_second: 2
+      burst: 4
+    spreadsheets:
+      - name: retail
+        url: https://docs.google.com/spreadsheets/d/ABC123/edit
+        output_dir: retail        # relative to the manifest file
+        sheets: [assets, controls]  # default: all sheets
+
 Examples:
     ./scripts/framework-sync.py
         Download all framework sheets
@@ -424,9 +2374,39 @@ Examples:
     ./scripts/framework-sync.py assets --test
         Test accessibility of Assets sheet only
 
+    ./scripts/framework-sync.py --manifest forks.yml --test --report preflight.json
+        Test every sheet of a manifest and write a JSON report
+
     ./scripts/framework-sync.py --url "https://docs.google.com/spreadsheets/d/ABC123/edit"
         Download all sheets from a custom Google Sheets URL
 
+    ./scripts/framework-sync.py --jobs 2
+        Download all sheets, fetching at most two at a time
+
+    ./scripts/framework-sync.py --workbook
+        Download all sheets with a single XLSX workbook request
+
+    ./scripts/framework-sync.py --manifest forks.yml
+        Sync every spreadsheet listed in forks.yml
+
+    ./scripts/framework-sync.py --retries 4 --hedge
+        Retry failed exports up to 4 times and hedge slow ones
+
+    ./scripts/framework-sync.py --exit-unchanged
+        Download all sheets, exiting with status 3 if none of them changed
+
+    ./scripts/framework-sync.py --mark-built
+        Record the synced sheets as converted and generated
+
+    ./scripts/framework-sync.py --watch
+        Keep the YAML data and the pages in sync with the spreadsheet while editing it
+
+    ./scripts/framework-sync.py --record recordings/sheets
+        Download all sheets and record the export responses for offline replay
+
+    ./scripts/framework-sync.py --replay recordings/sheets --test
+        Test accessibility against recorded responses, without network access
+
     ./scripts/framework-sync.py --doctests
         Run all doctests to verify functionality
 
@@ -434,12 +2414,84 @@ Note: The Google Sheet must be publicly accessible (shared with "anyone with the
 """)
 
 
-def parse_arguments() -> tuple[List[str], bool, str]:
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Args:
+        argv: Command line arguments
+        option: Option name, e.g. '--jobs'
+
+    Returns:
+        The argument following the option, or None
+
+    Examples:
+        >>> get_option_value(["framework-sync.py", "--jobs", "8"], "--jobs")
+        '8'
+        >>> get_option_value(["framework-sync.py", "assets"], "--jobs") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def get_seconds_option(argv: List[str], option: str, default: float) -> float:
+    """
+    Return the positive number of seconds given to an option, or the default.
+
+    Examples:
+        >>> get_seconds_option(['framework-sync.py', '--timeout', '2.5'], '--timeout', 30.0)
+        2.5
+        >>> get_seconds_option(['framework-sync.py'], '--timeout', 30.0)
+        30.0
+    """
+    value = get_option_value(argv, option)
+    if value is None:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0
+    if not seconds > 0:
+        print(f"❌ Error: {option} must be a positive number of seconds, got '{value}'")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return seconds
+
+
+def get_positional_arguments(argv: List[str]) -> List[str]:
+    """
+    Return the positional arguments, skipping flags and option values.
+
+    Examples:
+        >>> get_positional_arguments(["framework-sync.py", "assets", "--jobs", "2", "--test"])
+        ['assets']
+    """
+    positional: List[str] = []
+    skip_next = False
+    for arg in argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg in VALUE_OPTIONS:
+            skip_next = True
+        elif not arg.startswith('--'):
+            positional.append(arg)
+    return positional
+
+
+def parse_arguments() -> SyncOptions:
     """
     Parse command line arguments.
 
     Returns:
-        Tuple of (sheets_to_download, test_mode, sheets_url)
+        SyncOptions with the sheets to download, test mode, URL and sync flags
 
     Note:
         This function modifies sys.argv and therefore cannot be easily tested
@@ -452,30 +2504,88 @@ def parse_arguments() -> tuple[List[str], bool, str]:
 
     # Parse arguments
     test_mode = '--test' in sys.argv
-    custom_url = None
+    force = '--force' in sys.argv
+    exit_unchanged = '--exit-unchanged' in sys.argv
+    mark_built = '--mark-built' in sys.argv
+    workbook = '--workbook' in sys.argv
+    custom_url = get_option_value(sys.argv, '--url')
     sheets_to_download: List[str] = []
 
-    # Remove flags from argv to get positional arguments
-    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    jobs = DEFAULT_JOBS
+    jobs_value = get_option_value(sys.argv, '--jobs')
+    if jobs_value is not None:
+        if not jobs_value.isdigit() or int(jobs_value) < 1:
+            print(f"❌ Error: --jobs must be a positive integer, got '{jobs_value}'")
+            print("Use --help for usage information")
+            sys.exit(1)
+        jobs = int(jobs_value)
 
-    # Check for custom URL
-    if '--url' in sys.argv:
-        try:
-            url_index = sys.argv.index('--url')
-            if url_index + 1 < len(sys.argv):
-                custom_url = sys.argv[url_index + 1]
-            else:
-                print("❌ Error: --url option requires a URL argument")
-                print("Use --help for usage information")
-                sys.exit(1)
-        except ValueError:
-            pass
+    fetch_options = FetchOptions(hedge='--hedge' in sys.argv)
+    retries_value = get_option_value(sys.argv, '--retries')
+    if retries_value is not None:
+        if not retries_value.isdigit():
+            print(f"❌ Error: --retries must be a non-negative integer, got '{retries_value}'")
+            print("Use --help for usage information")
+            sys.exit(1)
+        fetch_options.retry_policy.attempts = int(retries_value) + 1
+    fetch_options.timeout = get_seconds_option(sys.argv, '--timeout', fetch_options.timeout)
+
+    watch = '--watch' in sys.argv
+    watch_interval = get_seconds_option(sys.argv, '--interval', DEFAULT_WATCH_INTERVAL)
+    watch_max_interval = get_seconds_option(
+        sys.argv, '--max-interval', max(DEFAULT_WATCH_MAX_INTERVAL, watch_interval)
+    )
+    debounce = get_seconds_option(sys.argv, '--debounce', DEFAULT_DEBOUNCE)
+    watch_options = [option for option in ('--interval', '--max-interval', '--debounce') if option in sys.argv]
+    if watch_options and not watch:
+        print(f"❌ Error: {', '.join(watch_options)} can only be used with --watch")
+        print("Use --help for usage information")
+        sys.exit(1)
+    if mark_built and (test_mode or watch):
+        print("❌ Error: --mark-built cannot be combined with --test or --watch")
+        print("Use --help for usage information")
+        sys.exit(1)
+    if watch and ('--test' in sys.argv or '--manifest' in sys.argv):
+        print("❌ Error: --watch cannot be combined with --test or --manifest")
+        print("Use --help for usage information")
+        sys.exit(1)
+    if watch_max_interval < watch_interval:
+        print("❌ Error: --max-interval must not be shorter than --interval")
+        print("Use --help for usage information")
+        sys.exit(1)
+
+    report_value = get_option_value(sys.argv, '--report')
+    if report_value is not None and not test_mode:
+        print("❌ Error: --report can only be used with --test")
+        print("Use --help for usage information")
+        sys.exit(1)
+
+    manifest_value = get_option_value(sys.argv, '--manifest')
+    if manifest_value is not None:
+        conflicting = [option for option in ('--url', '--jobs', '--workbook') if option in sys.argv]
+        if conflicting or get_positional_arguments(sys.argv):
+            print("❌ Error: --manifest cannot be combined with sheet names, --url, --jobs or --workbook")
+            print("Use --help for usage information")
+            sys.exit(1)
+        if not Path(manifest_value).is_file():
+            print(f"❌ Error: Manifest not found: {manifest_value}")
+            sys.exit(1)
+
+    record_value = get_option_value(sys.argv, '--record')
+    replay_value = get_option_value(sys.argv, '--replay')
+    if record_value and replay_value:
+        print("❌ Error: --record and --replay cannot be used together")
+        print("Use --help for usage information")
+        sys.exit(1)
+    if replay_value and not Path(replay_value).is_dir():
+        print(f"❌ Error: Recording directory not found: {replay_value}")
+        sys.exit(1)
 
     # Parse sheet arguments
-    for arg in args:
+    for arg in get_positional_arguments(sys.argv):
         if arg in SHEETS_CONFIG:
             sheets_to_download.append(arg)
-        elif arg != custom_url:  # Ignore the URL if it was passed as positional
+        else:
             print(f"❌ Error: Unknown sheet '{arg}'")
             print(f"Available sheets: {', '.join(SHEETS_CONFIG.keys())}")
             print("Use --help for usage information")
@@ -487,69 +2597,423 @@ def parse_arguments() -> tuple[List[str], bool, str]:
 
     sheets_url = custom_url or DEFAULT_SHEETS_URL
 
-    return sheets_to_download, test_mode, sheets_url
+    return SyncOptions(
+        sheets_to_download,
+        test_mode,
+        sheets_url,
+        jobs,
+        force,
+        exit_unchanged,
+        mark_built,
+        record_dir=Path(record_value) if record_value else None,
+        replay_dir=Path(replay_value) if replay_value else None,
+        workbook=workbook,
+        manifest=Path(manifest_value) if manifest_value else None,
+        fetch=fetch_options,
+        report_path=Path(report_value) if report_value else None,
+        watch=watch,
+        watch_interval=watch_interval,
+        watch_max_interval=watch_max_interval,
+        debounce=debounce,
+    )
+
+
+def format_fetch_metrics(results: List[DownloadResult], labels: Optional[List[str]] = None) -> List[str]:
+    """
+    Summarize the retries and hedges of a sync, one line each (none if there were none).
+
+    Examples:
+        >>> format_fetch_metrics([
+        ...     DownloadResult("Assets", STATUS_CHANGED, attempts=3),
+        ...     DownloadResult("Controls", STATUS_UNCHANGED, hedged=True, hedge_won=True),
+        ...     DownloadResult("Governance", STATUS_UNCHANGED),
+        ... ])
+        ['🔁 Retried: Assets (2 retries)', '🏁 Hedged: Controls (hedge won)']
+        >>> format_fetch_metrics([DownloadResult("Assets", STATUS_UNCHANGED)])
+        []
+    """
+    labels = labels or [result.sheet for result in results]
+    retried = [
+        f"{label} ({result.attempts - 1} {'retry' if result.attempts == 2 else 'retries'})"
+        for label, result in zip(labels, results)
+        if result.attempts > 1
+    ]
+    hedged = [
+        f"{label} ({'hedge' if result.hedge_won else 'first request'} won)"
+        for label, result in zip(labels, results)
+        if result.hedged
+    ]
+    lines = []
+    if retried:
+        lines.append(f"🔁 Retried: {', '.join(retried)}")
+    if hedged:
+        lines.append(f"🏁 Hedged: {', '.join(hedged)}")
+    return lines
+
+
+def build_downstream_stages(sheet_names: List[str]) -> List[List[str]]:
+    """
+    List the stages (script and arguments) that rebuild the given sheets.
+
+    Examples:
+        >>> build_downstream_stages(['controls', 'governance'])
+        [['csv2yaml.py', 'controls', 'governance'], ['validate-references.py'], ['generate-control-pages.py'], ['generate-governance-pages.py']]
+    """
+    return [
+        [CONVERT_SCRIPT, *sheet_names],
+        [VALIDATE_SCRIPT],
+        *[[GENERATE_SCRIPTS[name]] for name in sheet_names],
+    ]
+
+
+def run_downstream_stages(sheet_names: List[str], project_root: Path) -> bool:
+    """
+    Run the conversion, the reference check and the page generation of the given sheets only.
+
+    Args:
+        sheet_names: Keys of SHEETS_CONFIG whose CSV changed
+        project_root: Root of the repository
+
+    Returns:
+        True if every stage succeeded
+    """
+    scripts_dir = project_root / 'scripts'
+    for script, *arguments in build_downstream_stages(sheet_names):
+        print(f"⚙️  {script} {' '.join(arguments)}".rstrip(), flush=True)
+        completed = subprocess.run(
+            [sys.executable, str(scripts_dir / script), *arguments], cwd=project_root
+        )
+        if completed.returncode != 0:
+            print(f"❌ {script} failed with status {completed.returncode}")
+            return False
+    return True
+
+
+def watch_sheets(
+    options: SyncOptions,
+    output_dir: Path,
+    session: requests.Session,
+) -> None:
+    """
+    Keep polling the sheets and rebuild what depends on the ones that change.
+
+    Each poll is an ordinary sync: conditional requests and content hashes
+    make an unchanged sheet cost one small request and no disk write. The
+    interval backs off from ``watch_interval`` to ``watch_max_interval`` while
+    nothing changes and drops back to the shortest one after a change.
+    Changes are collected until none has arrived for ``debounce`` seconds,
+    then the downstream stages run once, only for the sheets that changed.
+    A sheet whose rebuild failed is tried again after a delay that starts
+    at ``debounce`` (or ``watch_interval`` if longer) and doubles with each
+    failure, up to ``watch_max_interval``. A new edit of the sheet retries it as soon as
+    the edits settle.
+
+    Runs until interrupted.
+    """
+    project_root = output_dir.parent
+    interval = AdaptiveInterval(options.watch_interval, options.watch_max_interval)
+    debouncer = ChangeDebouncer(options.debounce)
+    force = options.force
+    # Sheets whose rebuild failed: backoff, and when to try again
+    retry_backoffs: Dict[str, AdaptiveInterval] = {}
+    retry_at: Dict[str, float] = {}
+
+    print("👀 Watching Framework Sheets...")
+    print(f"📊 Source: {options.sheets_url}")
+    print(f"📋 Sheets: {', '.join(options.sheets)}")
+    print(
+        f"⏱️  Polling every {options.watch_interval:g}s to {options.watch_max_interval:g}s, "
+        f"debounce {options.debounce:g}s"
+    )
+    print("Press Ctrl+C to stop watching")
+
+    try:
+        while True:
+            # Polls are quiet unless they fail
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                if options.workbook:
+                    results = sync_workbook(
+                        options.sheets_url, options.sheets, output_dir, force, session, options.fetch
+                    )
+                else:
+                    results = sync_sheets(
+                        options.sheets_url, options.sheets, output_dir, options.jobs,
+                        force, session, options.fetch,
+                    )
+            force = False
+
+            stamp = time.strftime('%H:%M:%S')
+            changed = [
+                name for name, result in zip(options.sheets, results)
+                if result.status == STATUS_CHANGED
+            ]
+            failed = [result.sheet for result in results if not result.ok]
+            if failed:
+                print(f"⚠️  {stamp} Poll failed for: {', '.join(failed)}")
+                print(output.getvalue().rstrip())
+
+            if changed:
+                print(f"✏️  {stamp} Changed: {', '.join(SHEETS_CONFIG[name].name for name in changed)}")
+                debouncer.add(changed)
+                interval.changed()
+                for name in changed:
+                    retry_backoffs.pop(name, None)
+                    retry_at.pop(name, None)
+            elif not debouncer.pending:
+                interval.idle()
+
+            # Failed rebuilds whose delay is over go back to the debouncer
+            due = [name for name, when in retry_at.items() if when <= time.monotonic()]
+            for name in due:
+                del retry_at[name]
+            debouncer.add(due)
+
+            if debouncer.ready():
+                settled = debouncer.take()
+                pending = [name for name in options.sheets if name in settled]
+                print(f"🔧 {stamp} Rebuilding: {', '.join(pending)}")
+                if run_downstream_stages(pending, project_root):
+                    mark_built(output_dir, pending)
+                    for name in pending:
+                        retry_backoffs.pop(name, None)
+                    print(f"✅ {time.strftime('%H:%M:%S')} Rebuilt: {', '.join(pending)}")
+                else:
+                    # The sync cache already has these edits: try again
+                    # later, less often each time it fails
+                    first_delay = max(options.debounce, options.watch_interval)
+                    retry_delay = 0.0
+                    for name in pending:
+                        backoff = retry_backoffs.setdefault(
+                            name,
+                            AdaptiveInterval(first_delay, max(first_delay, options.watch_max_interval), factor=2.0),
+                        )
+                        retry_delay = max(retry_delay, backoff.current)
+                        retry_at[name] = time.monotonic() + backoff.current
+                        backoff.idle()
+                    print(
+                        f"🔁 {time.strftime('%H:%M:%S')} Will retry in {retry_delay:g}s, "
+                        f"or once edited: {', '.join(pending)}"
+                    )
+
+            delay = interval.current
+            if debouncer.pending:
+                delay = min(delay, max(debouncer.remaining(), 0.1))
+            if retry_at:
+                delay = min(delay, max(min(retry_at.values()) - time.monotonic(), 0.1))
+            if not changed and not failed:
+                print(f"🕐 {stamp} No change, next poll in {delay:.1f}s")
+            time.sleep(delay)
+    except KeyboardInterrupt:
+        if debouncer.pending or retry_at:
+            print(f"\n⚠️  Not rebuilt yet: {', '.join(sorted(debouncer.pending | set(retry_at)))}")
+        print("\n👋 Watcher stopped")
+
+
+def run_accessibility_test(
+    probes: List[Tuple[str, str, SheetConfig]],
+    jobs: int,
+    session: requests.Session,
+    report_path: Optional[Path] = None,
+) -> None:
+    """Probe sheets concurrently, print a summary, write the report and exit on failure."""
+    results, elapsed = probe_sheets(probes, jobs, session)
+    report = build_probe_report(results, elapsed)
+
+    print(f"\n📊 Accessibility report ({len(results)} sheets in {elapsed:.2f}s):")
+    print_probe_table(results)
+    if report_path is not None:
+        try:
+            write_probe_report(report_path, report)
+            print(f"📝 Report written to: {report_path}")
+        except OSError as e:
+            print(f"⚠️  Warning: Could not write report {report_path}: {e}")
+
+    if report['accessible']:
+        print("✅ All tests passed! Sheets are accessible and ready for download.")
+    else:
+        print("❌ Some tests failed! Please check the sheet permissions.")
+        sys.exit(1)
+
+
+def run_manifest_sync(options: SyncOptions) -> None:
+    """Sync every spreadsheet of a manifest and report throughput and latency."""
+    try:
+        manifest = load_manifest(options.manifest)
+    except ValueError as e:
+        print(f"❌ Error: Invalid manifest: {e}")
+        sys.exit(1)
+
+    if options.mark_built:
+        for target in manifest.spreadsheets:
+            marked = mark_built(target.output_dir, target.sheets)
+            print(f"🏷️  {target.name}: marked as built: {', '.join(marked) or 'none'}")
+        return
+
+    sheet_count = sum(len(target.sheets) for target in manifest.spreadsheets)
+    workers = max(1, min(manifest.jobs, sheet_count))
+    limiter = HostRateLimiter(manifest.rate_limit, manifest.burst)
+    session = create_session(workers, options.record_dir, options.replay_dir, limiter)
+    if options.replay_dir:
+        print(f"📼 Replaying recorded responses from: {options.replay_dir}")
+    elif options.record_dir:
+        print(f"⏺️  Recording responses to: {options.record_dir}")
+
+    if options.test_mode:
+        print("🧪 Testing Google Sheets Access...")
+        print(f"🗂️  Manifest: {options.manifest}")
+        print(f"📋 {len(manifest.spreadsheets)} spreadsheets, {sheet_count} sheets")
+        with session:
+            run_accessibility_test(
+                [
+                    (target.name, target.url, SHEETS_CONFIG[sheet])
+                    for target in manifest.spreadsheets
+                    for sheet in target.sheets
+                ],
+                manifest.jobs,
+                session,
+                options.report_path,
+            )
+        return
+
+    print("🔄 Syncing Framework Spreadsheets...")
+    print(f"🗂️  Manifest: {options.manifest}")
+    print(f"📋 {len(manifest.spreadsheets)} spreadsheets, {sheet_count} sheets")
+    print(f"⚡ Concurrent fetches: {workers}")
+    print(f"🚦 Rate limit per host: {manifest.rate_limit:g} requests/s (burst {manifest.burst})")
+
+    with session:
+        results, stats, elapsed = sync_manifest(manifest, options.force, session, options.fetch)
+
+    changed: List[str] = []
+    failed: List[str] = []
+    print("\n📊 Sync report:")
+    for target in manifest.spreadsheets:
+        statuses = [
+            f"{result.sheet} {result.status}"
+            for result_target, result in results
+            if result_target is target
+        ]
+        print(f"   {target.name} ({target.output_dir}): {', '.join(statuses)}")
+        for result_target, result in results:
+            if result_target is target and result.status == STATUS_CHANGED:
+                changed.append(f"{target.name}/{result.sheet}")
+            elif result_target is target and not result.ok:
+                failed.append(f"{target.name}/{result.sheet}")
+    print(f"⏱️  {stats.summary(elapsed)}")
+    for line in format_fetch_metrics(
+        [result for _, result in results],
+        [f"{target.name}/{result.sheet}" for target, result in results],
+    ):
+        print(line)
+
+    if failed:
+        print(f"❌ Some downloads failed: {', '.join(failed)}")
+        sys.exit(1)
+
+    print("✅ All downloads completed successfully!")
+    print(f"📊 Changed: {', '.join(changed) or 'none'}")
+    if options.exit_unchanged and not changed:
+        unbuilt = [
+            f"{target.name}/{name}"
+            for target in manifest.spreadsheets
+            for name in find_unbuilt_sheets(target.output_dir, target.sheets)
+        ]
+        if unbuilt:
+            print(f"🔧 Not built since their last sync: {', '.join(unbuilt)}")
+            return
+        print("💤 No sheet changed since the last sync")
+        sys.exit(EXIT_UNCHANGED)
 
 
 def main() -> None:
     """Main function to orchestrate the downloads."""
-    sheets_to_download, test_mode, sheets_url = parse_arguments()
+    options = parse_arguments()
+    if options.manifest is not None:
+        run_manifest_sync(options)
+        return
 
     # Get script directory and project root
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
     output_dir = project_root / 'data'
 
-    if test_mode:
-        print("🧪 Testing Google Sheets Access...")
-        print(f"📊 Source: {sheets_url}")
-        print(f"📋 Testing sheets: {', '.join(sheets_to_download)}")
-
-        all_accessible = True
-        for sheet_name in sheets_to_download:
-            sheet_config = SHEETS_CONFIG[sheet_name]
-            success = test_sheet_accessibility(sheets_url, sheet_config)
-            if not success:
-                all_accessible = False
-
-        if all_accessible:
-            print("✅ All tests passed! Sheets are accessible and ready for download.")
-        else:
-            print("❌ Some tests failed! Please check the sheet permissions.")
-            sys.exit(1)
-    else:
+    if options.mark_built:
+        marked = mark_built(output_dir, options.sheets)
+        print(f"🏷️  Marked as built: {', '.join(marked) or 'none'}")
+        return
+
+    workers = max(1, min(options.jobs, len(options.sheets)))
+    session = create_session(workers, options.record_dir, options.replay_dir)
+    if options.replay_dir:
+        print(f"📼 Replaying recorded responses from: {options.replay_dir}")
+    elif options.record_dir:
+        print(f"⏺️  Recording responses to: {options.record_dir}")
+
+    with session:
+        if options.test_mode:
+            print("🧪 Testing Google Sheets Access...")
+            print(f"📊 Source: {options.sheets_url}")
+            print(f"📋 Testing sheets: {', '.join(options.sheets)}")
+
+            run_accessibility_test(
+                [('', options.sheets_url, SHEETS_CONFIG[name]) for name in options.sheets],
+                options.jobs,
+                session,
+                options.report_path,
+            )
+            return
+
+        if options.watch:
+            watch_sheets(options, output_dir, session)
+            return
+
         print("🔄 Downloading Framework Sheets...")
-        print(f"📊 Source: {sheets_url}")
-        print(f"📋 Sheets to download: {', '.join(sheets_to_download)}")
+        print(f"📊 Source: {options.sheets_url}")
+        print(f"📋 Sheets to download: {', '.join(options.sheets)}")
         print(f"📂 Target directory: {output_dir}")
 
-        all_successful = True
-        for sheet_name in sheets_to_download:
-            sheet_config = SHEETS_CONFIG[sheet_name]
-            output_path = output_dir / sheet_config.filename
-
-            # Check if output file already exists
-            if output_path.exists():
-                print(f"📄 Existing file: {output_path}")
-                print("   This will be overwritten if download succeeds.")
-
-            # Download the sheet
-            success = download_sheet_as_csv(sheets_url, sheet_config, output_dir)
-
-            if success:
-                # Verify the content
-                if verify_csv_content(output_path, sheet_config):
-                    print(f"📄 {sheet_config.name} file saved to: {output_path}")
-                else:
-                    print(f"⚠️  {sheet_config.name} download completed but verification had warnings")
-                    print("   Please review the file manually")
-            else:
-                all_successful = False
-
-        if all_successful:
-            print("✅ All downloads completed successfully!")
+        if options.workbook:
+            print("📚 Mode: single workbook export")
+            results = sync_workbook(
+                options.sheets_url,
+                options.sheets,
+                output_dir,
+                options.force,
+                session,
+                options.fetch,
+            )
         else:
-            print("❌ Some downloads failed!")
-            sys.exit(1)
+            print(f"⚡ Concurrent fetches: {workers}")
+            results = sync_sheets(
+                options.sheets_url,
+                options.sheets,
+                output_dir,
+                options.jobs,
+                options.force,
+                session,
+                options.fetch,
+            )
+
+    changed = [result.sheet for result in results if result.status == STATUS_CHANGED]
+    unchanged = [result.sheet for result in results if result.status == STATUS_UNCHANGED]
+    for line in format_fetch_metrics(results):
+        print(line)
+
+    if not all(result.ok for result in results):
+        print("❌ Some downloads failed!")
+        sys.exit(1)
+
+    print("✅ All downloads completed successfully!")
+    print(f"📊 Changed: {', '.join(changed) or 'none'}")
+    print(f"📊 Unchanged: {', '.join(unchanged) or 'none'}")
+    if options.exit_unchanged and not changed:
+        unbuilt = find_unbuilt_sheets(output_dir, options.sheets)
+        if unbuilt:
+            print(f"🔧 Not built since their last sync: {', '.join(unbuilt)}")
+            return
+        print("💤 No sheet changed since the last sync")
+        sys.exit(EXIT_UNCHANGED)
 
 
 if __name__ == '__main__':
@@ -6,9 +6,12 @@ This script converts the assets.yml file to a complete HTML file
 with embedded styling and JavaScript.
 
 Usage:
-    ./scripts/generate-assets-page.py [--help] [--doctests]
+    ./scripts/generate-assets-page.py [--bundle] [--help] [--doctests]
 
 Options:
+    --bundle   Link the CSS and JS as shared files named after their content
+               hash (website/static/bundles/) instead of embedding them;
+               commit them along with the pages
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -32,9 +35,13 @@ import sys
 import re
 from pathlib import Path
 from typing import Any
-from jinja2 import Environment, FileSystemLoader
 from pydantic import BaseModel, Field, field_validator, model_validator, ValidationError
 
+from model_cache import load_model
+from page_templates import get_template
+from slug_registry import slugify
+from static_resources import ICONS_DIR, TEMPLATE_DIR, bundle_url, load_icon, resources
+
 
 class Asset(BaseModel):
     """Represents a single asset from the YAML file."""
@@ -49,12 +56,7 @@ class Asset(BaseModel):
     def generate_slug_if_empty(self):
         """Auto-generate slug from name if not provided."""
         if not self.slug and self.name:
-            # Import re locally to avoid circular import
-            import re
-            # Convert to lowercase and replace spaces/special chars with hyphens
-            slug = re.sub(r'[^\w\s-]', '', self.name.lower())
-            slug = re.sub(r'[-\s]+', '-', slug)
-            self.slug = slug.strip('-')
+            self.slug = slugify(self.name)
         return self
 
     class Config:
@@ -117,29 +119,6 @@ def get_warnings() -> list[str]:
 
 
 
-def slugify(text: str) -> str:
-    """Convert text to a URL-friendly slug.
-
-    Args:
-        text: The text to convert to a slug
-
-    Returns:
-        A lowercase, hyphenated slug
-
-    Examples:
-        >>> slugify("Data & Storage")
-        'data-storage'
-        >>> slugify("Process & Governance")
-        'process-governance'
-        >>> slugify("Access & Identity")
-        'access-identity'
-    """
-    # Convert to lowercase and replace spaces and special chars with hyphens
-    slug = re.sub(r'[^\w\s-]', '-', text.lower())
-    slug = re.sub(r'[-\s]+', '-', slug)
-    return slug.strip('-')
-
-
 def categorize_asset(asset: Asset) -> str:
     """Get category slug from asset data."""
     # Use explicit category if available
@@ -181,32 +160,21 @@ def get_category_css_class(category_slug: str) -> str:
 
 def load_svg_content(asset_name: str) -> str:
     """Load SVG file content with fallback to broken.svg."""
-    script_dir = Path(__file__).parent
-
     # First try asset-specific SVG
     asset_slug = slugify(asset_name)
-    svg_path = script_dir.parent / "website" / "assets" / "icons" / f"asset-{asset_slug}.svg"
+    svg_path = ICONS_DIR / f"asset-{asset_slug}.svg"
 
-    if svg_path.exists():
-        try:
-            with open(svg_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except Exception as e:
-            add_warning(f"Failed to load SVG file {svg_path}: {e}")
-    else:
-        add_warning(f"SVG file not found for asset '{asset_name}': {svg_path}")
+    svg_content = resources.read(svg_path)
+    if svg_content is not None:
+        return svg_content
+    add_warning(f"SVG file not found for asset '{asset_name}': {svg_path}")
 
     # Fallback to broken.svg
-    broken_svg_path = script_dir.parent / "website" / "assets" / "icons" / "broken.svg"
-    if broken_svg_path.exists():
-        try:
-            with open(broken_svg_path, 'r', encoding='utf-8') as f:
-                add_warning(f"Asset icon not found for '{asset_name}', using broken icon fallback")
-                return f.read()
-        except Exception as e:
-            add_warning(f"Failed to load broken.svg: {e}")
-    else:
-        add_warning("broken.svg file not found")
+    svg_content = resources.read(ICONS_DIR / "broken.svg")
+    if svg_content is not None:
+        add_warning(f"Asset icon not found for '{asset_name}', using broken icon fallback")
+        return svg_content
+    add_warning("broken.svg file not found")
 
     # Ultimate fallback - hardcoded broken icon
     add_warning("Using hardcoded broken icon as ultimate fallback")
@@ -269,42 +237,25 @@ def extract_tags(asset: Asset) -> list[str]:
 
 def load_template_file(template_name: str) -> str:
     """Load template file content."""
-    script_dir = Path(__file__).parent
-    template_path = script_dir / "templates" / template_name
+    template_path = TEMPLATE_DIR / template_name
+    content = resources.read(template_path)
 
-    if not template_path.exists():
+    if content is None:
         raise FileNotFoundError(f"Template file not found: {template_path}")
 
-    with open(template_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    return content
 
 
 def get_assets_icon_svg() -> str:
     """Read and return the assets icon SVG with proper sizing."""
-    import os
-
-    # Get the directory of this script
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    # Go up one level to the project root, then to website/assets/icons
-    icon_path = os.path.join(script_dir, '..', 'website', 'assets', 'icons', 'assets.svg')
-
-    try:
-        with open(icon_path, 'r', encoding='utf-8') as f:
-            svg_content = f.read()
-
-        # Customize the SVG for the hero section (80px size)
-        svg_content = svg_content.replace('viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"')
-        return svg_content
-
-    except FileNotFoundError:
-        # Fallback SVG if file not found
-        return '''<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
+    # Customize the SVG for the hero section (80px size), with a fallback if not found
+    return load_icon('assets', hero=True, default='''<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
                     <circle cx="12" cy="5" r="2"/>
                     <circle cx="12" cy="19" r="2"/>
                     <circle cx="5" cy="12" r="2"/>
                     <circle cx="19" cy="12" r="2"/>
                     <path d="m12 7-5 5m5-5 5 5m-5 5-5-5m5 5 5-5"/>
-                </svg>'''
+                </svg>''')
 
 
 def prepare_asset_data(assets: list[Asset]) -> list[PreparedAsset]:
@@ -341,7 +292,7 @@ def prepare_asset_data(assets: list[Asset]) -> list[PreparedAsset]:
 
 
 
-def generate_markdown_content(assets: list[Asset], meta: Meta, assets_icon: str, categories: set[str] | None = None) -> str:
+def generate_markdown_content(assets: list[Asset], meta: Meta, assets_icon: str, categories: set[str] | None = None, bundle: bool = False) -> str:
     """Generate markdown content for Hugo using Jinja2 templates."""
     # Set up Jinja2 environment
     script_dir = Path(__file__).parent
@@ -350,13 +301,14 @@ def generate_markdown_content(assets: list[Asset], meta: Meta, assets_icon: str,
     if not template_dir.exists():
         raise FileNotFoundError(f"Templates directory not found: {template_dir}")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template('assets.j2')
+    template = get_template('assets.j2')
 
     # Prepare data for template
     prepared_assets = prepare_asset_data(assets)
     css_content = load_template_file('assets.css')
     js_content = load_template_file('assets.js')
+    css_url = bundle_url('assets.css') if bundle else None
+    js_url = bundle_url('assets.js') if bundle else None
 
     # Render template
     return template.render(
@@ -364,7 +316,9 @@ def generate_markdown_content(assets: list[Asset], meta: Meta, assets_icon: str,
         asset_count=len(assets),
         assets_icon=assets_icon,
         css_content=css_content,
-        js_content=js_content
+        js_content=js_content,
+        css_url=css_url,
+        js_url=js_url
     )
 
 
@@ -391,12 +345,11 @@ def validate_yaml_structure(data: Any) -> AssetsData | None:
         return None
 
 
-def convert_assets_to_markdown(yaml_file_path: Path, md_file_path: Path) -> bool:
+def convert_assets_to_markdown(yaml_file_path: Path, md_file_path: Path, bundle: bool = False) -> bool:
     """Convert assets YAML file to markdown format for Hugo."""
     try:
-        # Read YAML file
-        with open(yaml_file_path, 'r', encoding='utf-8') as f:
-            raw_data = yaml.safe_load(f)
+        # Read YAML file (from its model cache when up to date)
+        raw_data = load_model(yaml_file_path)
 
         # Validate structure with Pydantic
         validated_data = validate_yaml_structure(raw_data)
@@ -421,7 +374,7 @@ def convert_assets_to_markdown(yaml_file_path: Path, md_file_path: Path) -> bool
         assets_icon = get_assets_icon_svg()
 
         # Generate markdown content
-        markdown_content = generate_markdown_content(assets, meta, assets_icon, categories)
+        markdown_content = generate_markdown_content(assets, meta, assets_icon, categories, bundle)
 
         # Ensure output directory exists
         os.makedirs(md_file_path.parent, exist_ok=True)
@@ -469,9 +422,12 @@ This script converts the assets.yml file to a Hugo-compatible markdown file
 with proper frontmatter and structured content.
 
 Usage:
-    ./scripts/generate-assets-page.py [--help] [--doctests]
+    ./scripts/generate-assets-page.py [--bundle] [--help] [--doctests]
 
 Options:
+    --bundle   Link the CSS and JS as shared files named after their content
+               hash (website/static/bundles/) instead of embedding them;
+               commit them along with the pages
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -535,7 +491,7 @@ def main() -> None:
             print("   These files will be preserved, but the directory structure may change.")
 
     # Perform conversion
-    success: bool = convert_assets_to_markdown(yaml_file, md_file)
+    success: bool = convert_assets_to_markdown(yaml_file, md_file, '--bundle' in sys.argv)
 
     if success:
         print("✅ Successfully converted assets to Markdown!")
@@ -543,12 +499,11 @@ def main() -> None:
 
         # Display some stats
         try:
-            with open(yaml_file, 'r') as f:
-                stats_data = yaml.safe_load(f)
-                validated_stats = validate_yaml_structure(stats_data)
-                if validated_stats:
-                    asset_count = len(validated_stats.assets)
-                    print(f"📈 Converted {asset_count} assets to Markdown")
+            stats_data = load_model(yaml_file)
+            validated_stats = validate_yaml_structure(stats_data)
+            if validated_stats:
+                asset_count = len(validated_stats.assets)
+                print(f"📈 Converted {asset_count} assets to Markdown")
         except Exception:
             pass
 
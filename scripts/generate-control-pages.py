@@ -6,9 +6,13 @@ This script converts the controls.yml file to Hugo markdown content
 following a hierarchical structure with category pages and individual items.
 
 Usage:
-    ./scripts/generate-control-pages.py [--help] [--doctests]
+    ./scripts/generate-control-pages.py [--jobs N] [--bundle] [--help] [--doctests]
 
 Options:
+    --jobs     Number of processes rendering the item pages (default: 1)
+    --bundle   Link the CSS and JS of the pages as shared files named after their
+               content hash (website/static/bundles/) instead of embedding them;
+               commit them along with the pages
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -19,10 +23,21 @@ The script will:
 4. Generate individual control item pages (/controls/account/inactive-disable-delete/, etc.)
 5. Generate main controls index page (/controls/) as markdown
 
+Pages are only rendered when their inputs changed since the last run (see
+data/.pages/controls.manifest.json), and only written when their content
+differs, so unchanged pages keep their modification time. Pages no item
+produces any more are deleted.
+
 Examples:
     ./scripts/generate-control-pages.py
         Convert controls.yml to Hugo markdown structure
 
+    ./scripts/generate-control-pages.py --jobs 4
+        Render the item pages on 4 processes
+
+    ./scripts/generate-control-pages.py --bundle
+        Link one shared stylesheet and script per page type
+
     ./scripts/generate-control-pages.py --doctests
         Run all doctests to verify functionality
 """
@@ -30,12 +45,43 @@ Examples:
 import yaml
 import os
 import sys
-import re
+from functools import partial
 from pathlib import Path
-from typing import Any, Dict, List
-from jinja2 import Environment, FileSystemLoader
+from typing import Any, Dict, List, Optional, Union
 from pydantic import BaseModel, Field, field_validator, model_validator, ValidationError
 
+from model_cache import load_model
+from page_manifest import PAGE_MODULES, PageManifest, files_hash, get_manifest_path, inputs_hash, write_if_changed
+from page_pool import get_jobs, render_pages
+from page_templates import get_template
+from slug_registry import make_page_slugs_unique
+from static_resources import (
+    ICONS_DIR,
+    TEMPLATE_DIR,
+    bundle_url,
+    load_icon,
+    load_template_resource,
+    resources,
+)
+
+
+class OutlineEntry(BaseModel):
+    """One line of a multi-line field, with the lines nested under it."""
+
+    text: str
+    items: List[str] = Field(default_factory=list)
+
+
+class Parameter(BaseModel):
+    """A control parameter and what one compliance framework requires of it."""
+
+    name: str
+    framework: str = Field(default="", description="Framework requiring it (e.g., PCI)")
+    requirement: str = Field(default="", description="Requirement as written")
+    operator: str = Field(default="", description="Comparison of the quantity (<=, >=, ...)")
+    value: Optional[Union[int, float]] = Field(default=None, description="Quantity required, if any")
+    unit: str = Field(default="", description="Unit of the quantity (minutes, days, ...)")
+
 
 class ControlItem(BaseModel):
     """Represents a single control item from the YAML file."""
@@ -48,16 +94,28 @@ class ControlItem(BaseModel):
     name: str = Field(default="", description="Control name")
     slug: str = Field(default="", description="URL slug for the item")
     details: str = Field(default="", description="Detailed description of the control")
+    details_outline: List[OutlineEntry] = Field(
+        default_factory=list, description="Lines of a multi-line description"
+    )
     parameters: str = Field(default="", description="Control parameters")
+    parameters_parsed: List[Parameter] = Field(
+        default_factory=list, description="Parameters, per compliance framework"
+    )
     inventory: str = Field(
         default="", description="Asset inventory this control applies to"
     )
+    inventory_outline: List[OutlineEntry] = Field(
+        default_factory=list, description="Lines of a multi-line inventory"
+    )
     control_type: str = Field(
         default="", description="Type of control (Preventive, Detective, etc.)"
     )
     tested_on_asset_inventory: str = Field(
         default="", description="Assets this control is tested on"
     )
+    tested_on_assets: List[str] = Field(
+        default_factory=list, description="Names of the assets this control is tested on"
+    )
     compliance_frameworks: List[str] = Field(
         default_factory=list,
         description="List of compliance frameworks this control supports",
@@ -113,29 +171,6 @@ class Meta(BaseModel):
     generated_by: str
 
 
-def slugify(text: str) -> str:
-    """
-    Convert text to URL-safe slug.
-
-    >>> slugify("Security Policy")
-    'security-policy'
-    >>> slugify("PCI Sensitive (SAD, PAN)")
-    'pci-sensitive-sad-pan'
-    >>> slugify("Self-developed services")
-    'self-developed-services'
-    """
-    if not text:
-        return ""
-
-    # Convert to lowercase and replace spaces with hyphens
-    slug = text.lower()
-    # Replace non-alphanumeric characters with hyphens
-    slug = re.sub(r"[^a-z0-9]+", "-", slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip("-")
-    return slug
-
-
 def get_category_description(category: str) -> str:
     """Get description for each control category."""
     descriptions = {
@@ -190,11 +225,10 @@ def get_category_icon(category: str, icons_dir: Path) -> str:
     icon_filename = icon_files.get(
         category, "assets.svg"
     )  # Default fallback to existing icon
-    icon_path = icons_dir / icon_filename
+    icon_svg = resources.read(icons_dir / icon_filename)
 
-    if icon_path.exists():
-        with open(icon_path, "r", encoding="utf-8") as f:
-            return f.read()
+    if icon_svg is not None:
+        return icon_svg
     else:
         # Fallback SVG if file not found
         return """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
@@ -204,13 +238,12 @@ def get_category_icon(category: str, icons_dir: Path) -> str:
 
 
 def load_control_data(yaml_file: Path) -> tuple[list[ControlItem], Meta]:
-    """Load and validate control data from YAML file."""
+    """Load and validate control data from YAML file (or its model cache)."""
     if not yaml_file.exists():
         raise FileNotFoundError(f"Control YAML file not found: {yaml_file}")
 
     try:
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = load_model(yaml_file)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML format in {yaml_file}: {e}")
 
@@ -265,51 +298,21 @@ def group_by_category(
 
 
 def generate_control_category_content(
-    category: str, items: list[ControlItem], total_control_count: int
+    category: str, items: list[ControlItem], total_control_count: int, bundle: bool = False
 ) -> str:
     """Generate control category content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
-
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("control-category.j2")
-
-    # Load CSS content
-    css_file = template_dir / "control-category.css"
-    css_content = ""
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-
-    # Load JS content
-    js_file = template_dir / "control-category.js"
-    js_content = ""
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-
-    # Load icons
-    def load_icon(name: str) -> str:
-        icon_file = icons_dir / f"{name}.svg"
-        if icon_file.exists():
-            with open(icon_file, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Adjust the SVG for hero section (larger size)
-                content = content.replace(
-                    'viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"'
-                )
-                return content
-            return f"<svg><text>📄</text></svg>"  # Fallback
-
-    # Get category icon and controls icon
-    category_icon = get_category_icon(category, icons_dir)
-    controls_icon = load_icon("shield")
+    # Jinja2 environment shared by all pages
+    template = get_template("control-category.j2")
+
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("control-category.css")
+    js_content = load_template_resource("control-category.js")
+    css_url = bundle_url("control-category.css") if bundle else None
+    js_url = bundle_url("control-category.js") if bundle else None
+
+    # Get category icon and controls icon (sized for the hero section)
+    category_icon = get_category_icon(category, ICONS_DIR)
+    controls_icon = load_icon("shield", hero=True)
 
     # Get category display name and description
     category_display = items[0].category_display if items else category.title()
@@ -325,6 +328,8 @@ def generate_control_category_content(
         total_control_count=total_control_count,
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         category_icon=category_icon,
         controls_icon=controls_icon,
     )
@@ -332,44 +337,19 @@ def generate_control_category_content(
     return content
 
 
-def generate_control_item_content(item: ControlItem) -> str:
+def generate_control_item_content(item: ControlItem, bundle: bool = False) -> str:
     """Generate individual control item content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
-
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("control-item.j2")
-
-    # Load CSS content
-    css_file = template_dir / "control-item.css"
-    css_content = ""
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-
-    # Load JS content
-    js_file = template_dir / "control-item.js"
-    js_content = ""
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-
-    # Load icons
-    def load_icon(name: str) -> str:
-        icon_file = icons_dir / f"{name}.svg"
-        if icon_file.exists():
-            with open(icon_file, "r", encoding="utf-8") as f:
-                return f.read()
-        return f"<svg><text>📄</text></svg>"  # Fallback
+    # Jinja2 environment shared by all pages
+    template = get_template("control-item.j2")
+
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("control-item.css")
+    js_content = load_template_resource("control-item.js")
+    css_url = bundle_url("control-item.css") if bundle else None
+    js_url = bundle_url("control-item.js") if bundle else None
 
     # Get category icon
-    category_icon = get_category_icon(item.category, icons_dir)
+    category_icon = get_category_icon(item.category, ICONS_DIR)
     controls_icon = load_icon("shield")  # Main controls icon
     assets_icon = load_icon("assets")
 
@@ -378,6 +358,8 @@ def generate_control_item_content(item: ControlItem) -> str:
         item=item,
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         category_icon=category_icon,
         controls_icon=controls_icon,
         assets_icon=assets_icon,
@@ -386,58 +368,36 @@ def generate_control_item_content(item: ControlItem) -> str:
     return content
 
 
-def generate_control_content(control_items: list[ControlItem], meta: Meta) -> str:
+def generate_control_content(
+    control_items: list[ControlItem], meta: Meta, bundle: bool = False
+) -> str:
     """Generate control content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
-
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("control.j2")
+    # Jinja2 environment shared by all pages
+    template = get_template("control.j2")
 
-    # Load CSS content
-    css_file = template_dir / "control.css"
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-    else:
-        css_content = "/* CSS file not found */"
-
-    # Load JS content
-    js_file = template_dir / "control.js"
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-    else:
-        js_content = "/* JS file not found */"
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("control.css", "/* CSS file not found */")
+    js_content = load_template_resource("control.js", "/* JS file not found */")
+    css_url = bundle_url("control.css") if bundle else None
+    js_url = bundle_url("control.js") if bundle else None
 
     # Group items by category
     categories = group_by_category(control_items)
 
     # Load controls icon from icons directory
-    shield_icon_file = icons_dir / "shield.svg"
-    if shield_icon_file.exists():
-        with open(shield_icon_file, "r", encoding="utf-8") as f:
-            controls_icon = f.read()
-            # Adjust the SVG for hero section (larger size)
-            controls_icon = controls_icon.replace(
-                'viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"'
-            )
-    else:
-        # Fallback to hardcoded shield icon if file not found
-        controls_icon = """<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
+    # (sized for the hero section), falling back to a hardcoded shield icon
+    controls_icon = load_icon(
+        "shield",
+        hero=True,
+        default="""<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
 <path d="M12 22s8-4 8-10V5l-8-3-8 3v7c0 6 8 10 8 10z"/>
-</svg>"""
+</svg>""",
+    )
 
     # Create category icons
     category_icons = {}
     for category in categories.keys():
-        category_icons[category] = get_category_icon(category, icons_dir)
+        category_icons[category] = get_category_icon(category, ICONS_DIR)
 
     # Render template
     content = template.render(
@@ -447,6 +407,8 @@ def generate_control_content(control_items: list[ControlItem], meta: Meta) -> st
         category_count=len(categories),
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         controls_icon=controls_icon,
         category_icons=category_icons,
         meta=meta,
@@ -456,19 +418,19 @@ def generate_control_content(control_items: list[ControlItem], meta: Meta) -> st
 
 
 def create_main_index(
-    control_items: list[ControlItem], meta: Meta, output_dir: Path
-) -> None:
-    """Create the main controls index page using templates."""
-    content = generate_control_content(control_items, meta)
+    control_items: list[ControlItem], meta: Meta, output_dir: Path, bundle: bool = False
+) -> bool:
+    """Create the main controls index page using templates, returning whether it was written."""
+    content = generate_control_content(control_items, meta, bundle)
 
-    # Write main index file as Markdown
+    # Write main index file as Markdown, unless it is up to date
     index_file = output_dir / "_index.md"
-    index_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(index_file, "w", encoding="utf-8") as f:
-        f.write(content)
 
+    if not write_if_changed(index_file, content):
+        print(f"✅ Main controls index up to date: {index_file}")
+        return False
     print(f"✅ Created main controls index: {index_file}")
+    return True
 
 
 def create_category_index(
@@ -476,41 +438,48 @@ def create_category_index(
     items: list[ControlItem],
     output_dir: Path,
     total_control_count: int,
-) -> None:
+    bundle: bool = False,
+) -> bool:
     """Create category index page using templates (e.g., /controls/account/)."""
     if not items:
-        return
+        return False
 
     category_dir = output_dir / category
-    category_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate content using template
-    content = generate_control_category_content(category, items, total_control_count)
+    content = generate_control_category_content(category, items, total_control_count, bundle)
 
-    # Write category index file
+    # Write category index file, unless it is up to date
     index_file = category_dir / "_index.md"
 
-    with open(index_file, "w", encoding="utf-8") as f:
-        f.write(content)
-
+    if not write_if_changed(index_file, content):
+        print(f"✅ {category} category index up to date: {index_file}")
+        return False
     print(f"✅ Created {category} category index: {index_file}")
+    return True
 
 
-def create_item_page(item: ControlItem, output_dir: Path) -> None:
-    """Create individual control item page using templates."""
-    category_dir = output_dir / item.category
-    category_dir.mkdir(parents=True, exist_ok=True)
+def get_item_page_path(item: ControlItem, output_dir: Path) -> Path:
+    """Return the file of an item's page."""
+    return output_dir / item.category / f"{item.slug}.md"
 
-    # Generate content using template
-    content = generate_control_item_content(item)
 
-    # Write item file
-    item_file = category_dir / f"{item.slug}.md"
+def create_item_page(item: ControlItem, output_dir: Path, bundle: bool = False) -> tuple[bool, str]:
+    """
+    Create individual control item page using templates.
 
-    with open(item_file, "w", encoding="utf-8") as f:
-        f.write(content)
+    Returns:
+        Tuple of (whether the page was written, its progress line)
+    """
+    # Generate content using template
+    content = generate_control_item_content(item, bundle)
 
-    print(f"✅ Created {item.category}/{item.slug}: {item_file}")
+    # Write item file, unless it is up to date
+    item_file = get_item_page_path(item, output_dir)
+
+    if not write_if_changed(item_file, content):
+        return False, f"✅ {item.category}/{item.slug} up to date: {item_file}"
+    return True, f"✅ Created {item.category}/{item.slug}: {item_file}"
 
 
 def show_help() -> None:
@@ -553,6 +522,9 @@ def main() -> None:
             sys.exit(1)
         return
 
+    jobs = get_jobs(sys.argv)
+    bundle = "--bundle" in sys.argv
+
     # Get paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -566,32 +538,95 @@ def main() -> None:
         control_items, meta = load_control_data(yaml_file)
         print(f"📊 Loaded {len(control_items)} control items from {yaml_file}")
 
-        # Clean output directory
-        if output_dir.exists():
-            import shutil
-
-            shutil.rmtree(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Two items sharing a slug would write the same page
+        for warning in make_page_slugs_unique("controls", control_items):
+            print(f"⚠️  Warning: {warning}")
+
         # Group by category
         categories = group_by_category(control_items)
         print(
             f"📂 Found {len(categories)} categories: {', '.join(sorted(categories.keys()))}"
         )
 
+        # Pages are only rendered when their inputs changed since the last
+        # run: their data, or anything every page of the section embeds or
+        # is rendered by
+        manifest = PageManifest(output_dir, get_manifest_path(project_root / "data", "controls"))
+        section_hash = inputs_hash(
+            files_hash(
+                [
+                    Path(__file__),
+                    *PAGE_MODULES,
+                    *sorted(TEMPLATE_DIR.glob("control*")),
+                    *sorted(ICONS_DIR.glob("*.svg")),
+                ]
+            ),
+            bundle,
+        )
+        pages_written = 0
+        pages_unchanged = 0
+
+        # Bundles are written even when no page needs rendering
+        if bundle:
+            for resource in [*TEMPLATE_DIR.glob("control*.css"), *TEMPLATE_DIR.glob("control*.js")]:
+                bundle_url(resource.name)
+
         # Create main controls index
-        create_main_index(control_items, meta, output_dir)
+        index_hash = inputs_hash(section_hash, control_items, meta)
+        if not manifest.is_current(output_dir / "_index.md", index_hash) and create_main_index(
+            control_items, meta, output_dir, bundle
+        ):
+            pages_written += 1
+        else:
+            pages_unchanged += 1
+
+        # Item pages to render, in category order, on worker processes with --jobs
+        pending = [
+            item
+            for items in categories.values()
+            for item in items
+            if not manifest.is_current(get_item_page_path(item, output_dir), inputs_hash(section_hash, item))
+        ]
+        pending_ids = {id(item) for item in pending}
+        item_pages = render_pages(
+            partial(create_item_page, output_dir=output_dir, bundle=bundle),
+            pending,
+            jobs,
+            templates=["control-item.j2"],
+        )
 
         # Create category indexes and item pages
-        total_items_created = 0
         for category_name, items in categories.items():
             # Create category index
-            create_category_index(category_name, items, output_dir, len(control_items))
+            category_hash = inputs_hash(section_hash, category_name, items, len(control_items))
+            if not manifest.is_current(
+                output_dir / category_name / "_index.md", category_hash
+            ) and create_category_index(
+                category_name, items, output_dir, len(control_items), bundle
+            ):
+                pages_written += 1
+            else:
+                pages_unchanged += 1
 
             # Create individual item pages
             for item in items:
-                create_item_page(item, output_dir)
-                total_items_created += 1
+                if id(item) not in pending_ids:
+                    pages_unchanged += 1
+                    continue
+                written, line = next(item_pages)
+                print(line)
+                if written:
+                    pages_written += 1
+                else:
+                    pages_unchanged += 1
+
+        # Pages no item produces any more
+        removed = manifest.remove_orphans()
+        for path in removed:
+            print(f"🗑️  Removed {path}")
+        manifest.save()
 
         print(f"""
 ✅ Control conversion completed successfully!
@@ -599,9 +634,9 @@ def main() -> None:
 📊 Generated content:
    📁 Main index: /controls/
    📁 {len(categories)} category pages: {", ".join([f"/controls/{cat}/" for cat in sorted(categories.keys())])}
-   📄 {total_items_created} individual item pages
+   📄 {len(control_items)} individual item pages
 
-🎯 Total files created: {1 + len(categories) + total_items_created}
+🎯 Pages written: {pages_written}, unchanged: {pages_unchanged}, removed: {len(removed)}
 📂 Output directory: {output_dir}
 
 🚀 Ready for Hugo! Run 'make serve' to see the controls section.
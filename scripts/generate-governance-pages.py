@@ -6,9 +6,13 @@ This script converts the governance.yml file to Hugo markdown content
 following a hierarchical structure with category pages and individual items.
 
 Usage:
-    ./scripts/generate-governance-pages.py [--help] [--doctests]
+    ./scripts/generate-governance-pages.py [--jobs N] [--bundle] [--help] [--doctests]
 
 Options:
+    --jobs     Number of processes rendering the item pages (default: 1)
+    --bundle   Link the CSS and JS of the pages as shared files named after their
+               content hash (website/static/bundles/) instead of embedding them;
+               commit them along with the pages
     --help     Show this help message and exit
     --doctests Run doctests and exit
 
@@ -19,10 +23,21 @@ The script will:
 4. Generate individual governance item pages (/governance/policy/security/, etc.)
 5. Generate main governance index page (/governance/) as markdown
 
+Pages are only rendered when their inputs changed since the last run (see
+data/.pages/governance.manifest.json), and only written when their content
+differs, so unchanged pages keep their modification time. Pages no item
+produces any more are deleted.
+
 Examples:
     ./scripts/generate-governance-pages.py
         Convert governance.yml to Hugo markdown structure
 
+    ./scripts/generate-governance-pages.py --jobs 4
+        Render the item pages on 4 processes
+
+    ./scripts/generate-governance-pages.py --bundle
+        Link one shared stylesheet and script per page type
+
     ./scripts/generate-governance-pages.py --doctests
         Run all doctests to verify functionality
 """
@@ -30,12 +45,25 @@ Examples:
 import yaml
 import os
 import sys
-import re
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List
-from jinja2 import Environment, FileSystemLoader
 from pydantic import BaseModel, Field, field_validator, model_validator, ValidationError
 
+from model_cache import load_model
+from page_manifest import PAGE_MODULES, PageManifest, files_hash, get_manifest_path, inputs_hash, write_if_changed
+from page_pool import get_jobs, render_pages
+from page_templates import get_template
+from slug_registry import make_page_slugs_unique
+from static_resources import (
+    ICONS_DIR,
+    TEMPLATE_DIR,
+    bundle_url,
+    load_icon,
+    load_template_resource,
+    resources,
+)
+
 
 class GovernanceItem(BaseModel):
     """Represents a single governance item from the YAML file."""
@@ -92,29 +120,6 @@ class Meta(BaseModel):
     generated_by: str
 
 
-def slugify(text: str) -> str:
-    """
-    Convert text to URL-safe slug.
-
-    >>> slugify("Security Policy")
-    'security-policy'
-    >>> slugify("PCI Sensitive (SAD, PAN)")
-    'pci-sensitive-sad-pan'
-    >>> slugify("Self-developed services")
-    'self-developed-services'
-    """
-    if not text:
-        return ""
-
-    # Convert to lowercase and replace spaces with hyphens
-    slug = text.lower()
-    # Replace non-alphanumeric characters with hyphens
-    slug = re.sub(r"[^a-z0-9]+", "-", slug)
-    # Remove leading/trailing hyphens
-    slug = slug.strip("-")
-    return slug
-
-
 def get_category_description(category: str) -> str:
     """Get description for each governance category."""
     descriptions = {
@@ -139,11 +144,10 @@ def get_category_icon(category: str, icons_dir: Path) -> str:
     icon_filename = icon_files.get(
         category, "governance-policy.svg"
     )  # Default fallback
-    icon_path = icons_dir / icon_filename
+    icon_svg = resources.read(icons_dir / icon_filename)
 
-    if icon_path.exists():
-        with open(icon_path, "r", encoding="utf-8") as f:
-            return f.read()
+    if icon_svg is not None:
+        return icon_svg
     else:
         # Fallback SVG if file not found
         return """<svg viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
@@ -156,13 +160,12 @@ def get_category_icon(category: str, icons_dir: Path) -> str:
 
 
 def load_governance_data(yaml_file: Path) -> tuple[list[GovernanceItem], Meta]:
-    """Load and validate governance data from YAML file."""
+    """Load and validate governance data from YAML file (or its model cache)."""
     if not yaml_file.exists():
         raise FileNotFoundError(f"Governance YAML file not found: {yaml_file}")
 
     try:
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            data = yaml.safe_load(f)
+        data = load_model(yaml_file)
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML format in {yaml_file}: {e}")
 
@@ -217,51 +220,21 @@ def group_by_category(
 
 
 def generate_governance_category_content(
-    category: str, items: list[GovernanceItem], total_governance_count: int
+    category: str, items: list[GovernanceItem], total_governance_count: int, bundle: bool = False
 ) -> str:
     """Generate governance category content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
-
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("governance-category.j2")
-
-    # Load CSS content
-    css_file = template_dir / "governance-category.css"
-    css_content = ""
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-
-    # Load JS content
-    js_file = template_dir / "governance-category.js"
-    js_content = ""
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-
-    # Load icons
-    def load_icon(name: str) -> str:
-        icon_file = icons_dir / f"{name}.svg"
-        if icon_file.exists():
-            with open(icon_file, "r", encoding="utf-8") as f:
-                content = f.read()
-                # Adjust the SVG for hero section (larger size)
-                content = content.replace(
-                    'viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"'
-                )
-                return content
-        return f"<svg><text>📄</text></svg>"  # Fallback
-
-    # Get category icon and governance icon
-    category_icon = load_icon(f"governance-{category}")
-    governance_icon = load_icon("governance-oversight")  # Main governance icon
+    # Jinja2 environment shared by all pages
+    template = get_template("governance-category.j2")
+
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("governance-category.css")
+    js_content = load_template_resource("governance-category.js")
+    css_url = bundle_url("governance-category.css") if bundle else None
+    js_url = bundle_url("governance-category.js") if bundle else None
+
+    # Get category icon and governance icon (sized for the hero section)
+    category_icon = load_icon(f"governance-{category}", hero=True)
+    governance_icon = load_icon("governance-oversight", hero=True)  # Main governance icon
 
     # Get category display name and description
     category_display = items[0].category_display if items else category.title()
@@ -277,6 +250,8 @@ def generate_governance_category_content(
         total_governance_count=total_governance_count,
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         category_icon=category_icon,
         governance_icon=governance_icon,
     )
@@ -284,41 +259,16 @@ def generate_governance_category_content(
     return content
 
 
-def generate_governance_item_content(item: GovernanceItem) -> str:
+def generate_governance_item_content(item: GovernanceItem, bundle: bool = False) -> str:
     """Generate individual governance item content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
-
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("governance-item.j2")
-
-    # Load CSS content
-    css_file = template_dir / "governance-item.css"
-    css_content = ""
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-
-    # Load JS content
-    js_file = template_dir / "governance-item.js"
-    js_content = ""
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-
-    # Load icons
-    def load_icon(name: str) -> str:
-        icon_file = icons_dir / f"{name}.svg"
-        if icon_file.exists():
-            with open(icon_file, "r", encoding="utf-8") as f:
-                return f.read()
-        return f"<svg><text>📄</text></svg>"  # Fallback
+    # Jinja2 environment shared by all pages
+    template = get_template("governance-item.j2")
+
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("governance-item.css")
+    js_content = load_template_resource("governance-item.js")
+    css_url = bundle_url("governance-item.css") if bundle else None
+    js_url = bundle_url("governance-item.js") if bundle else None
 
     # Get category icon
     category_icon = load_icon(f"governance-{item.category}")
@@ -330,6 +280,8 @@ def generate_governance_item_content(item: GovernanceItem) -> str:
         item=item,
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         category_icon=category_icon,
         governance_icon=governance_icon,
         assets_icon=assets_icon,
@@ -339,61 +291,37 @@ def generate_governance_item_content(item: GovernanceItem) -> str:
 
 
 def generate_governance_content(
-    governance_items: list[GovernanceItem], meta: Meta
+    governance_items: list[GovernanceItem], meta: Meta, bundle: bool = False
 ) -> str:
     """Generate governance content using Jinja2 templates."""
-    # Set up Jinja2 environment
-    script_dir = Path(__file__).parent
-    template_dir = script_dir / "templates"
-    project_root = script_dir.parent
-    icons_dir = project_root / "website" / "assets" / "icons"
-
-    if not template_dir.exists():
-        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
+    # Jinja2 environment shared by all pages
+    template = get_template("governance.j2")
 
-    env = Environment(loader=FileSystemLoader(template_dir))
-    template = env.get_template("governance.j2")
-
-    # Load CSS content
-    css_file = template_dir / "governance.css"
-    if css_file.exists():
-        with open(css_file, "r", encoding="utf-8") as f:
-            css_content = f.read()
-    else:
-        css_content = "/* CSS file not found */"
-
-    # Load JS content
-    js_file = template_dir / "governance.js"
-    if js_file.exists():
-        with open(js_file, "r", encoding="utf-8") as f:
-            js_content = f.read()
-    else:
-        js_content = "/* JS file not found */"
+    # Load CSS and JS content, linked as bundles with --bundle
+    css_content = load_template_resource("governance.css", "/* CSS file not found */")
+    js_content = load_template_resource("governance.js", "/* JS file not found */")
+    css_url = bundle_url("governance.css") if bundle else None
+    js_url = bundle_url("governance.js") if bundle else None
 
     # Group items by category
     categories = group_by_category(governance_items)
 
     # Load governance icon from icons directory
-    star_icon_file = icons_dir / "star.svg"
-    if star_icon_file.exists():
-        with open(star_icon_file, "r", encoding="utf-8") as f:
-            governance_icon = f.read()
-            # Adjust the SVG for hero section (larger size)
-            governance_icon = governance_icon.replace(
-                'viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"'
-            )
-    else:
-        # Fallback to hardcoded star icon if file not found
-        governance_icon = """<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
+    # (sized for the hero section), falling back to a hardcoded star icon
+    governance_icon = load_icon(
+        "star",
+        hero=True,
+        default="""<svg viewBox="0 0 24 24" width="80" height="80" fill="none" stroke="currentColor" stroke-width="1.5" xmlns="http://www.w3.org/2000/svg">
 <path d="M12 2l3.09 6.26L22 9.27l-5 4.87 1.18 6.88L12 17.77l-6.18 3.25L7 14.14 2 9.27l6.91-1.01L12 2z"/>
-</svg>"""
+</svg>""",
+    )
 
     # Create category icons
     category_icons = {
-        "policy": get_category_icon("policy", icons_dir),
-        "oversight": get_category_icon("oversight", icons_dir),
-        "scopedefinition": get_category_icon("scopedefinition", icons_dir),
-        "protocol": get_category_icon("protocol", icons_dir),
+        "policy": get_category_icon("policy", ICONS_DIR),
+        "oversight": get_category_icon("oversight", ICONS_DIR),
+        "scopedefinition": get_category_icon("scopedefinition", ICONS_DIR),
+        "protocol": get_category_icon("protocol", ICONS_DIR),
     }
 
     # Render template
@@ -404,6 +332,8 @@ def generate_governance_content(
         category_count=len(categories),
         css_content=css_content,
         js_content=js_content,
+        css_url=css_url,
+        js_url=js_url,
         governance_icon=governance_icon,
         category_icons=category_icons,
         meta=meta,
@@ -413,19 +343,19 @@ def generate_governance_content(
 
 
 def create_main_index(
-    governance_items: list[GovernanceItem], meta: Meta, output_dir: Path
-) -> None:
-    """Create the main governance index page using templates."""
-    content = generate_governance_content(governance_items, meta)
+    governance_items: list[GovernanceItem], meta: Meta, output_dir: Path, bundle: bool = False
+) -> bool:
+    """Create the main governance index page using templates, returning whether it was written."""
+    content = generate_governance_content(governance_items, meta, bundle)
 
-    # Write main index file as Markdown
+    # Write main index file as Markdown, unless it is up to date
     index_file = output_dir / "_index.md"
-    index_file.parent.mkdir(parents=True, exist_ok=True)
-
-    with open(index_file, "w", encoding="utf-8") as f:
-        f.write(content)
 
+    if not write_if_changed(index_file, content):
+        print(f"✅ Main governance index up to date: {index_file}")
+        return False
     print(f"✅ Created main governance index: {index_file}")
+    return True
 
 
 def create_category_index(
@@ -433,43 +363,50 @@ def create_category_index(
     items: list[GovernanceItem],
     output_dir: Path,
     total_governance_count: int,
-) -> None:
+    bundle: bool = False,
+) -> bool:
     """Create category index page using templates (e.g., /governance/policy/)."""
     if not items:
-        return
+        return False
 
     category_dir = output_dir / category
-    category_dir.mkdir(parents=True, exist_ok=True)
 
     # Generate content using template
     content = generate_governance_category_content(
-        category, items, total_governance_count
+        category, items, total_governance_count, bundle
     )
 
-    # Write category index file
+    # Write category index file, unless it is up to date
     index_file = category_dir / "_index.md"
 
-    with open(index_file, "w", encoding="utf-8") as f:
-        f.write(content)
-
+    if not write_if_changed(index_file, content):
+        print(f"✅ {category} category index up to date: {index_file}")
+        return False
     print(f"✅ Created {category} category index: {index_file}")
+    return True
 
 
-def create_item_page(item: GovernanceItem, output_dir: Path) -> None:
-    """Create individual governance item page using templates."""
-    category_dir = output_dir / item.category
-    category_dir.mkdir(parents=True, exist_ok=True)
+def get_item_page_path(item: GovernanceItem, output_dir: Path) -> Path:
+    """Return the file of an item's page."""
+    return output_dir / item.category / f"{item.slug}.md"
 
-    # Generate content using template
-    content = generate_governance_item_content(item)
 
-    # Write item file
-    item_file = category_dir / f"{item.slug}.md"
+def create_item_page(item: GovernanceItem, output_dir: Path, bundle: bool = False) -> tuple[bool, str]:
+    """
+    Create individual governance item page using templates.
 
-    with open(item_file, "w", encoding="utf-8") as f:
-        f.write(content)
+    Returns:
+        Tuple of (whether the page was written, its progress line)
+    """
+    # Generate content using template
+    content = generate_governance_item_content(item, bundle)
+
+    # Write item file, unless it is up to date
+    item_file = get_item_page_path(item, output_dir)
 
-    print(f"✅ Created {item.category}/{item.slug}: {item_file}")
+    if not write_if_changed(item_file, content):
+        return False, f"✅ {item.category}/{item.slug} up to date: {item_file}"
+    return True, f"✅ Created {item.category}/{item.slug}: {item_file}"
 
 
 def show_help() -> None:
@@ -512,6 +449,9 @@ def main() -> None:
             sys.exit(1)
         return
 
+    jobs = get_jobs(sys.argv)
+    bundle = "--bundle" in sys.argv
+
     # Get paths
     script_dir = Path(__file__).parent
     project_root = script_dir.parent
@@ -525,34 +465,95 @@ def main() -> None:
         governance_items, meta = load_governance_data(yaml_file)
         print(f"📊 Loaded {len(governance_items)} governance items from {yaml_file}")
 
-        # Clean output directory
-        if output_dir.exists():
-            import shutil
-
-            shutil.rmtree(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Two items sharing a slug would write the same page
+        for warning in make_page_slugs_unique("governance", governance_items):
+            print(f"Warning: {warning}")
+
         # Group by category
         categories = group_by_category(governance_items)
         print(
             f"📂 Found {len(categories)} categories: {', '.join(sorted(categories.keys()))}"
         )
 
+        # Pages are only rendered when their inputs changed since the last
+        # run: their data, or anything every page of the section embeds or
+        # is rendered by
+        manifest = PageManifest(output_dir, get_manifest_path(project_root / "data", "governance"))
+        section_hash = inputs_hash(
+            files_hash(
+                [
+                    Path(__file__),
+                    *PAGE_MODULES,
+                    *sorted(TEMPLATE_DIR.glob("governance*")),
+                    *sorted(ICONS_DIR.glob("*.svg")),
+                ]
+            ),
+            bundle,
+        )
+        pages_written = 0
+        pages_unchanged = 0
+
+        # Bundles are written even when no page needs rendering
+        if bundle:
+            for resource in [*TEMPLATE_DIR.glob("governance*.css"), *TEMPLATE_DIR.glob("governance*.js")]:
+                bundle_url(resource.name)
+
         # Create main governance index
-        create_main_index(governance_items, meta, output_dir)
+        index_hash = inputs_hash(section_hash, governance_items, meta)
+        if not manifest.is_current(output_dir / "_index.md", index_hash) and create_main_index(
+            governance_items, meta, output_dir, bundle
+        ):
+            pages_written += 1
+        else:
+            pages_unchanged += 1
+
+        # Item pages to render, in category order, on worker processes with --jobs
+        pending = [
+            item
+            for items in categories.values()
+            for item in items
+            if not manifest.is_current(get_item_page_path(item, output_dir), inputs_hash(section_hash, item))
+        ]
+        pending_ids = {id(item) for item in pending}
+        item_pages = render_pages(
+            partial(create_item_page, output_dir=output_dir, bundle=bundle),
+            pending,
+            jobs,
+            templates=["governance-item.j2"],
+        )
 
-        # Create category pages and individual items
-        total_items_created = 0
+        # Create category indexes and item pages
         for category_name, items in categories.items():
             # Create category index
-            create_category_index(
-                category_name, items, output_dir, len(governance_items)
-            )
+            category_hash = inputs_hash(section_hash, category_name, items, len(governance_items))
+            if not manifest.is_current(
+                output_dir / category_name / "_index.md", category_hash
+            ) and create_category_index(
+                category_name, items, output_dir, len(governance_items), bundle
+            ):
+                pages_written += 1
+            else:
+                pages_unchanged += 1
 
             # Create individual item pages
             for item in items:
-                create_item_page(item, output_dir)
-                total_items_created += 1
+                if id(item) not in pending_ids:
+                    pages_unchanged += 1
+                    continue
+                written, line = next(item_pages)
+                print(line)
+                if written:
+                    pages_written += 1
+                else:
+                    pages_unchanged += 1
+
+        # Pages no item produces any more
+        removed = manifest.remove_orphans()
+        for path in removed:
+            print(f"🗑️  Removed {path}")
+        manifest.save()
 
         print(f"""
 ✅ Governance conversion completed successfully!
@@ -560,9 +561,9 @@ def main() -> None:
 📊 Generated content:
    📁 Main index: /governance/
    📁 {len(categories)} category pages: {", ".join([f"/governance/{cat}/" for cat in sorted(categories.keys())])}
-   📄 {total_items_created} individual item pages
+   📄 {len(governance_items)} individual item pages
 
-🎯 Total files created: {1 + len(categories) + total_items_created}
+🎯 Pages written: {pages_written}, unchanged: {pages_unchanged}, removed: {len(removed)}
 📂 Output directory: {output_dir}
 
 🚀 Ready for Hugo! Run 'make serve' to see the governance section.
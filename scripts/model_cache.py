@@ -0,0 +1,242 @@
+"""
+Binary cache of the sheet models written by csv2yaml.py.
+
+Next to each YAML data file, csv2yaml.py writes the same document in
+Python's marshal format, headed by the SHA-256 of the YAML file it mirrors:
+
+    data/.csv2yaml/controls.model
+
+The page generators load their data through load_model(), which reads the
+cache when its hash matches the YAML file and parses the YAML otherwise,
+so a YAML file edited by hand or rewritten by another tool is never
+shadowed by a stale cache.
+
+marshal's format may change between Python versions, so the header also
+records the marshal version and the Python version that wrote the cache,
+and a cache written by another interpreter is ignored the same way.
+
+Layout of a cache file:
+
+    magic (4 bytes) | format version (1 byte)
+    marshal version, Python major and minor version (1 byte each)
+    YAML SHA-256 (32 bytes)
+    records: 4-byte little-endian length, then a marshal blob
+
+Every record but the last is a batch of items; the last one is the pair
+(items key, meta block). Items are written in batches as they stream out
+of the conversion, so writing the cache does not hold the sheet in memory.
+"""
+
+import gc
+import marshal
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from atomic_files import create_temp_file, replace_file
+from row_index import INDEX_DIRNAME, file_sha256
+from yaml_io import load_yaml_file
+
+MAGIC = b"SPMC"
+FORMAT_VERSION = 2
+CACHE_SUFFIX = ".model"
+
+# Items marshalled together in one record. Equal strings within a record
+# are written once, so larger records load faster but take more memory to write.
+BATCH_SIZE = 8192
+
+# marshal version and Python version a cache must have been written with
+INTERPRETER = (marshal.version, *sys.version_info[:2])
+
+HEADER = struct.Struct("<4sBBBB32s")
+RECORD_LENGTH = struct.Struct("<I")
+
+
+def get_cache_path(yaml_path: Path) -> Path:
+    """
+    Return where the model cache of a YAML file is kept.
+
+    Examples:
+        >>> get_cache_path(Path("data/controls.yml")).as_posix()
+        'data/.csv2yaml/controls.model'
+    """
+    return yaml_path.parent / INDEX_DIRNAME / f"{yaml_path.stem}{CACHE_SUFFIX}"
+
+
+class ModelCacheWriter:
+    """
+    Write a model cache while the items of a sheet stream by.
+
+    The YAML hash is only known once the YAML file is complete, so the
+    cache is written to a temporary file and its header filled in by
+    commit(), which moves it into place.
+
+    Examples:
+        >>> import tempfile
+        >>> yaml_path = Path(tempfile.mkdtemp()) / "controls.yml"
+        >>> _ = yaml_path.write_text("controls: []\\n", encoding="utf-8")
+        >>> with ModelCacheWriter(yaml_path, "controls") as writer:
+        ...     items = list(writer.record([{"id": "C1"}, {"id": "C2"}]))
+        ...     writer.commit({"title": "Controls", "count": 2}, file_sha256(yaml_path))
+        >>> items
+        [{'id': 'C1'}, {'id': 'C2'}]
+        >>> read_cache(get_cache_path(yaml_path), file_sha256(yaml_path))
+        {'controls': [{'id': 'C1'}, {'id': 'C2'}], 'meta': {'title': 'Controls', 'count': 2}}
+        >>> read_cache(get_cache_path(yaml_path), "0" * 64) is None
+        True
+
+    A cache written by another version of Python is not read:
+
+        >>> cache_path = get_cache_path(yaml_path)
+        >>> content = bytearray(cache_path.read_bytes())
+        >>> content[HEADER.size - 33] += 1
+        >>> _ = cache_path.write_bytes(content)
+        >>> read_cache(cache_path, file_sha256(yaml_path)) is None
+        True
+    """
+
+    def __init__(self, yaml_path: Path, items_key: str) -> None:
+        self.path = get_cache_path(yaml_path)
+        self.items_key = items_key
+        self.batch: List[Dict[str, Any]] = []
+        self.strings: Dict[str, str] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.file = create_temp_file(self.path, "wb")
+        self.file.write(HEADER.pack(b"\0" * 4, 0, 0, 0, 0, b"\0" * 32))
+
+    def __enter__(self) -> "ModelCacheWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.file.close()
+        Path(self.file.name).unlink(missing_ok=True)
+
+    def _write_record(self, value: Any) -> None:
+        blob = marshal.dumps(value)
+        self.file.write(RECORD_LENGTH.pack(len(blob)))
+        self.file.write(blob)
+
+    def _share(self, value: Any) -> Any:
+        """Return value with its strings replaced by equal ones already in the batch."""
+        if isinstance(value, str):
+            return self.strings.setdefault(value, value)
+        if isinstance(value, list):
+            return [self._share(element) for element in value]
+        if isinstance(value, dict):
+            return {key: self._share(element) for key, element in value.items()}
+        return value
+
+    def _flush(self) -> None:
+        if self.batch:
+            self._write_record(self.batch)
+            self.batch = []
+            self.strings = {}
+
+    def record(self, items: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Pass the items through, recording each one in the cache.
+
+        marshal writes an object it has already written as a back-reference,
+        so sharing equal strings (categories, control types, frameworks)
+        shrinks the cache and saves allocations when it is read.
+        """
+        for item in items:
+            self.batch.append({key: self._share(value) for key, value in item.items()})
+            if len(self.batch) == BATCH_SIZE:
+                self._flush()
+            yield item
+
+    def commit(self, meta: Dict[str, Any], yaml_sha256: Optional[str]) -> None:
+        """Write the meta block and the YAML hash, and move the cache into place."""
+        self._flush()
+        self._write_record((self.items_key, meta))
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, FORMAT_VERSION, *INTERPRETER, bytes.fromhex(yaml_sha256 or "0" * 64)))
+        self.file.close()
+        replace_file(Path(self.file.name), self.path)
+
+
+def read_cache(cache_path: Path, yaml_sha256: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Read a model cache, or return None if it is missing, stale or corrupt.
+
+    The cache is only used if its header holds ``yaml_sha256`` and it was
+    written by this version of Python.
+    """
+    if yaml_sha256 is None:
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    # The records hold no reference cycles: pause the cyclic garbage collector,
+    # which would otherwise keep scanning the items as they are allocated
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        magic, version, *interpreter, digest = HEADER.unpack_from(content)
+        if (
+            magic != MAGIC
+            or version != FORMAT_VERSION
+            or tuple(interpreter) != INTERPRETER
+            or digest.hex() != yaml_sha256
+        ):
+            return None
+
+        view = memoryview(content)
+        position = HEADER.size
+        records: List[Any] = []
+        while position < len(content):
+            (length,) = RECORD_LENGTH.unpack_from(content, position)
+            position += RECORD_LENGTH.size
+            records.append(marshal.loads(view[position:position + length]))
+            position += length
+        if position != len(content):
+            return None
+        items_key, meta = records.pop()
+    except (struct.error, ValueError, EOFError, TypeError, IndexError):
+        return None
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    items: List[Dict[str, Any]] = []
+    for batch in records:
+        items.extend(batch)
+    return {items_key: items, "meta": meta}
+
+
+def load_model(yaml_path: Path) -> Any:
+    """
+    Load a sheet's YAML document, from its model cache when that is up to date.
+
+    Raises the errors of the YAML parser when falling back to the YAML file.
+
+    Examples:
+        >>> import tempfile
+        >>> yaml_path = Path(tempfile.mkdtemp()) / "assets.yml"
+        >>> _ = yaml_path.write_text("assets:\\n- name: Users\\n", encoding="utf-8")
+        >>> load_model(yaml_path)
+        {'assets': [{'name': 'Users'}]}
+    """
+    data = read_cache(get_cache_path(yaml_path), file_sha256(yaml_path))
+    if data is not None:
+        return data
+    return load_yaml_file(yaml_path)
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by csv2yaml.py and the page generators.")
+    print("Run it with --doctests to verify functionality.")
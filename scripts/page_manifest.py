@@ -0,0 +1,190 @@
+"""
+Manifest of the pages a generator wrote, with the hash of their inputs.
+
+The control and governance generators own their output directory. Instead
+of deleting it and writing every page again, they hash the inputs of each
+page (its data, plus the generator, the modules it renders through, and
+the templates, CSS/JS and icons of the section) and keep the hashes in a
+manifest:
+
+    data/.pages/controls.manifest.json
+    {"pages": {"_index.md": "...", "network/ids-ips.md": "..."}}
+
+A page whose inputs hash is in the manifest, and whose file still exists,
+is not rendered again. A rendered page is only written if its content
+differs from the file, and files of the output directory that no page of
+the run produced are deleted. Untouched pages keep their modification
+time, so Hugo only re-renders the pages that changed.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from row_index import write_json_atomic
+
+MANIFEST_DIRNAME = ".pages"
+MANIFEST_SUFFIX = ".manifest.json"
+
+# Shared modules the generators render pages through: their changes change
+# pages the same way an edited generator does
+PAGE_MODULES = [
+    Path(__file__).parent / name
+    for name in ("page_templates.py", "slug_registry.py", "static_resources.py")
+]
+
+
+def get_manifest_path(data_dir: Path, section: str) -> Path:
+    """
+    Return where the page manifest of a section is kept.
+
+    Examples:
+        >>> get_manifest_path(Path("data"), "controls").as_posix()
+        'data/.pages/controls.manifest.json'
+    """
+    return data_dir / MANIFEST_DIRNAME / f"{section}{MANIFEST_SUFFIX}"
+
+
+def _jsonable(value: Any) -> Any:
+    # Pydantic models hash as their fields
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def inputs_hash(*inputs: Any) -> str:
+    """
+    Hash the inputs of a page: data, pydantic models and hashes of files.
+
+    Examples:
+        >>> inputs_hash("abc", {"id": "C1"}) == inputs_hash("abc", {"id": "C1"})
+        True
+        >>> inputs_hash("abc", {"id": "C1"}) == inputs_hash("abc", {"id": "C2"})
+        False
+    """
+    payload = json.dumps(inputs, ensure_ascii=False, separators=(",", ":"), default=_jsonable)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def files_hash(paths: Iterable[Path]) -> str:
+    """
+    Hash the names and contents of files, such as the templates of a section.
+
+    A missing file hashes differently from any content.
+
+    Examples:
+        >>> files_hash([Path("missing.css")]) == files_hash([])
+        False
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.name.encode("utf-8") + b"\0")
+        try:
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            digest.update(b"missing")
+    return digest.hexdigest()
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write a page unless the file already holds exactly that content.
+
+    Returns:
+        Whether the file was written
+
+    Examples:
+        >>> import tempfile
+        >>> path = Path(tempfile.mkdtemp()) / "network" / "ids.md"
+        >>> write_if_changed(path, "# IDS\\n"), write_if_changed(path, "# IDS\\n")
+        (True, False)
+    """
+    data = content.encode("utf-8")
+    try:
+        if path.read_bytes() == data:
+            return False
+    except OSError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+
+class PageManifest:
+    """
+    The pages of one output directory and the hashes of their inputs.
+
+    Examples:
+        >>> import tempfile
+        >>> root = Path(tempfile.mkdtemp())
+        >>> output_dir, manifest_path = root / "controls", root / "controls.manifest.json"
+        >>> manifest = PageManifest(output_dir, manifest_path)
+        >>> manifest.is_current(output_dir / "_index.md", "h1")
+        False
+        >>> _ = write_if_changed(output_dir / "_index.md", "index")
+        >>> _ = write_if_changed(output_dir / "old" / "page.md", "old")
+        >>> [path.relative_to(output_dir).as_posix() for path in manifest.remove_orphans()]
+        ['old/page.md']
+        >>> manifest.save()
+        >>> PageManifest(output_dir, manifest_path).is_current(output_dir / "_index.md", "h1")
+        True
+        >>> (output_dir / "old").exists()
+        False
+    """
+
+    def __init__(self, output_dir: Path, manifest_path: Path) -> None:
+        self.output_dir = output_dir
+        self.path = manifest_path
+        self.previous: Dict[str, str] = {}
+        self.pages: Dict[str, str] = {}
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                pages = json.load(f)["pages"]
+            if isinstance(pages, dict):
+                self.previous = pages
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def is_current(self, path: Path, digest: str) -> bool:
+        """
+        Record the inputs hash of a page of this run, and tell whether its file is up to date.
+
+        A page whose inputs did not change since the previous run and whose
+        file exists does not need to be rendered again.
+        """
+        name = path.relative_to(self.output_dir).as_posix()
+        self.pages[name] = digest
+        return self.previous.get(name) == digest and path.exists()
+
+    def remove_orphans(self) -> List[Path]:
+        """Delete the files of the output directory no page of this run produced, and empty directories."""
+        removed: List[Path] = []
+        if not self.output_dir.exists():
+            return removed
+        for path in sorted(self.output_dir.rglob("*"), reverse=True):
+            if path.is_dir():
+                if not any(path.iterdir()):
+                    path.rmdir()
+            elif path.relative_to(self.output_dir).as_posix() not in self.pages:
+                path.unlink()
+                removed.append(path)
+        removed.reverse()
+        return removed
+
+    def save(self) -> None:
+        """Save the pages of this run for the next one."""
+        write_json_atomic(self.path, {"pages": self.pages})
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by the page generators.")
+    print("Run it with --doctests to verify functionality.")
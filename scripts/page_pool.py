@@ -0,0 +1,121 @@
+"""
+Item pages rendered on a process pool, for the page generators' --jobs option.
+
+The items are handed to each worker once, when it starts, and the worker
+compiles the templates it will use before taking any work. Work is then
+handed out as ranges of item positions. Each worker renders and writes
+its pages itself and sends back only the progress line of each page, so
+no page content crosses between processes.
+
+Results come back in item order whatever order the workers finish in, so
+the progress output and the pages written are the same as a run with one
+job.
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from page_templates import get_template
+
+# Ranges handed out per worker: more ranges even out slow pages, fewer
+# mean less scheduling
+RANGES_PER_WORKER = 4
+
+# State of a worker process, set once by its initializer
+_worker: Dict[str, Any] = {}
+
+
+def get_jobs(argv: List[str]) -> int:
+    """
+    Return the number of worker processes asked for with --jobs (default: 1).
+
+    Examples:
+        >>> get_jobs(["generate-control-pages.py"])
+        1
+        >>> get_jobs(["generate-control-pages.py", "--jobs", "4"])
+        4
+    """
+    if "--jobs" not in argv:
+        return 1
+
+    option_index = argv.index("--jobs")
+    value: Optional[str] = argv[option_index + 1] if option_index + 1 < len(argv) else None
+    if value is None or not value.isdigit() or int(value) < 1:
+        print(f"❌ Error: --jobs must be a positive integer, got '{value or ''}'")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return int(value)
+
+
+def split_ranges(count: int, jobs: int) -> List[range]:
+    """
+    Split item positions into consecutive ranges, several per worker.
+
+    Examples:
+        >>> split_ranges(10, 2)
+        [range(0, 2), range(2, 4), range(4, 6), range(6, 8), range(8, 10)]
+        >>> split_ranges(3, 8)
+        [range(0, 1), range(1, 2), range(2, 3)]
+    """
+    size = max(1, -(-count // (jobs * RANGES_PER_WORKER)))
+    return [range(start, min(start + size, count)) for start in range(0, count, size)]
+
+
+def _start_worker(render_page: Callable[[Any], str], items: Sequence[Any], templates: Sequence[str]) -> None:
+    _worker["render_page"] = render_page
+    _worker["items"] = items
+    for name in templates:
+        get_template(name)
+
+
+def _render_range(positions: range) -> List[str]:
+    render_page = _worker["render_page"]
+    items = _worker["items"]
+    return [render_page(items[position]) for position in positions]
+
+
+def render_pages(
+    render_page: Callable[[Any], str],
+    items: Sequence[Any],
+    jobs: int = 1,
+    templates: Sequence[str] = (),
+) -> Iterator[str]:
+    """
+    Call ``render_page`` on every item, yielding what it returns in item order.
+
+    ``render_page`` writes the page of an item and returns its progress line.
+    With more than one job it runs on a pool of that many processes, each
+    with ``templates`` compiled beforehand; it must then be a module-level
+    function (or a functools.partial of one) so that it can be pickled.
+
+    Examples:
+        >>> list(render_pages(str.upper, ["a", "b"]))
+        ['A', 'B']
+        >>> list(render_pages(str.upper, ["a", "b", "c"], jobs=2))
+        ['A', 'B', 'C']
+    """
+    if jobs == 1 or len(items) < 2:
+        for item in items:
+            yield render_page(item)
+        return
+
+    jobs = min(jobs, len(items))
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_start_worker, initargs=(render_page, items, tuple(templates))
+    ) as pool:
+        for lines in pool.map(_render_range, split_ranges(len(items), jobs)):
+            yield from lines
+
+
+if __name__ == "__main__":
+    import doctest
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by the page generators.")
+    print("Run it with --doctests to verify functionality.")
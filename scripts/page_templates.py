@@ -0,0 +1,96 @@
+"""
+Jinja2 environment shared by the page generators.
+
+Every generator renders its pages from the templates in scripts/templates/
+through the one environment returned by get_environment(), so each template
+is compiled at most once per run however many pages use it.
+
+Compiled templates are also kept on disk, next to the templates:
+
+    scripts/templates/__pycache__/
+
+Jinja checks each cached template against the hash of its source, so an
+edited template is compiled again, and a run with unchanged templates does
+not compile any.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from jinja2 import BytecodeCache, Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+BYTECODE_DIRNAME = "__pycache__"
+
+
+def get_bytecode_dir(template_dir: Path) -> Path:
+    """
+    Return where the compiled templates of a template directory are kept.
+
+    Examples:
+        >>> get_bytecode_dir(Path("scripts/templates")).as_posix()
+        'scripts/templates/__pycache__'
+    """
+    return template_dir / BYTECODE_DIRNAME
+
+
+def open_bytecode_cache(template_dir: Path) -> Optional[BytecodeCache]:
+    """Return the on-disk cache of compiled templates, or None if it cannot be created."""
+    bytecode_dir = get_bytecode_dir(template_dir)
+    try:
+        bytecode_dir.mkdir(exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(str(bytecode_dir), "%s.jinja")
+
+
+@lru_cache(maxsize=None)
+def get_environment(template_dir: Path = TEMPLATE_DIR) -> Environment:
+    """
+    Return the Jinja2 environment of a template directory, created on first use.
+
+    Templates do not change during a run, so they are not checked for
+    changes each time they are looked up.
+
+    Examples:
+        >>> get_environment() is get_environment()
+        True
+        >>> get_environment(Path("missing-templates"))
+        Traceback (most recent call last):
+        ...
+        FileNotFoundError: Templates directory not found: missing-templates
+    """
+    if not template_dir.exists():
+        raise FileNotFoundError(f"Templates directory not found: {template_dir}")
+
+    return Environment(
+        loader=FileSystemLoader(template_dir),
+        bytecode_cache=open_bytecode_cache(template_dir),
+        auto_reload=False,
+    )
+
+
+def get_template(name: str) -> Template:
+    """
+    Return a template of scripts/templates/, compiled once per run.
+
+    Examples:
+        >>> get_template("control-item.j2") is get_template("control-item.j2")
+        True
+    """
+    return get_environment().get_template(name)
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by the page generators.")
+    print("Run it with --doctests to verify functionality.")
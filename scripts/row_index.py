@@ -0,0 +1,227 @@
+"""
+Row-level hash index and changesets of the YAML files written by csv2yaml.py.
+
+Every item of a sheet is keyed by its stable identifier (the ID column, or
+the asset name for assets) and hashed in its normalized form. csv2yaml.py
+keeps the index of its last conversion of each sheet, with the byte range
+of every item in the YAML file:
+
+    data/.csv2yaml/controls.index.json
+
+Comparing the new items with that index tells which IDs were added, removed
+or modified. The YAML of unchanged items is copied from the previous file
+instead of being dumped again, and the result is recorded as a changeset
+next to the YAML file, for later stages to limit their work to:
+
+    data/controls.changes.json
+    {"sheet": "controls", "added": [...], "removed": [...], "modified": [...],
+     "unchanged": 120, "reordered": false, "rewritten": true}
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from atomic_files import create_temp_file, replace_file
+
+INDEX_DIRNAME = ".csv2yaml"
+INDEX_SUFFIX = ".index.json"
+CHANGESET_SUFFIX = ".changes.json"
+
+# Size of the chunks read when hashing a file
+CHUNK_SIZE = 64 * 1024
+
+
+def item_hash(item: Dict[str, Any]) -> str:
+    """
+    Hash the normalized form of an item (its keys, in order, and values).
+
+    Examples:
+        >>> item_hash({"id": "C1", "name": "RBAC"})
+        '35f901c56b5aec25'
+        >>> item_hash({"id": "C1", "name": "RBAC"}) == item_hash({"id": "C1", "name": "MFA"})
+        False
+    """
+    payload = json.dumps(item, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def file_sha256(path: Path) -> Optional[str]:
+    """Return the SHA-256 of a file, or None if it does not exist."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return None
+    return digest.hexdigest()
+
+
+class ItemKeys:
+    """
+    Give each item a unique key: its identifier, numbered when repeated.
+
+    Examples:
+        >>> keys = ItemKeys()
+        >>> [keys.next("C1"), keys.next("C2"), keys.next("C1")]
+        ['C1', 'C2', 'C1#2']
+    """
+
+    def __init__(self) -> None:
+        self.seen: Dict[str, int] = {}
+
+    def next(self, identifier: str) -> str:
+        occurrence = self.seen.get(identifier, 0) + 1
+        self.seen[identifier] = occurrence
+        return identifier if occurrence == 1 else f"{identifier}#{occurrence}"
+
+
+@dataclass
+class ItemIndex:
+    """
+    Keys, hashes and YAML byte ranges of the items of one conversion.
+
+    Examples:
+        >>> index = ItemIndex("abc")
+        >>> index.add("C1", "h1", 10, 20)
+        >>> index.add("C2", "h2", 30, 15)
+        >>> index.entries["C2"]
+        ('h2', 30, 15)
+        >>> index.sequence()
+        [('C1', 'h1'), ('C2', 'h2')]
+    """
+    yaml_sha256: Optional[str] = None
+    entries: Dict[str, Tuple[str, int, int]] = field(default_factory=dict)
+
+    def add(self, key: str, digest: str, offset: int, length: int) -> None:
+        self.entries[key] = (digest, offset, length)
+
+    def sequence(self) -> List[Tuple[str, str]]:
+        """Return the (key, hash) of every item, in file order."""
+        return [(key, entry[0]) for key, entry in self.entries.items()]
+
+
+def get_index_path(yaml_path: Path) -> Path:
+    """
+    Return where the item index of a YAML file is kept.
+
+    Examples:
+        >>> get_index_path(Path("data/controls.yml")).as_posix()
+        'data/.csv2yaml/controls.index.json'
+    """
+    return yaml_path.parent / INDEX_DIRNAME / f"{yaml_path.stem}{INDEX_SUFFIX}"
+
+
+def get_changeset_path(yaml_path: Path) -> Path:
+    """
+    Return where the changeset of a YAML file is written.
+
+    Examples:
+        >>> get_changeset_path(Path("data/controls.yml")).as_posix()
+        'data/controls.changes.json'
+    """
+    return yaml_path.parent / f"{yaml_path.stem}{CHANGESET_SUFFIX}"
+
+
+def load_index(yaml_path: Path) -> Optional[ItemIndex]:
+    """Load the item index of the previous conversion, if any."""
+    try:
+        with open(get_index_path(yaml_path), "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        index = ItemIndex(raw["yaml_sha256"])
+        for key, digest, offset, length in raw["items"]:
+            index.add(key, digest, offset, length)
+        return index
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON to a temporary file and move it into place."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = create_temp_file(path, "w", encoding="utf-8")
+    temp_path = Path(temp_file.name)
+    try:
+        with temp_file:
+            json.dump(data, temp_file, ensure_ascii=False, indent=1)
+            temp_file.write("\n")
+        replace_file(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def save_index(yaml_path: Path, index: ItemIndex) -> None:
+    """Save the item index of a conversion."""
+    write_json_atomic(
+        get_index_path(yaml_path),
+        {
+            "yaml_sha256": index.yaml_sha256,
+            "items": [[key, *entry] for key, entry in index.entries.items()],
+        },
+    )
+
+
+def build_changeset(
+    sheet_name: str, previous: Optional[ItemIndex], current: ItemIndex, rewritten: bool
+) -> Dict[str, Any]:
+    """
+    Compare two conversions of a sheet item by item.
+
+    Without a previous index every item counts as added.
+
+    Examples:
+        >>> old = ItemIndex()
+        >>> for key, digest in [("C1", "a"), ("C2", "b"), ("C3", "c")]:
+        ...     old.add(key, digest, 0, 0)
+        >>> new = ItemIndex()
+        >>> for key, digest in [("C1", "a"), ("C3", "x"), ("C4", "d")]:
+        ...     new.add(key, digest, 0, 0)
+        >>> changes = build_changeset("controls", old, new, rewritten=True)
+        >>> changes["added"], changes["removed"], changes["modified"], changes["unchanged"]
+        (['C4'], ['C2'], ['C3'], 1)
+        >>> build_changeset("controls", None, new, rewritten=True)["added"]
+        ['C1', 'C3', 'C4']
+    """
+    previous_entries = previous.entries if previous else {}
+    added: List[str] = []
+    modified: List[str] = []
+    unchanged = 0
+    for key, (digest, _, _) in current.entries.items():
+        if key not in previous_entries:
+            added.append(key)
+        elif previous_entries[key][0] != digest:
+            modified.append(key)
+        else:
+            unchanged += 1
+    removed = [key for key in previous_entries if key not in current.entries]
+
+    # Same items in a different order still change the YAML file
+    kept = [key for key in current.entries if key in previous_entries]
+    reordered = kept != [key for key in previous_entries if key in current.entries]
+
+    return {
+        "sheet": sheet_name,
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+        "unchanged": unchanged,
+        "reordered": reordered,
+        "rewritten": rewritten,
+    }
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by csv2yaml.py.")
+    print("Run it with --doctests to verify functionality.")
@@ -0,0 +1,81 @@
+"""
+The framework sheets: where framework-sync.py downloads them from and the CSV file of each.
+
+Shared by framework-sync.py and framework-snapshots.py, so both name the
+same files.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Local sync state (validators, content hashes, snapshots), kept next to the CSV files
+SYNC_STATE_DIRNAME = '.framework-sync'
+
+
+@dataclass
+class SheetConfig:
+    """
+    Configuration for a framework sheet.
+
+    Examples:
+        >>> config = SheetConfig("Assets", "123", "assets.csv", ["ID", "Name"])
+        >>> config.name
+        'Assets'
+        >>> config.gid
+        '123'
+        >>> config.filename
+        'assets.csv'
+        >>> config.expected_headers
+        ['ID', 'Name']
+    """
+    name: str
+    gid: str
+    filename: str
+    expected_headers: List[str]
+
+
+# Configuration for all framework sheets
+#
+# To find the correct GID for each sheet:
+# 1. Open the Google Spreadsheet in your browser
+# 2. Click on the tab/sheet you want (e.g., "Controls", "Governance")
+# 3. Look at the URL in your browser - it will contain "#gid=XXXXXXX"
+# 4. The number after "gid=" is the GID for that sheet
+# 5. Update the gid values below with the correct numbers
+#
+# Example: https://docs.google.com/spreadsheets/d/.../edit#gid=123456789
+#          The GID would be "123456789"
+SHEETS_CONFIG: Dict[str, SheetConfig] = {
+    'assets': SheetConfig(
+        name='Assets',
+        gid='1448922229',  # Known GID for Assets sheet
+        filename='Control Framework - Assets.csv',
+        expected_headers=['Asset', 'Description', 'Notes', 'Category', 'Tags']
+    ),
+    'controls': SheetConfig(
+        name='Controls',
+        gid='2012626515',
+        filename='Control Framework - Controls.csv',
+        expected_headers=['ID', 'Title', 'Description', 'Parameters', 'Inventory', 'Control type', 'Tested on asset inventory']
+    ),
+    'governance': SheetConfig(
+        name='Governance',
+        gid='627966053',
+        filename='Control Framework - Governance.csv',
+        expected_headers=['ID', 'Title', 'Description']
+    )
+}
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py and framework-snapshots.py.")
+    print("Run it with --doctests to verify functionality.")
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Local Google Sheets Export Server for Secure Product Framework
+
+This script serves the Google Sheets /export?format=csv&gid= endpoint from a
+recording made with framework-sync.py --record. It lets framework-sync.py be
+exercised, tested and benchmarked on machines without access to docs.google.com.
+
+Usage:
+    ./scripts/sheets-export-server.py RECORDING [--host HOST] [--port PORT]
+                                      [--latency SECONDS] [--throughput BYTES]
+                                      [--help] [--doctests]
+
+Arguments:
+    RECORDING  Directory written by framework-sync.py --record
+
+Options:
+    --host       Interface to listen on (default: 127.0.0.1)
+    --port       Port to listen on (default: 8765)
+    --latency    Delay in seconds before each response (default: 0)
+    --throughput Maximum body transfer rate in bytes per second (default: unlimited)
+    --help       Show this help message and exit
+    --doctests   Run doctests and exit
+
+Examples:
+    # Record the export responses once, on a machine with network access
+    ./scripts/framework-sync.py --record recordings/sheets
+
+    # Serve them locally with 200 ms latency and 1 MB/s per response
+    ./scripts/sheets-export-server.py recordings/sheets --latency 0.2 --throughput 1000000
+
+    # Point framework-sync.py at the local server
+    ./scripts/framework-sync.py --url "http://127.0.0.1:8765/spreadsheets/d/<ID>/edit"
+
+    # Run doctests to verify functionality
+    ./scripts/sheets-export-server.py --doctests
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from sheets_replay import RECORDING_INDEX, Recording, ReplayServer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Options that take a value (used to tell option values apart from the recording)
+VALUE_OPTIONS = ["--host", "--port", "--latency", "--throughput"]
+
+
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Examples:
+        >>> get_option_value(["sheets-export-server.py", "rec", "--port", "9000"], "--port")
+        '9000'
+        >>> get_option_value(["sheets-export-server.py", "rec"], "--port") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def list_spreadsheet_ids(recording: Recording) -> List[str]:
+    """
+    List the spreadsheet IDs that have recorded export responses.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     recording = Recording(Path(tmp))
+        ...     _ = recording.add("GET", "https://docs.google.com/spreadsheets/d/ABC/export?format=csv&gid=1",
+        ...                       200, "OK", [], b"x")
+        ...     list_spreadsheet_ids(recording)
+        ['ABC']
+    """
+    spreadsheet_ids = set()
+    for key in recording.responses:
+        path = key.split(" ", 1)[1]
+        if path.startswith("/spreadsheets/d/"):
+            spreadsheet_ids.add(path.split("/")[3])
+    return sorted(spreadsheet_ids)
+
+
+def show_help() -> None:
+    """
+    Display help information.
+
+    Examples:
+        >>> import io
+        >>> import sys
+        >>> old_stdout = sys.stdout
+        >>> sys.stdout = captured_output = io.StringIO()
+        >>> show_help()
+        >>> sys.stdout = old_stdout
+        >>> output = captured_output.getvalue()
+        >>> "Local Google Sheets Export Server" in output
+        True
+        >>> "Usage:" in output
+        True
+    """
+    print(__doc__)
+
+
+def parse_arguments() -> Tuple[Path, str, int, float, int]:
+    """
+    Parse command line arguments.
+
+    Returns:
+        Tuple of (recording_dir, host, port, latency, throughput)
+
+    Note:
+        This function reads sys.argv and therefore cannot be easily tested
+        with doctests in the normal way.
+    """
+    if "--help" in sys.argv or "-h" in sys.argv:
+        show_help()
+        sys.exit(0)
+
+    positional: List[str] = []
+    skip_next = False
+    for arg in sys.argv[1:]:
+        if skip_next:
+            skip_next = False
+        elif arg in VALUE_OPTIONS:
+            skip_next = True
+        elif not arg.startswith("--"):
+            positional.append(arg)
+
+    if len(positional) != 1:
+        print("❌ Error: exactly one RECORDING directory is required")
+        print("Use --help for usage information")
+        sys.exit(1)
+
+    try:
+        host = get_option_value(sys.argv, "--host") or DEFAULT_HOST
+        port = int(get_option_value(sys.argv, "--port") or DEFAULT_PORT)
+        latency = float(get_option_value(sys.argv, "--latency") or 0)
+        throughput = int(get_option_value(sys.argv, "--throughput") or 0)
+    except ValueError as e:
+        print(f"❌ Error: invalid option value: {e}")
+        print("Use --help for usage information")
+        sys.exit(1)
+
+    return Path(positional[0]), host, port, latency, throughput
+
+
+def main() -> None:
+    """Main function to start the server."""
+    recording_dir, host, port, latency, throughput = parse_arguments()
+
+    if not (recording_dir / RECORDING_INDEX).exists():
+        print(f"❌ Error: No recording found at {recording_dir}")
+        print("💡 Tip: Record one with ./scripts/framework-sync.py --record DIR")
+        sys.exit(1)
+
+    recording = Recording(recording_dir)
+    server = ReplayServer((host, port), recording, latency, throughput)
+
+    print("🛰️  Serving recorded Google Sheets exports...")
+    print(f"📂 Recording: {recording_dir} ({len(recording.responses)} responses)")
+    print(f"⏱️  Latency: {latency}s")
+    print(f"📶 Throughput: {f'{throughput} bytes/s' if throughput else 'unlimited'}")
+    for spreadsheet_id in list_spreadsheet_ids(recording):
+        print(f"🔗 {server.origin}/spreadsheets/d/{spreadsheet_id}/edit")
+    print("Press Ctrl+C to stop the server")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    import doctest
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    main()
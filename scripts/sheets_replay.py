@@ -0,0 +1,541 @@
+"""
+Record and replay Google Sheets export responses.
+
+This module lets framework-sync.py run without reaching docs.google.com:
+
+- RecordingAdapter wraps the real HTTP transport and stores every response
+  (status code, headers, body and each redirect hop) in a recording directory.
+- ReplayAdapter serves a requests.Session entirely from such a recording.
+- ReplayServer is a small local HTTP server that serves the
+  /spreadsheets/d/<id>/export?format=csv&gid=<gid> endpoint from a recording,
+  with configurable latency and throughput (see sheets-export-server.py).
+
+Recording layout:
+    <recording>/index.json          Responses keyed by "<METHOD> <path>?<query>"
+    <recording>/bodies/<sha256>     Response bodies, stored once per content
+
+Responses are keyed by path and query only, so a recording made against
+docs.google.com can be replayed by a local server on any host and port.
+
+A 304 Not Modified is never recorded: it only answers the validators of the
+request that got it. Replay answers 304 itself, to requests whose
+If-None-Match or If-Modified-Since match the recorded 200.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+RECORDING_INDEX = "index.json"
+RECORDING_BODIES = "bodies"
+
+# Headers describing the wire encoding of the original response. Bodies are
+# stored decoded, so these are dropped on record and recomputed on replay.
+TRANSPORT_HEADERS = {
+    "connection",
+    "content-encoding",
+    "content-length",
+    "keep-alive",
+    "transfer-encoding",
+}
+
+# Headers of a recorded 200 repeated in the 304 that replay answers with
+NOT_MODIFIED_HEADERS = {"cache-control", "content-location", "date", "etag", "expires", "last-modified", "vary"}
+
+
+def recording_key(method: str, url: str) -> str:
+    """
+    Build the key a response is recorded under.
+
+    Examples:
+        >>> recording_key("get", "https://docs.google.com/spreadsheets/d/ABC/export?format=csv&gid=1")
+        'GET /spreadsheets/d/ABC/export?format=csv&gid=1'
+        >>> recording_key("HEAD", "http://127.0.0.1:8765/spreadsheets/d/ABC/export?format=csv&gid=1")
+        'HEAD /spreadsheets/d/ABC/export?format=csv&gid=1'
+        >>> recording_key("GET", "https://example.com")
+        'GET /'
+    """
+    parts = urlsplit(url)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return f"{method.upper()} {path}"
+
+
+def rewrite_location(location: str, origin: str) -> str:
+    """
+    Point an absolute redirect target at another origin, keeping path and query.
+
+    Examples:
+        >>> rewrite_location("https://doc-0s.googleusercontent.com/export/abc?gid=1", "http://127.0.0.1:8765")
+        'http://127.0.0.1:8765/export/abc?gid=1'
+        >>> rewrite_location("/relative/path", "http://127.0.0.1:8765")
+        '/relative/path'
+    """
+    parts = urlsplit(location)
+    if not parts.scheme:
+        return location
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+    return f"{origin}{path}"
+
+
+@dataclass
+class RecordedResponse:
+    """
+    A single recorded HTTP response (one redirect hop or a final response).
+
+    Examples:
+        >>> response = RecordedResponse("GET", "https://example.com/x", 307, "Temporary Redirect",
+        ...                             [("Location", "https://example.com/y")])
+        >>> response.header("location")
+        'https://example.com/y'
+        >>> response.body is None
+        True
+    """
+
+    method: str
+    url: str
+    status: int
+    reason: str
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    body: Optional[str] = None
+
+    def header(self, name: str) -> Optional[str]:
+        """Return the first header with the given name, case-insensitively."""
+        for key, value in self.headers:
+            if key.lower() == name.lower():
+                return value
+        return None
+
+    def not_modified_by(self, request_headers: Mapping[str, str]) -> bool:
+        """
+        Tell whether the validators of a request match this response, for a 304.
+
+        Only a 200 can be confirmed. If-None-Match takes precedence over
+        If-Modified-Since, as in RFC 9110.
+
+        Examples:
+            >>> response = RecordedResponse("GET", "https://example.com/x", 200, "OK",
+            ...                             [("ETag", '"v1"'), ("Last-Modified", "Wed, 01 May 2024 10:00:00 GMT")])
+            >>> response.not_modified_by({"If-None-Match": 'W/"v0", "v1"'})
+            True
+            >>> response.not_modified_by({"If-None-Match": '"v0"', "If-Modified-Since": "Thu, 02 May 2024 10:00:00 GMT"})
+            False
+            >>> response.not_modified_by({"If-Modified-Since": "Thu, 02 May 2024 10:00:00 GMT"})
+            True
+            >>> response.not_modified_by({"If-Modified-Since": "Tue, 30 Apr 2024 10:00:00 GMT"})
+            False
+            >>> response.not_modified_by({})
+            False
+        """
+        if self.status != 200:
+            return False
+        headers = {key.lower(): value for key, value in request_headers.items()}
+
+        if_none_match = headers.get("if-none-match")
+        if if_none_match is not None:
+            etag = self.header("etag")
+            if etag is None:
+                return False
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or etag.removeprefix("W/") in tags
+
+        if_modified_since = headers.get("if-modified-since")
+        last_modified = self.header("last-modified")
+        if if_modified_since is None or last_modified is None:
+            return False
+        try:
+            return parsedate_to_datetime(last_modified) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+
+    def not_modified_headers(self) -> List[Tuple[str, str]]:
+        """Return the headers of the 304 confirming this response."""
+        return [(key, value) for key, value in self.headers if key.lower() in NOT_MODIFIED_HEADERS]
+
+
+class Recording:
+    """
+    A directory of recorded export responses.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     recording = Recording(Path(tmp))
+        ...     _ = recording.add("GET", "https://docs.google.com/export?gid=1", 200, "OK",
+        ...                       [("Content-Type", "text/csv")], b"ID,Name\\r\\n")
+        ...     recording.save()
+        ...     reloaded = Recording(Path(tmp))
+        ...     entry = reloaded.get("GET", "http://localhost:8765/export?gid=1")
+        ...     (entry.status, reloaded.read_body(entry))
+        (200, b'ID,Name\\r\\n')
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+        self.responses: Dict[str, RecordedResponse] = {}
+        self._lock = threading.Lock()
+
+        index_path = directory / RECORDING_INDEX
+        if index_path.exists():
+            with open(index_path, "r", encoding="utf-8") as f:
+                raw_index = json.load(f)
+            for key, raw_response in raw_index.get("responses", {}).items():
+                raw_response["headers"] = [tuple(h) for h in raw_response["headers"]]
+                # Older recordings may hold a 304, which answers no request by itself
+                if raw_response["status"] != 304:
+                    self.responses[key] = RecordedResponse(**raw_response)
+
+    def get(self, method: str, url: str) -> Optional[RecordedResponse]:
+        """
+        Look up the response recorded for a request.
+
+        HEAD requests fall back to the GET recording of the same URL.
+        """
+        response = self.responses.get(recording_key(method, url))
+        if response is None and method.upper() == "HEAD":
+            response = self.responses.get(recording_key("GET", url))
+        return response
+
+    def read_body(self, response: RecordedResponse) -> bytes:
+        """Return the body of a recorded response (empty if it had none)."""
+        if response.body is None:
+            return b""
+        with open(self.directory / RECORDING_BODIES / response.body, "rb") as f:
+            return f.read()
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        reason: str,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+    ) -> Optional[RecordedResponse]:
+        """
+        Record a response, storing its body once per distinct content.
+
+        A 304 is not recorded, so it cannot replace the 200 it confirms.
+
+        Examples:
+            >>> import tempfile
+            >>> with tempfile.TemporaryDirectory() as tmp:
+            ...     recording = Recording(Path(tmp))
+            ...     _ = recording.add("GET", "https://example.com/export?gid=1", 200, "OK", [("ETag", '"v1"')], b"ID\\r\\n")
+            ...     recording.add("GET", "https://example.com/export?gid=1", 304, "Not Modified", [("ETag", '"v1"')], b"")
+            ...     recording.get("GET", "https://example.com/export?gid=1").status
+            200
+        """
+        if status == 304:
+            return None
+
+        body_name = None
+        if body:
+            body_name = hashlib.sha256(body).hexdigest()
+            body_path = self.directory / RECORDING_BODIES / body_name
+            if not body_path.exists():
+                body_path.parent.mkdir(parents=True, exist_ok=True)
+                temp_path = body_path.with_suffix(f".{threading.get_ident()}.tmp")
+                with open(temp_path, "wb") as f:
+                    f.write(body)
+                os.replace(temp_path, body_path)
+
+        kept_headers = [
+            (key, value) for key, value in headers if key.lower() not in TRANSPORT_HEADERS
+        ]
+        response = RecordedResponse(
+            method.upper(), url, status, reason, kept_headers, body_name
+        )
+        with self._lock:
+            self.responses[recording_key(method, url)] = response
+        return response
+
+    def save(self) -> None:
+        """Atomically write the recording index."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        index_path = self.directory / RECORDING_INDEX
+        temp_path = index_path.with_suffix(".tmp")
+        with self._lock:
+            raw_index = {
+                "responses": {
+                    key: asdict(response) for key, response in sorted(self.responses.items())
+                }
+            }
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(raw_index, f, indent=2)
+        os.replace(temp_path, index_path)
+
+
+class TeeStream:
+    """
+    Wrap the raw stream of a response, handing its decoded body to a callback once read to the end.
+
+    A body that is not read to the end is not handed over.
+
+    Examples:
+        >>> bodies = []
+        >>> raw = TeeStream(io.BytesIO(b"ID,Name\\r\\n"), bodies.append)
+        >>> b"".join(raw.stream(4))
+        b'ID,Name\\r\\n'
+        >>> bodies
+        [b'ID,Name\\r\\n']
+    """
+
+    def __init__(self, raw: Any, on_complete: Callable[[bytes], None]) -> None:
+        self.raw = raw
+        self.on_complete = on_complete
+        self.chunks: List[bytes] = []
+
+    def stream(self, amt: int = 2**16, decode_content: Optional[bool] = None) -> Iterator[bytes]:
+        if hasattr(self.raw, "stream"):
+            chunks = self.raw.stream(amt, decode_content=decode_content)
+        else:
+            chunks = iter(lambda: self.raw.read(amt), b"")
+        for chunk in chunks:
+            self.chunks.append(chunk)
+            yield chunk
+        self.on_complete(b"".join(self.chunks))
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.raw, name)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    Transport adapter that performs real requests and records every response.
+
+    Each redirect hop passes through the adapter separately, so the recording
+    keeps the full redirect chain with its status codes and Location headers.
+    Bodies are recorded as the caller streams them, once read to the end.
+    The recording index is written when the session is closed.
+    """
+
+    def __init__(self, recording: Recording, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.recording = recording
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        response = super().send(
+            request, stream=stream, timeout=timeout, verify=verify, cert=cert, proxies=proxies
+        )
+        method = request.method or "GET"
+        url = response.url
+        status = response.status_code
+        reason = response.reason or ""
+        headers = list(response.headers.items())
+
+        def record(body: bytes) -> None:
+            self.recording.add(method, url, status, reason, headers, body)
+
+        response.raw = TeeStream(response.raw, record)
+        return response
+
+    def close(self) -> None:
+        self.recording.save()
+        super().close()
+
+
+class ReplayAdapter(BaseAdapter):
+    """
+    Transport adapter that answers every request from a recording.
+
+    Requests without a recorded response fail with a ConnectionError, exactly
+    as an unreachable host would.
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     recording = Recording(Path(tmp))
+        ...     _ = recording.add("GET", "https://docs.google.com/export?gid=1", 307, "Temporary Redirect",
+        ...                       [("Location", "https://doc.googleusercontent.com/dl?gid=1")], b"")
+        ...     _ = recording.add("GET", "https://doc.googleusercontent.com/dl?gid=1", 200, "OK",
+        ...                       [("Content-Type", "text/csv; charset=utf-8")], b"ID,Name\\r\\n")
+        ...     session = requests.Session()
+        ...     session.mount("https://", ReplayAdapter(recording))
+        ...     response = session.get("https://docs.google.com/export?gid=1")
+        ...     (response.status_code, [r.status_code for r in response.history], response.text)
+        (200, [307], 'ID,Name\\r\\n')
+
+        A 304 answers only requests whose validators match the recorded 200:
+
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     recording = Recording(Path(tmp))
+        ...     _ = recording.add("GET", "https://docs.google.com/export?gid=1", 200, "OK",
+        ...                       [("ETag", '"v1"')], b"ID,Name\\r\\n")
+        ...     session = requests.Session()
+        ...     session.mount("https://", ReplayAdapter(recording))
+        ...     [(response.status_code, response.content) for response in (
+        ...         session.get("https://docs.google.com/export?gid=1", headers={"If-None-Match": '"v1"'}),
+        ...         session.get("https://docs.google.com/export?gid=1", headers={"If-None-Match": '"v0"'}),
+        ...         session.get("https://docs.google.com/export?gid=1"))]
+        [(304, b''), (200, b'ID,Name\\r\\n'), (200, b'ID,Name\\r\\n')]
+    """
+
+    def __init__(self, recording: Recording) -> None:
+        super().__init__()
+        self.recording = recording
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        method = request.method or "GET"
+        recorded = self.recording.get(method, request.url)
+        if recorded is None:
+            raise requests.exceptions.ConnectionError(
+                f"No recorded response for {recording_key(method, request.url)}",
+                request=request,
+            )
+
+        if recorded.not_modified_by(request.headers):
+            status, reason, headers, body = 304, "Not Modified", recorded.not_modified_headers(), b""
+        else:
+            status, reason, headers = recorded.status, recorded.reason, recorded.headers
+            body = b"" if method.upper() == "HEAD" else self.recording.read_body(recorded)
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict(headers)
+        response.headers["Content-Length"] = str(len(body))
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.raw = io.BytesIO(body)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """
+    Local stand-in for the Google Sheets export endpoint.
+
+    Serves recorded responses (including redirect hops, with their Location
+    rewritten to this server) after ``latency`` seconds, streaming bodies at
+    no more than ``throughput`` bytes per second (0 means unlimited).
+
+    Examples:
+        >>> import tempfile
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     recording = Recording(Path(tmp))
+        ...     _ = recording.add("GET", "https://docs.google.com/spreadsheets/d/ABC/export?format=csv&gid=1",
+        ...                       200, "OK", [("Content-Type", "text/csv")], b"ID,Name\\r\\nA,Alpha\\r\\n")
+        ...     server = ReplayServer(("127.0.0.1", 0), recording, latency=0.01)
+        ...     thread = threading.Thread(target=server.serve_forever, daemon=True)
+        ...     thread.start()
+        ...     response = requests.get(f"{server.origin}/spreadsheets/d/ABC/export?format=csv&gid=1")
+        ...     missing = requests.get(f"{server.origin}/spreadsheets/d/ABC/export?format=csv&gid=2")
+        ...     server.shutdown()
+        ...     server.server_close()
+        >>> (response.status_code, response.text, missing.status_code)
+        (200, 'ID,Name\\r\\nA,Alpha\\r\\n', 404)
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: Tuple[str, int],
+        recording: Recording,
+        latency: float = 0.0,
+        throughput: int = 0,
+    ) -> None:
+        super().__init__(server_address, ReplayRequestHandler)
+        self.recording = recording
+        self.latency = latency
+        self.throughput = throughput
+
+    @property
+    def origin(self) -> str:
+        """Base URL of the server, e.g. http://127.0.0.1:8765."""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class ReplayRequestHandler(BaseHTTPRequestHandler):
+    """Request handler answering from the ReplayServer's recording."""
+
+    protocol_version = "HTTP/1.1"
+    server: ReplayServer
+
+    def log_message(self, format: str, *args) -> None:
+        # Keep benchmark output readable; errors are still reported by send_error
+        pass
+
+    def do_GET(self) -> None:
+        self._replay(send_body=True)
+
+    def do_HEAD(self) -> None:
+        self._replay(send_body=False)
+
+    def _replay(self, send_body: bool) -> None:
+        if self.server.latency > 0:
+            time.sleep(self.server.latency)
+
+        recorded = self.server.recording.get(self.command, self.path)
+        if recorded is None:
+            self.send_error(404, f"No recorded response for {self.command} {self.path}")
+            return
+
+        if recorded.not_modified_by(self.headers):
+            self.send_response(304, "Not Modified")
+            for key, value in recorded.not_modified_headers():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        body = self.server.recording.read_body(recorded)
+        self.send_response(recorded.status, recorded.reason)
+        for key, value in recorded.headers:
+            if key.lower() == "location":
+                value = rewrite_location(value, self.server.origin)
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if send_body and body:
+            self._write_throttled(body)
+
+    def _write_throttled(self, body: bytes) -> None:
+        throughput = self.server.throughput
+        if throughput <= 0:
+            self.wfile.write(body)
+            return
+
+        # Send roughly 20 chunks per second to approximate a steady rate
+        chunk_size = max(1, throughput // 20)
+        for offset in range(0, len(body), chunk_size):
+            chunk = body[offset:offset + chunk_size]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / throughput)
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py and sheets-export-server.py.")
+    print("Run it with --doctests to verify functionality.")
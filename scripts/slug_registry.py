@@ -0,0 +1,234 @@
+"""
+URL slugs of the framework items, shared by csv2yaml.py and the page generators.
+
+Every page is written to ``<namespace><slug>.md``, where the namespace is the
+output directory of its section, e.g. ``controls/network/``. Two items of a
+namespace must not share a slug, or one page silently overwrites the other.
+
+SlugRegistry hands out slugs one namespace at a time, from a hash table of
+the slugs already taken, so a sheet is checked for collisions in one pass.
+A slug that is taken gets the first free numbered suffix (``pen-testing-2``),
+in sheet order. csv2yaml.py saves the slugs of each sheet next to its YAML
+file:
+
+    data/controls.slugs.json
+    {"controls/network/": {"C.Network.ExternalPENTesting": ["pen-testing", "pen-testing-2"]}}
+
+and hands them out again on the next run to every item whose title did not
+change, so published URLs stay stable when items are added or reordered.
+The saved slug may differ from the one the title makes: the slugs of pages
+published before the registry existed were seeded into these files as they
+were, punctuation included.
+"""
+
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from row_index import ItemKeys
+
+SLUGS_SUFFIX = ".slugs.json"
+
+# Runs of anything but lowercase letters and digits become one hyphen
+NON_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=None)
+def slugify(text: str) -> str:
+    """
+    Convert text to URL-safe slug.
+
+    Examples:
+        >>> slugify("Security Policy")
+        'security-policy'
+        >>> slugify("PCI Sensitive (SAD, PAN)")
+        'pci-sensitive-sad-pan'
+        >>> slugify("Self-developed services")
+        'self-developed-services'
+        >>> slugify("Authentication can't be bypassed")
+        'authentication-can-t-be-bypassed'
+        >>> slugify("PCI: SAD & PAN encryption")
+        'pci-sad-pan-encryption'
+        >>> slugify("C.Network.AntiSpoofing")
+        'c-network-antispoofing'
+    """
+    return NON_SLUG_RE.sub("-", text.lower()).strip("-")
+
+
+def category_of(identifier: str) -> str:
+    """
+    Return the category of an item from its ID, as the page generators do.
+
+    Examples:
+        >>> category_of("C.Network.AntiSpoofing")
+        'network'
+        >>> category_of("RBAC")
+        'unknown'
+    """
+    parts = identifier.split(".")
+    if len(parts) >= 2:
+        return parts[1].lower()
+    return "unknown"
+
+
+# Slugs handed out in a namespace, by item key: (source text, slug)
+SlugMapping = Dict[str, Dict[str, Tuple[str, str]]]
+
+
+class SlugRegistry:
+    """
+    Hand out a unique slug to each item of each output namespace.
+
+    Items keep the slug of a previous mapping while their source text is
+    unchanged. Those slugs are reserved for their items, so an item added
+    earlier in the sheet cannot take them.
+
+    Examples:
+        >>> registry = SlugRegistry()
+        >>> registry.assign("controls/network/", "C.Network.ExternalPENTesting", "PEN testing")
+        'pen-testing'
+        >>> registry.assign("controls/network/", "C.Network.InternalPENTesting", "PEN testing")
+        'pen-testing-2'
+        >>> registry.assign("controls/host/", "C.Host.PENTesting", "PEN testing")
+        'pen-testing'
+        >>> registry.collisions
+        [('controls/network/', 'pen-testing', 'C.Network.InternalPENTesting', 'C.Network.ExternalPENTesting')]
+
+        A new item cannot take the slug of an item of the previous mapping:
+
+        >>> registry = SlugRegistry(registry.mapping())
+        >>> registry.assign("controls/network/", "C.Network.PENTesting", "PEN testing")
+        'pen-testing-3'
+        >>> registry.assign("controls/network/", "C.Network.ExternalPENTesting", "PEN testing")
+        'pen-testing'
+
+        Items without source text get a slug made of their key:
+
+        >>> SlugRegistry().assign("controls/auth/", "C.Auth.Tokens", "")
+        'c-auth-tokens'
+
+        ``make_slug`` turns the source text into a slug; ``str`` takes it as it is:
+
+        >>> SlugRegistry(make_slug=str).assign("controls/data/", "C.Data.Isolation", "ie:-per-customer")
+        'ie:-per-customer'
+    """
+
+    def __init__(
+        self, previous: Optional[SlugMapping] = None, make_slug: Callable[[str], str] = slugify
+    ) -> None:
+        self.previous: SlugMapping = previous or {}
+        self.make_slug = make_slug
+        self.assigned: SlugMapping = {}
+        # Owner of every slug taken in a namespace, previous slugs included
+        self.taken: Dict[str, Dict[str, str]] = {}
+        self.collisions: List[Tuple[str, str, str, str]] = []
+
+    def _taken_in(self, namespace: str) -> Dict[str, str]:
+        taken = self.taken.get(namespace)
+        if taken is None:
+            previous = self.previous.get(namespace, {})
+            taken = self.taken[namespace] = {slug: key for key, (_, slug) in previous.items()}
+        return taken
+
+    def assign(self, namespace: str, key: str, text: str) -> str:
+        """Return the slug of an item, unique in its namespace (keys must be unique too)."""
+        taken = self._taken_in(namespace)
+        assigned = self.assigned.setdefault(namespace, {})
+
+        previous = self.previous.get(namespace, {}).get(key)
+        if previous is not None and previous[0] == text:
+            slug = previous[1]
+        else:
+            slug = base = self.make_slug(text) or slugify(key)
+            owner = taken.get(base, key)
+            if owner != key:
+                self.collisions.append((namespace, base, key, owner))
+                number = 2
+                slug = f"{base}-{number}"
+                while taken.get(slug, key) != key:
+                    number += 1
+                    slug = f"{base}-{number}"
+
+        taken[slug] = key
+        assigned[key] = (text, slug)
+        return slug
+
+    def collision_warnings(self) -> List[str]:
+        """Describe each slug that had to be disambiguated."""
+        return [
+            f"{key} and {owner} share the slug {namespace}{slug}, "
+            f"using {self.assigned[namespace][key][1]!r}"
+            for namespace, slug, key, owner in self.collisions
+        ]
+
+    def mapping(self) -> SlugMapping:
+        """Return the slugs handed out so far, to be saved for the next run."""
+        return {namespace: dict(slugs) for namespace, slugs in self.assigned.items()}
+
+
+def make_page_slugs_unique(section: str, items: Iterable[Any]) -> List[str]:
+    """
+    Give page items (with ``id``, ``category`` and ``slug``) unique slugs in their directory.
+
+    Used by the page generators on data that did not go through csv2yaml.py,
+    such as a hand-edited YAML file. Slugs that are already unique are kept
+    as they are, so the published URLs csv2yaml.py keeps do not change.
+
+    Returns:
+        A warning for each slug that had to change
+
+    Examples:
+        >>> from types import SimpleNamespace as Item
+        >>> items = [Item(id="C.Network.A", category="network", slug="pen-testing"),
+        ...          Item(id="C.Network.B", category="network", slug="pen-testing"),
+        ...          Item(id="C.Network.C", category="network", slug="c.network.antispoofing")]
+        >>> make_page_slugs_unique("controls", items)
+        ["C.Network.B and C.Network.A share the slug controls/network/pen-testing, using 'pen-testing-2'"]
+        >>> [item.slug for item in items]
+        ['pen-testing', 'pen-testing-2', 'c.network.antispoofing']
+    """
+    registry = SlugRegistry(make_slug=str)
+    keys = ItemKeys()
+    for item in items:
+        item.slug = registry.assign(f"{section}/{item.category}/", keys.next(item.id), item.slug)
+    return registry.collision_warnings()
+
+
+def get_slugs_path(yaml_path: Path) -> Path:
+    """
+    Return where the slugs of a YAML file's items are saved.
+
+    Examples:
+        >>> get_slugs_path(Path("data/controls.yml")).as_posix()
+        'data/controls.slugs.json'
+    """
+    return yaml_path.parent / f"{yaml_path.stem}{SLUGS_SUFFIX}"
+
+
+def load_slugs(path: Path) -> SlugMapping:
+    """Load a saved slug mapping, or an empty one if there is none."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+        return {
+            namespace: {key: (text, slug) for key, (text, slug) in slugs.items()}
+            for namespace, slugs in raw.items()
+        }
+    except (OSError, ValueError, TypeError, AttributeError):
+        return {}
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by csv2yaml.py and the page generators.")
+    print("Run it with --doctests to verify functionality.")
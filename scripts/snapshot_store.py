@@ -0,0 +1,313 @@
+"""
+Content-addressed store of synced CSV exports.
+
+Every sync records a snapshot of the sheet CSVs it leaves in the data
+directory. File contents are stored once per SHA-256 digest as zlib-compressed
+blobs; a snapshot is just a line in an append-only index mapping its timestamp
+to the digest of each file:
+
+    data/.framework-sync/snapshots/
+        index.jsonl                  # one JSON line per snapshot
+        objects/ab/cd/abcd1234...    # compressed blob, named by content hash
+
+Blobs are fanned out over two levels of 256 directories, so no directory
+grows linearly with the number of snapshots. A sync that changes nothing adds
+neither a blob nor an index line. Snapshots can be listed, restored and
+diffed with ./scripts/framework-snapshots.py, without network access.
+"""
+
+import difflib
+import hashlib
+import json
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from atomic_files import create_temp_file, replace_file
+
+SNAPSHOTS_DIRNAME = "snapshots"
+SNAPSHOT_INDEX = "index.jsonl"
+OBJECTS_DIRNAME = "objects"
+
+# Size of the chunks read, compressed and decompressed at a time
+CHUNK_SIZE = 64 * 1024
+
+
+@dataclass
+class Snapshot:
+    """
+    One recorded state of the synced files.
+
+    Examples:
+        >>> snapshot = Snapshot("20240101T000000Z", 1704067200.0, {"a.csv": "ab" * 32})
+        >>> snapshot.digest == Snapshot("x", 0.0, {"a.csv": "ab" * 32}).digest
+        True
+    """
+    id: str
+    taken_at: float
+    files: Dict[str, str]
+
+    @property
+    def digest(self) -> str:
+        """Hash of the file names and contents, equal for identical snapshots."""
+        payload = json.dumps(self.files, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+
+def snapshot_id(taken_at: float) -> str:
+    """
+    Build the ID of a snapshot from its UTC timestamp.
+
+    Examples:
+        >>> snapshot_id(1704067200.0)
+        '20240101T000000Z'
+    """
+    return time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(taken_at))
+
+
+class SnapshotStore:
+    """
+    Snapshot index and compressed blob store rooted at a directory.
+
+    Examples:
+        >>> with tempfile.TemporaryDirectory() as tmp:
+        ...     data = Path(tmp)
+        ...     csv_path = data / "a.csv"
+        ...     _ = csv_path.write_bytes(b"ID,Name\\r\\nA,Alpha")
+        ...     store = SnapshotStore(data / "snapshots")
+        ...     first = store.record({"a.csv": csv_path}, taken_at=1704067200.0)
+        ...     again = store.record({"a.csv": csv_path}, taken_at=1704067260.0)
+        ...     _ = csv_path.write_bytes(b"ID,Name\\r\\nA,Alpha\\r\\nB,Beta")
+        ...     second = store.record({"a.csv": csv_path}, taken_at=1704067320.0)
+        ...     print(first.id, again is None, second.id)
+        ...     print([s.id for s in store.list_snapshots()])
+        ...     print(store.read_file(store.resolve("~1"), "a.csv"))
+        ...     print("".join(store.diff(first, second, "a.csv")), end="")
+        20240101T000000Z True 20240101T000200Z
+        ['20240101T000000Z', '20240101T000200Z']
+        b'ID,Name\\r\\nA,Alpha'
+        --- 20240101T000000Z/a.csv
+        +++ 20240101T000200Z/a.csv
+        @@ -2,0 +3 @@
+        +B,Beta
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.index_path = root / SNAPSHOT_INDEX
+        self.objects_dir = root / OBJECTS_DIRNAME
+
+    def object_path(self, sha256: str) -> Path:
+        """
+        Return where the blob of a content hash is stored.
+
+        Examples:
+            >>> SnapshotStore(Path("s")).object_path("abcdef" + "0" * 58).as_posix()
+            's/objects/ab/cd/abcdef0000000000000000000000000000000000000000000000000000000000'
+        """
+        return self.objects_dir / sha256[:2] / sha256[2:4] / sha256
+
+    def has_object(self, sha256: str) -> bool:
+        """True if the blob of a content hash is already stored."""
+        return self.object_path(sha256).exists()
+
+    def put_file(self, path: Path, sha256: Optional[str] = None) -> str:
+        """
+        Store the content of a file, once per content hash.
+
+        Args:
+            path: File to store
+            sha256: Content hash of the file, if already known
+
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        if sha256 is None:
+            digest = hashlib.sha256()
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            sha256 = digest.hexdigest()
+        if self.has_object(sha256):
+            return sha256
+
+        object_path = self.object_path(sha256)
+        object_path.parent.mkdir(parents=True, exist_ok=True)
+        compressor = zlib.compressobj(9)
+        temp_file = tempfile.NamedTemporaryFile(
+            dir=object_path.parent, prefix=f".{sha256}.", suffix=".part", delete=False
+        )
+        temp_path = Path(temp_file.name)
+        try:
+            with temp_file, open(path, "rb") as source:
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    temp_file.write(compressor.compress(chunk))
+                temp_file.write(compressor.flush())
+            replace_file(temp_path, object_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+        return sha256
+
+    def iter_object(self, sha256: str) -> Iterator[bytes]:
+        """Yield the decompressed content of a blob in chunks."""
+        decompressor = zlib.decompressobj()
+        with open(self.object_path(sha256), "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                yield decompressor.decompress(chunk)
+        yield decompressor.flush()
+
+    def list_snapshots(self) -> List[Snapshot]:
+        """Return every snapshot, oldest first."""
+        snapshots: List[Snapshot] = []
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        raw = json.loads(line)
+                        snapshots.append(Snapshot(raw["id"], raw["taken_at"], raw["files"]))
+                    except (ValueError, KeyError):
+                        # A line cut short by an interrupted write: skip it
+                        continue
+        except FileNotFoundError:
+            pass
+        return snapshots
+
+    def latest(self) -> Optional[Snapshot]:
+        """Return the most recent snapshot, if any."""
+        snapshots = self.list_snapshots()
+        return snapshots[-1] if snapshots else None
+
+    def record(
+        self,
+        files: Dict[str, Path],
+        hashes: Optional[Dict[str, str]] = None,
+        taken_at: Optional[float] = None,
+    ) -> Optional[Snapshot]:
+        """
+        Record a snapshot of files, unless it is identical to the latest one.
+
+        Args:
+            files: Files to snapshot, keyed by the name they are restored as
+            hashes: Known content hashes of the files, keyed like ``files``
+            taken_at: Timestamp of the snapshot (defaults to now)
+
+        Returns:
+            The new Snapshot, or None if nothing changed since the latest one
+        """
+        hashes = hashes or {}
+        taken_at = time.time() if taken_at is None else taken_at
+        stored = {
+            name: self.put_file(path, hashes.get(name))
+            for name, path in sorted(files.items())
+        }
+
+        snapshots = self.list_snapshots()
+        candidate = Snapshot(snapshot_id(taken_at), taken_at, stored)
+        if snapshots and snapshots[-1].digest == candidate.digest:
+            return None
+
+        # Keep IDs unique when several syncs run within the same second
+        existing_ids = {snapshot.id for snapshot in snapshots}
+        suffix = 2
+        while candidate.id in existing_ids:
+            candidate.id = f"{snapshot_id(taken_at)}-{suffix}"
+            suffix += 1
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        line = json.dumps(
+            {"id": candidate.id, "taken_at": candidate.taken_at, "files": candidate.files},
+            sort_keys=True,
+        )
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        return candidate
+
+    def resolve(self, reference: str) -> Snapshot:
+        """
+        Find a snapshot by ID, unique ID prefix, ``latest`` or ``~N`` (N before latest).
+
+        Raises:
+            KeyError: If no single snapshot matches
+        """
+        snapshots = self.list_snapshots()
+        if not snapshots:
+            raise KeyError("no snapshots recorded yet")
+        if reference == "latest":
+            return snapshots[-1]
+        if reference.startswith("~") and reference[1:].isdigit():
+            back = int(reference[1:])
+            if back >= len(snapshots):
+                raise KeyError(f"only {len(snapshots)} snapshots recorded")
+            return snapshots[-1 - back]
+
+        matches = [snapshot for snapshot in snapshots if snapshot.id.startswith(reference)]
+        exact = [snapshot for snapshot in matches if snapshot.id == reference]
+        if exact:
+            return exact[0]
+        if len(matches) != 1:
+            raise KeyError(
+                f"snapshot '{reference}' is {'ambiguous' if matches else 'unknown'}"
+            )
+        return matches[0]
+
+    def read_file(self, snapshot: Snapshot, name: str) -> bytes:
+        """Return the content of one file of a snapshot."""
+        return b"".join(self.iter_object(snapshot.files[name]))
+
+    def restore_file(self, snapshot: Snapshot, name: str, output_path: Path) -> None:
+        """Atomically write one file of a snapshot to ``output_path``."""
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_file = create_temp_file(output_path)
+        temp_path = Path(temp_file.name)
+        try:
+            with temp_file:
+                for chunk in self.iter_object(snapshot.files[name]):
+                    temp_file.write(chunk)
+            replace_file(temp_path, output_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def diff(
+        self,
+        old: Snapshot,
+        new: Snapshot,
+        name: str,
+        context: int = 0,
+    ) -> Iterator[str]:
+        """Yield a unified diff of one file between two snapshots."""
+        if old.files.get(name) == new.files.get(name):
+            return
+        old_lines = (
+            self.read_file(old, name).decode("utf-8").splitlines() if name in old.files else []
+        )
+        new_lines = (
+            self.read_file(new, name).decode("utf-8").splitlines() if name in new.files else []
+        )
+        for line in difflib.unified_diff(
+            old_lines,
+            new_lines,
+            f"{old.id}/{name}",
+            f"{new.id}/{name}",
+            n=context,
+            lineterm="",
+        ):
+            yield line + "\n"
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py and framework-snapshots.py.")
+    print("Run it with --doctests to verify functionality.")
@@ -0,0 +1,234 @@
+"""
+Memoized loader of the static resources embedded in the generated pages.
+
+Every page embeds the CSS and JS of its template and a few SVG icons. The
+page generators read them through one ResourceLoader per process, which
+reads each file once and also keeps the variants derived from it, such as
+the 80px hero version of an icon:
+
+    load_template_resource("control-item.css")
+    load_icon("star", hero=True)
+
+Entries are checked against the modification time and size of their file
+on each lookup, so a long-running process sees files edited under it.
+
+With --bundle, the generators link the CSS and JS of their pages instead
+of embedding them. Each file is written once to the static tree of the
+website, named after a hash of its content, so browsers can cache it for
+good and a changed file gets a new URL:
+
+    bundle_url("control-item.css")  # "/bundles/control-item.3f2a9c0d1e4b.css"
+
+The bundles are committed along with the pages that link them.
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from atomic_files import create_temp_file, replace_file
+
+SCRIPT_DIR = Path(__file__).parent
+TEMPLATE_DIR = SCRIPT_DIR / "templates"
+ICONS_DIR = SCRIPT_DIR.parent / "website" / "assets" / "icons"
+
+# Where bundles are written, and the URL Hugo serves them from
+BUNDLE_DIR = SCRIPT_DIR.parent / "website" / "static" / "bundles"
+BUNDLE_URL = "/bundles/"
+
+# Hex digits of the content hash in bundle names
+BUNDLE_HASH_LENGTH = 12
+
+# Shown where an icon file is missing
+FALLBACK_ICON = "<svg><text>📄</text></svg>"
+
+# (modification time, size) of a file when it was read
+Signature = Tuple[int, int]
+
+
+def enlarge_icon(svg: str) -> str:
+    """
+    Size a 24px icon for a hero section (80px).
+
+    Examples:
+        >>> enlarge_icon('<svg viewBox="0 0 24 24"><path/></svg>')
+        '<svg viewBox="0 0 24 24" width="80" height="80"><path/></svg>'
+    """
+    return svg.replace('viewBox="0 0 24 24"', 'viewBox="0 0 24 24" width="80" height="80"')
+
+
+class ResourceLoader:
+    """
+    Read text files once, and the variants derived from them.
+
+    Examples:
+        >>> import os, tempfile
+        >>> path = Path(tempfile.mkdtemp()) / "shield.svg"
+        >>> _ = path.write_text('<svg viewBox="0 0 24 24"/>', encoding="utf-8")
+        >>> loader = ResourceLoader()
+        >>> loader.read(path)
+        '<svg viewBox="0 0 24 24"/>'
+        >>> loader.read_variant(path, "hero", enlarge_icon)
+        '<svg viewBox="0 0 24 24" width="80" height="80"/>'
+        >>> loader.reads
+        1
+        >>> _ = path.write_text('<svg viewBox="0 0 24 24"><path/></svg>', encoding="utf-8")
+        >>> os.utime(path, ns=(0, 0))
+        >>> loader.read_variant(path, "hero", enlarge_icon)
+        '<svg viewBox="0 0 24 24" width="80" height="80"><path/></svg>'
+        >>> loader.reads
+        2
+        >>> loader.read(path.with_name("missing.svg")) is None
+        True
+    """
+
+    def __init__(self) -> None:
+        self.entries: Dict[Tuple[Path, str], Tuple[Signature, str]] = {}
+        self.reads = 0
+
+    def _signature(self, path: Path) -> Optional[Signature]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self, path: Path) -> Optional[str]:
+        """Return the content of a text file, or None if it cannot be read."""
+        signature = self._signature(path)
+        if signature is None:
+            return None
+        entry = self.entries.get((path, ""))
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError:
+            return None
+        self.reads += 1
+        self.entries[(path, "")] = (signature, content)
+        return content
+
+    def read_variant(self, path: Path, variant: str, transform: Callable[[str], str]) -> Optional[str]:
+        """Return ``transform`` applied to the content of a file, computed once per version of the file."""
+        content = self.read(path)
+        if content is None:
+            return None
+        signature = self.entries[(path, "")][0]
+        entry = self.entries.get((path, variant))
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+        derived = transform(content)
+        self.entries[(path, variant)] = (signature, derived)
+        return derived
+
+
+# One loader for the whole process
+resources = ResourceLoader()
+
+
+def load_template_resource(name: str, default: str = "") -> str:
+    """
+    Return a CSS or JS file of scripts/templates/, or ``default`` if it is missing.
+
+    Examples:
+        >>> load_template_resource("control-item.css") == (TEMPLATE_DIR / "control-item.css").read_text(encoding="utf-8")
+        True
+        >>> load_template_resource("missing.css", "/* CSS file not found */")
+        '/* CSS file not found */'
+    """
+    content = resources.read(TEMPLATE_DIR / name)
+    return default if content is None else content
+
+
+def get_bundle_name(name: str, content: str) -> str:
+    """
+    Name the bundle of a template resource after a hash of its content.
+
+    Examples:
+        >>> get_bundle_name("control-item.css", "body { margin: 0; }")
+        'control-item.3e67b4a9505b.css'
+    """
+    stem, suffix = os.path.splitext(name)
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:BUNDLE_HASH_LENGTH]
+    return f"{stem}.{digest}{suffix}"
+
+
+def write_bundle(name: str, content: str, bundle_dir: Path = BUNDLE_DIR) -> str:
+    """
+    Write the bundle of a template resource unless it exists, returning its file name.
+
+    Bundles of earlier versions of the resource are deleted. Worker
+    processes may write the same bundle at once, so it is moved into
+    place from a temporary file.
+
+    Examples:
+        >>> import tempfile
+        >>> bundle_dir = Path(tempfile.mkdtemp())
+        >>> write_bundle("control.css", "a {}", bundle_dir)
+        'control.9a4487ccbedf.css'
+        >>> write_bundle("control.css", "b {}", bundle_dir)
+        'control.cf2f3b658959.css'
+        >>> sorted(path.name for path in bundle_dir.iterdir())
+        ['control.cf2f3b658959.css']
+    """
+    filename = get_bundle_name(name, content)
+    path = bundle_dir / filename
+    if not path.exists():
+        bundle_dir.mkdir(parents=True, exist_ok=True)
+        temp_file = create_temp_file(path, "w", encoding="utf-8")
+        with temp_file:
+            temp_file.write(content)
+        replace_file(Path(temp_file.name), path)
+
+    stem, suffix = os.path.splitext(name)
+    for stale in bundle_dir.glob(f"{stem}.*{suffix}"):
+        hash_part = stale.name[len(stem) + 1 : -len(suffix)]
+        if len(hash_part) == BUNDLE_HASH_LENGTH and stale.name != filename:
+            stale.unlink(missing_ok=True)
+    return filename
+
+
+def bundle_url(name: str) -> Optional[str]:
+    """
+    Return the URL of the bundle of a CSS or JS file of scripts/templates/, writing it if needed.
+
+    Returns None if the file is missing, for the page to fall back to
+    embedding its default content.
+    """
+    return resources.read_variant(
+        TEMPLATE_DIR / name, "bundle", lambda content: BUNDLE_URL + write_bundle(name, content)
+    )
+
+
+def load_icon(name: str, default: str = FALLBACK_ICON, hero: bool = False) -> str:
+    """
+    Return an SVG icon of website/assets/icons/, sized for a hero section with ``hero``.
+
+    ``default`` is returned as it is when the icon is missing.
+
+    Examples:
+        >>> 'width="80"' in load_icon("star", hero=True), 'width="80"' in load_icon("star")
+        (True, False)
+        >>> load_icon("missing-icon")
+        '<svg><text>📄</text></svg>'
+    """
+    path = ICONS_DIR / f"{name}.svg"
+    content = resources.read_variant(path, "hero", enlarge_icon) if hero else resources.read(path)
+    return default if content is None else content
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by the page generators.")
+    print("Run it with --doctests to verify functionality.")
@@ -0,0 +1,582 @@
+"""
+Scheduling helpers for framework-sync.py --manifest.
+
+A manifest sync fetches N spreadsheets × M sheets through one bounded worker
+pool. This module provides the pieces that are independent of Google Sheets:
+
+- TokenBucket / HostRateLimiter: a token-bucket rate limit for each host, so a
+  large manifest stays under the request quota of the export endpoint
+- RateLimitedSession: a requests.Session that takes a token for every request
+  it sends, including each hop of a redirect
+- percentile / FetchStats: latency and throughput figures for the final report
+- RetryPolicy / hedged_get / FetchHistory: retries with jittered exponential
+  backoff, hedged requests fired after a p95-based delay, and the per-sheet
+  history those delays are derived from
+- OrderedOutput: what each task of a worker pool prints, shown task by task
+  in submission order
+- AdaptiveInterval / ChangeDebouncer: the polling interval and edit
+  debouncing of framework-sync.py --watch
+"""
+
+import io
+import math
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server errors
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+# Latency samples kept per sheet, and needed before hedging kicks in
+MAX_LATENCY_SAMPLES = 50
+MIN_HEDGE_SAMPLES = 5
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at ``rate`` tokens per second, holding at most ``burst``.
+
+    Examples:
+        >>> bucket = TokenBucket(rate=1000.0, burst=2)
+        >>> bucket.try_acquire()
+        True
+        >>> bucket.try_acquire()
+        True
+        >>> bucket.try_acquire(now=bucket.updated_at)
+        False
+        >>> bucket.try_acquire(now=bucket.updated_at + 0.001)
+        True
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be at least 1, got {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = float(burst)
+        self.updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(float(self.burst), self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self, now: Optional[float] = None) -> bool:
+        """Take a token if one is available, without waiting."""
+        with self._lock:
+            self._refill(self.clock() if now is None else now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """
+        Take a token, sleeping until one is available.
+
+        Returns:
+            Time spent waiting, in seconds
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(self.clock())
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+                delay = (1 - self.tokens) / self.rate
+            # Sleep outside the lock so other hosts' threads are never blocked
+            time.sleep(delay)
+            waited += delay
+
+
+class HostRateLimiter:
+    """
+    One TokenBucket per host, created on first use.
+
+    Examples:
+        >>> limiter = HostRateLimiter(rate=1000.0, burst=1)
+        >>> limiter.acquire("https://docs.google.com/spreadsheets/d/A/export")
+        0.0
+        >>> sorted(limiter.buckets)
+        ['docs.google.com']
+        >>> limiter.take_waited()
+        0.0
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        """Return the bucket of the host of ``url``."""
+        host = urlsplit(url).netloc.lower()
+        with self._lock:
+            if host not in self.buckets:
+                self.buckets[host] = TokenBucket(self.rate, self.burst)
+            return self.buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """Wait for a token of the host of ``url``, returning the time waited."""
+        waited = self.bucket_for(url).acquire()
+        self._local.waited = getattr(self._local, "waited", 0.0) + waited
+        return waited
+
+    def take_waited(self) -> float:
+        """Return and reset the time the calling thread spent waiting for tokens."""
+        waited = getattr(self._local, "waited", 0.0)
+        self._local.waited = 0.0
+        return waited
+
+
+class RateLimitedSession(requests.Session):
+    """
+    Session that waits for a token of the target host before every request.
+
+    requests follows redirects by calling send() again, so every hop is
+    limited against its own host.
+    """
+
+    def __init__(self, limiter: HostRateLimiter):
+        super().__init__()
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        self.limiter.acquire(request.url)
+        return super().send(request, **kwargs)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values (0.0 for an empty list).
+
+    Examples:
+        >>> percentile([0.3, 0.1, 0.2, 0.4], 50)
+        0.2
+        >>> percentile([0.3, 0.1, 0.2, 0.4], 95)
+        0.4
+        >>> percentile(list(range(1, 101)), 95)
+        95
+        >>> percentile([], 50)
+        0.0
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+@dataclass
+class FetchStats:
+    """
+    Latency and volume of the fetches of a sync run.
+
+    Latencies exclude the time spent waiting for the rate limit, which is
+    accounted for separately in ``throttled``.
+
+    Examples:
+        >>> stats = FetchStats()
+        >>> stats.add(0.2, 1000)
+        >>> stats.add(0.4, 3000, throttled=0.5)
+        >>> stats.count, stats.bytes
+        (2, 4000)
+        >>> stats.summary(elapsed=2.0)
+        '2 fetches in 2.00s (1.0 fetches/s, 2.0 KB/s), latency p50 0.200s, p95 0.400s, rate limited 0.50s'
+    """
+    latencies: List[float] = field(default_factory=list)
+    bytes: int = 0
+    throttled: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def count(self) -> int:
+        """Number of fetches recorded."""
+        return len(self.latencies)
+
+    def add(self, latency: float, size: int, throttled: float = 0.0) -> None:
+        """Record one fetch (thread-safe)."""
+        with self._lock:
+            self.latencies.append(latency)
+            self.bytes += size
+            self.throttled += throttled
+
+    def summary(self, elapsed: float) -> str:
+        """One-line throughput and latency report for a run lasting ``elapsed`` seconds."""
+        elapsed = max(elapsed, 1e-9)
+        return (
+            f"{self.count} fetches in {elapsed:.2f}s "
+            f"({self.count / elapsed:.1f} fetches/s, {self.bytes / elapsed / 1000:.1f} KB/s), "
+            f"latency p50 {percentile(self.latencies, 50):.3f}s, "
+            f"p95 {percentile(self.latencies, 95):.3f}s, "
+            f"rate limited {self.throttled:.2f}s"
+        )
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Parse a Retry-After header (seconds or HTTP date) into a delay in seconds.
+
+    Examples:
+        >>> parse_retry_after("2")
+        2.0
+        >>> parse_retry_after("Thu, 01 Jan 1970 00:00:10 GMT", now=4.0)
+        6.0
+        >>> parse_retry_after("soon") is None
+        True
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry with exponential backoff and full jitter.
+
+    Retry ``n`` (0-based) waits a random delay between 0 and
+    ``min(max_delay, base_delay * 2 ** n)``, or at least what the server asked
+    for with Retry-After. Only network errors, timeouts and RETRYABLE_STATUSES
+    are retried.
+
+    Examples:
+        >>> policy = RetryPolicy(attempts=4, base_delay=0.5, max_delay=4.0)
+        >>> [policy.backoff(n, rng=lambda: 1.0) for n in range(5)]
+        [0.5, 1.0, 2.0, 4.0, 4.0]
+        >>> policy.backoff(0, retry_after=3.0, rng=lambda: 0.0)
+        3.0
+        >>> policy.should_retry(requests.exceptions.ConnectTimeout())
+        True
+        >>> response = requests.Response()
+        >>> response.status_code = 404
+        >>> policy.should_retry(requests.exceptions.HTTPError(response=response))
+        False
+        >>> response.status_code = 503
+        >>> policy.should_retry(requests.exceptions.HTTPError(response=response))
+        True
+    """
+    attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+
+    def backoff(
+        self,
+        retry_number: int,
+        retry_after: Optional[float] = None,
+        rng: Callable[[], float] = random.random,
+    ) -> float:
+        """Delay before retry ``retry_number`` (0 for the first retry)."""
+        delay = rng() * min(self.max_delay, self.base_delay * 2 ** retry_number)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def should_retry(self, error: Exception) -> bool:
+        """True if the request that raised ``error`` is worth retrying."""
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in RETRYABLE_STATUSES
+        return isinstance(
+            error,
+            (
+                requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ),
+        )
+
+
+def hedged_get(
+    session: requests.Session,
+    url: str,
+    hedge_delay: Optional[float],
+    **kwargs: Any,
+) -> Tuple[requests.Response, bool, bool]:
+    """
+    GET a URL, firing a second identical request if the first is slow.
+
+    When the first response has not arrived after ``hedge_delay`` seconds,
+    a hedge request is sent and whichever response arrives first is used;
+    the other one is closed as soon as it arrives. A request that fails is
+    only reported if the other one fails too. Without a delay this is a plain
+    session.get().
+
+    Returns:
+        Tuple of (response, hedged, hedge_won)
+    """
+    if hedge_delay is None:
+        return session.get(url, **kwargs), False, False
+
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        primary = executor.submit(session.get, url, **kwargs)
+        done, _ = wait([primary], timeout=hedge_delay)
+        if done:
+            return primary.result(), False, False
+
+        hedge = executor.submit(session.get, url, **kwargs)
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                # The loser is released when (if ever) its response arrives
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                for other in done - {future}:
+                    _close_response(other)
+                return future.result(), True, future is hedge
+        assert error is not None
+        raise error
+    finally:
+        executor.shutdown(wait=False)
+
+
+def _close_response(future: Future) -> None:
+    """Close the response of a finished request future, if it has one."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+@dataclass
+class FetchHistory:
+    """
+    Retry and hedge counters and recent latencies of one sheet, across runs.
+
+    Examples:
+        >>> history = FetchHistory()
+        >>> history.hedge_delay() is None
+        True
+        >>> for latency in [0.2, 0.3, 0.25, 0.2, 1.5]:
+        ...     history.record(latency, retries=0, hedged=False, hedge_won=False)
+        >>> history.record(None, retries=2, hedged=True, hedge_won=True, failed=True)
+        >>> history.fetches, history.retries, history.hedges, history.hedge_wins, history.failures
+        (6, 2, 1, 1, 1)
+        >>> history.hedge_delay()
+        1.5
+    """
+    fetches: int = 0
+    retries: int = 0
+    failures: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    latencies: List[float] = field(default_factory=list)
+
+    def record(
+        self,
+        latency: Optional[float],
+        retries: int,
+        hedged: bool,
+        hedge_won: bool,
+        failed: bool = False,
+    ) -> None:
+        """Account for one fetch of the sheet."""
+        self.fetches += 1
+        self.retries += retries
+        self.failures += int(failed)
+        self.hedges += int(hedged)
+        self.hedge_wins += int(hedge_won)
+        if latency is not None:
+            self.latencies = (self.latencies + [round(latency, 4)])[-MAX_LATENCY_SAMPLES:]
+
+    def hedge_delay(self) -> Optional[float]:
+        """p95 of the recent latencies, or None until there are enough samples."""
+        if len(self.latencies) < MIN_HEDGE_SAMPLES:
+            return None
+        return percentile(self.latencies, 95)
+
+
+class OrderedOutput:
+    """
+    Keep what the tasks of a thread pool print apart, and print it in submission order.
+
+    While active, this stands in for sys.stdout. What a task wrapped with
+    buffered() prints goes to a buffer of its own, and collect() prints
+    each task's buffer in one piece, in the order the tasks were submitted,
+    as soon as it and the tasks before it are done. Anything else is
+    printed as usual. (contextlib.redirect_stdout swaps sys.stdout for the
+    whole process, so it cannot tell threads apart.)
+
+    Examples:
+        >>> def greet(name):
+        ...     for part in ("Hello", name):
+        ...         time.sleep(0.01)
+        ...         print(part)
+        ...     return name.upper()
+        >>> with ThreadPoolExecutor(max_workers=2) as executor, OrderedOutput() as output:
+        ...     futures = [executor.submit(output.buffered(greet), name) for name in ("a", "b")]
+        ...     output.collect(futures)
+        Hello
+        a
+        Hello
+        b
+        ['A', 'B']
+    """
+
+    def __init__(self) -> None:
+        self.stream: TextIO = sys.stdout
+        self.local = threading.local()
+
+    def __enter__(self) -> "OrderedOutput":
+        self.stream = sys.stdout
+        sys.stdout = self  # type: ignore[assignment]
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sys.stdout = self.stream
+
+    def write(self, text: str) -> int:
+        buffer: Optional[io.StringIO] = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self) -> None:
+        if getattr(self.local, 'buffer', None) is None:
+            self.stream.flush()
+
+    def buffered(self, function: Callable[..., Any]) -> Callable[..., Tuple[Any, str]]:
+        """Wrap a task to return its result along with what it printed."""
+        def run(*args: Any, **kwargs: Any) -> Tuple[Any, str]:
+            self.local.buffer = io.StringIO()
+            try:
+                return function(*args, **kwargs), self.local.buffer.getvalue()
+            finally:
+                self.local.buffer = None
+        return run
+
+    def collect(self, futures: List[Future]) -> List[Any]:
+        """Print the output of buffered tasks in order, and return their results."""
+        results = []
+        for future in futures:
+            result, printed = future.result()
+            self.stream.write(printed)
+            self.stream.flush()
+            results.append(result)
+        return results
+
+
+@dataclass
+class AdaptiveInterval:
+    """
+    Polling interval that backs off while nothing changes and tightens after a change.
+
+    Examples:
+        >>> interval = AdaptiveInterval(minimum=5.0, maximum=20.0)
+        >>> interval.current
+        5.0
+        >>> for _ in range(4):
+        ...     interval.idle()
+        >>> interval.current
+        20.0
+        >>> interval.changed()
+        >>> interval.current
+        5.0
+    """
+    minimum: float
+    maximum: float
+    factor: float = 1.5
+    current: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        if self.minimum <= 0 or self.maximum < self.minimum:
+            raise ValueError(
+                f"expected 0 < minimum <= maximum, got {self.minimum} and {self.maximum}"
+            )
+        self.current = self.minimum
+
+    def idle(self) -> None:
+        """Lengthen the interval after a poll that found no change."""
+        self.current = min(self.maximum, self.current * self.factor)
+
+    def changed(self) -> None:
+        """Go back to the shortest interval after a poll that found a change."""
+        self.current = self.minimum
+
+
+class ChangeDebouncer:
+    """
+    Collect changes until none has arrived for ``quiet_period`` seconds.
+
+    Examples:
+        >>> debouncer = ChangeDebouncer(quiet_period=10.0)
+        >>> debouncer.add(["assets"], now=100.0)
+        >>> debouncer.add(["controls"], now=105.0)
+        >>> debouncer.ready(now=112.0), debouncer.remaining(now=112.0)
+        (False, 3.0)
+        >>> debouncer.ready(now=115.0)
+        True
+        >>> sorted(debouncer.take())
+        ['assets', 'controls']
+        >>> debouncer.pending
+        set()
+    """
+
+    def __init__(self, quiet_period: float):
+        self.quiet_period = quiet_period
+        self.pending: Set[str] = set()
+        self.last_change = 0.0
+
+    def add(self, changes: Iterable[str], now: Optional[float] = None) -> None:
+        """Record changes; the quiet period restarts when there is any."""
+        changes = set(changes)
+        if changes:
+            self.pending |= changes
+            self.last_change = time.monotonic() if now is None else now
+
+    def remaining(self, now: Optional[float] = None) -> float:
+        """Seconds left before the pending changes are ready."""
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.last_change + self.quiet_period - now)
+
+    def ready(self, now: Optional[float] = None) -> bool:
+        """True if there are pending changes and the quiet period has passed."""
+        return bool(self.pending) and self.remaining(now) == 0.0
+
+    def take(self) -> Set[str]:
+        """Return the pending changes and start over."""
+        changes, self.pending = self.pending, set()
+        return changes
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py --manifest.")
+    print("Run it with --doctests to verify functionality.")
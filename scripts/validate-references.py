@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Reference Validator for Secure Product Framework
+
+This script checks the references between the YAML data files written by
+csv2yaml.py: every asset named in a control's "Tested on asset inventory"
+column (tested_on_assets) must be an asset of assets.yml, IDs must be unique across controls
+and governance, and no two pages of an output directory may share a slug.
+
+Usage:
+    ./scripts/validate-references.py [--dir DIR] [--help] [--doctests]
+
+Options:
+    --dir      Data directory holding the YAML files (default: data/)
+    --help     Show this help message and exit
+    --doctests Run doctests and exit
+
+Examples:
+    ./scripts/validate-references.py
+        Check the references of data/*.yml
+
+    ./scripts/validate-references.py --doctests
+        Run all doctests to verify functionality
+
+The script will:
+1. Load assets.yml, controls.yml and governance.yml (from their model cache
+   when it is up to date)
+2. Index asset names, IDs and slugs in hash tables, once
+3. Resolve every reference against those indexes in a single pass
+4. Report each dangling, ambiguous or duplicate reference with its location
+   (the YAML line of the item, and its ID), and exit with status 1 if any
+
+Asset names match exactly, or else by their slug ("users" and "Users" are
+the same asset). A reference is ambiguous when it matches several assets by
+slug and none exactly.
+"""
+
+import sys
+from dataclasses import dataclass
+from difflib import get_close_matches
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from csv2yaml import SHEET_CONVERTERS
+from model_cache import load_model
+from row_index import file_sha256, load_index
+from slug_registry import category_of, slugify
+
+# Options that take a value
+VALUE_OPTIONS = ["--dir"]
+
+# Key of controls.yml listing the assets a control is tested on
+ASSET_REFERENCES = ("controls", "tested_on_assets")
+
+
+@dataclass(frozen=True)
+class Location:
+    """
+    Where an item is: its YAML file, its position there and its ID.
+
+    Examples:
+        >>> str(Location("controls.yml", 3, "C.Network.IDS", 42))
+        'controls.yml:42 (C.Network.IDS)'
+        >>> str(Location("controls.yml", 3, "C.Network.IDS"))
+        'controls.yml item 3 (C.Network.IDS)'
+    """
+
+    filename: str
+    position: int
+    key: str
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        where = f"{self.filename}:{self.line}" if self.line else f"{self.filename} item {self.position}"
+        return f"{where} ({self.key})"
+
+
+@dataclass(frozen=True)
+class Problem:
+    """A dangling, ambiguous or duplicate reference."""
+
+    kind: str
+    location: Location
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.location}: {self.message}"
+
+
+def item_lines(yaml_path: Path, count: int) -> Optional[List[int]]:
+    """
+    Return the line number of each item of a YAML file, from its item index.
+
+    csv2yaml.py records the byte offset of every item; the offsets are only
+    used while the index still describes the file.
+    """
+    index = load_index(yaml_path)
+    if index is None or len(index.entries) != count or index.yaml_sha256 != file_sha256(yaml_path):
+        return None
+
+    content = yaml_path.read_bytes()
+    lines: List[int] = []
+    line = 1
+    position = 0
+    for _, offset, _ in index.entries.values():
+        line += content.count(b"\n", position, offset)
+        position = offset
+        lines.append(line)
+    return lines
+
+
+def locate_items(sheet_name: str, items: List[Dict[str, Any]], lines: Optional[List[int]]) -> List[Location]:
+    """
+    Return the location of each item of a sheet.
+
+    Examples:
+        >>> items = [{"id": "C1"}, {"id": "C2"}]
+        >>> [str(location) for location in locate_items("controls", items, [2, 12])]
+        ['controls.yml:2 (C1)', 'controls.yml:12 (C2)']
+    """
+    converter = SHEET_CONVERTERS[sheet_name]
+    return [
+        Location(converter.yaml_filename, position, str(item.get(converter.required, "")),
+                 lines[position - 1] if lines else None)
+        for position, item in enumerate(items, start=1)
+    ]
+
+
+class ReferenceIndex:
+    """
+    Hash indexes of the assets, IDs and slugs of the framework, built once.
+
+    Examples:
+        >>> index = ReferenceIndex()
+        >>> index.add_asset("Users", Location("assets.yml", 1, "Users"))
+        >>> index.add_asset("users", Location("assets.yml", 2, "users"))
+        >>> index.add_asset("Network", Location("assets.yml", 3, "Network"))
+        >>> index.resolve_asset("Network")
+        ['Network']
+        >>> index.resolve_asset("network")
+        ['Network']
+        >>> index.resolve_asset("USERS")
+        ['Users', 'users']
+        >>> index.resolve_asset("Printers")
+        []
+    """
+
+    def __init__(self) -> None:
+        self.assets: Dict[str, List[Location]] = {}
+        self.asset_slugs: Dict[str, List[str]] = {}
+        self.ids: Dict[str, List[Location]] = {}
+        self.slugs: Dict[Tuple[str, str], List[Location]] = {}
+
+    def add_asset(self, name: str, location: Location) -> None:
+        if name not in self.assets:
+            self.assets[name] = []
+            self.asset_slugs.setdefault(slugify(name), []).append(name)
+        self.assets[name].append(location)
+
+    def add_id(self, identifier: str, location: Location) -> None:
+        self.ids.setdefault(identifier, []).append(location)
+
+    def add_slug(self, namespace: str, slug: str, location: Location) -> None:
+        self.slugs.setdefault((namespace, slug), []).append(location)
+
+    def resolve_asset(self, reference: str) -> List[str]:
+        """Return the names of the assets a reference matches (exactly, or else by slug)."""
+        if reference in self.assets:
+            return [reference]
+        return self.asset_slugs.get(slugify(reference), [])
+
+    def suggest_asset(self, reference: str) -> Optional[str]:
+        """Return the asset name closest to an unknown reference, if any is close."""
+        prefixed = [name for name in self.assets if name.lower().startswith(reference.lower())]
+        if len(prefixed) == 1:
+            return prefixed[0]
+        matches = get_close_matches(reference, list(self.assets), n=1, cutoff=0.6)
+        return matches[0] if matches else None
+
+
+def build_index(documents: Dict[str, List[Dict[str, Any]]], locations: Dict[str, List[Location]]) -> ReferenceIndex:
+    """Index the asset names, IDs and page slugs of every sheet."""
+    index = ReferenceIndex()
+    for sheet_name, items in documents.items():
+        converter = SHEET_CONVERTERS[sheet_name]
+        by_category = "{category}" in converter.slug_namespace
+        for item, location in zip(items, locations[sheet_name]):
+            if sheet_name == "assets":
+                index.add_asset(location.key, location)
+            else:
+                index.add_id(location.key, location)
+            slug = item.get("slug")
+            if slug and converter.slug_namespace:
+                namespace = converter.slug_namespace
+                if by_category:
+                    namespace = namespace.format(category=category_of(location.key))
+                index.add_slug(namespace, slug, location)
+    return index
+
+
+def find_duplicates(index: ReferenceIndex) -> List[Problem]:
+    """
+    Report asset names, IDs and page slugs used by more than one item.
+
+    Examples:
+        >>> index = ReferenceIndex()
+        >>> index.add_id("C1", Location("controls.yml", 1, "C1"))
+        >>> index.add_id("C1", Location("governance.yml", 4, "C1"))
+        >>> [str(problem) for problem in find_duplicates(index)]
+        ['governance.yml item 4 (C1): ID already used at controls.yml item 1 (C1)']
+    """
+    problems: List[Problem] = []
+    for name, locations in index.assets.items():
+        for location in locations[1:]:
+            problems.append(Problem("duplicate", location, f"asset name already used at {locations[0]}"))
+    for locations in index.ids.values():
+        for location in locations[1:]:
+            problems.append(Problem("duplicate", location, f"ID already used at {locations[0]}"))
+    for (namespace, slug), locations in index.slugs.items():
+        for location in locations[1:]:
+            problems.append(Problem(
+                "duplicate", location, f"slug {namespace}{slug} already used at {locations[0]}"
+            ))
+    return problems
+
+
+def check_asset_references(
+    index: ReferenceIndex, items: List[Dict[str, Any]], locations: List[Location], field: str
+) -> List[Problem]:
+    """
+    Resolve the asset names listed in a field of each item, in one pass.
+
+    Examples:
+        >>> index = ReferenceIndex()
+        >>> for name in ["Users", "Customer", "Outsourced controls"]:
+        ...     index.add_asset(name, Location("assets.yml", 1, name))
+        >>> items = [{"id": "C1", "tested_on_assets": ["users", "Customer", "Outsourced"]}]
+        >>> for problem in check_asset_references(index, items, [Location("controls.yml", 1, "C1", 7)],
+        ...                                       "tested_on_assets"):
+        ...     print(problem)
+        controls.yml:7 (C1): unknown asset 'Outsourced' in tested_on_assets (did you mean 'Outsourced controls'?)
+    """
+    problems: List[Problem] = []
+    # The same lists come back on many items: resolve each distinct list once
+    resolved: Dict[Tuple[str, ...], List[Tuple[str, str]]] = {}
+    for item, location in zip(items, locations):
+        value = tuple(item.get(field) or ())
+        if not value:
+            continue
+        failures = resolved.get(value)
+        if failures is None:
+            failures = resolved[value] = []
+            for reference in value:
+                matches = index.resolve_asset(reference)
+                if not matches:
+                    suggestion = index.suggest_asset(reference)
+                    hint = f" (did you mean {suggestion!r}?)" if suggestion else ""
+                    failures.append(("dangling", f"unknown asset {reference!r} in {field}{hint}"))
+                elif len(matches) > 1:
+                    names = ", ".join(repr(name) for name in matches)
+                    failures.append(("ambiguous", f"asset {reference!r} in {field} matches {names}"))
+        for kind, message in failures:
+            problems.append(Problem(kind, location, message))
+    return problems
+
+
+def validate_references(data_dir: Path) -> List[Problem]:
+    """Load the YAML data files of a directory and check all their references."""
+    documents: Dict[str, List[Dict[str, Any]]] = {}
+    locations: Dict[str, List[Location]] = {}
+    for sheet_name, converter in SHEET_CONVERTERS.items():
+        yaml_path = data_dir / converter.yaml_filename
+        data = load_model(yaml_path)
+        items = (data.get(sheet_name) or []) if isinstance(data, dict) else []
+        documents[sheet_name] = items
+        locations[sheet_name] = locate_items(sheet_name, items, item_lines(yaml_path, len(items)))
+
+    index = build_index(documents, locations)
+    problems = find_duplicates(index)
+    sheet_name, field = ASSET_REFERENCES
+    problems += check_asset_references(index, documents[sheet_name], locations[sheet_name], field)
+    return problems
+
+
+def get_option_value(argv: List[str], option: str) -> Optional[str]:
+    """
+    Return the value given to an option, or None if the option is absent.
+
+    Examples:
+        >>> get_option_value(["validate-references.py", "--dir", "/tmp/data"], "--dir")
+        '/tmp/data'
+        >>> get_option_value(["validate-references.py"], "--dir") is None
+        True
+    """
+    if option not in argv:
+        return None
+
+    option_index = argv.index(option)
+    if option_index + 1 >= len(argv):
+        print(f"❌ Error: {option} option requires a value")
+        print("Use --help for usage information")
+        sys.exit(1)
+    return argv[option_index + 1]
+
+
+def show_help() -> None:
+    """
+    Display help information.
+
+    Examples:
+        >>> import io
+        >>> old_stdout = sys.stdout
+        >>> sys.stdout = captured_output = io.StringIO()
+        >>> show_help()
+        >>> sys.stdout = old_stdout
+        >>> output = captured_output.getvalue()
+        >>> "Reference Validator for Secure Product Framework" in output
+        True
+        >>> "Usage:" in output
+        True
+    """
+    print(__doc__)
+
+
+def main() -> None:
+    """Main function to run the validation."""
+    if "--help" in sys.argv or "-h" in sys.argv:
+        show_help()
+        sys.exit(0)
+
+    project_root = Path(__file__).parent.parent
+    data_dir = Path(get_option_value(sys.argv, "--dir") or project_root / "data")
+
+    print(f"🔎 Validating references in {data_dir}...")
+    try:
+        problems = validate_references(data_dir)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e.filename} not found")
+        print("💡 Tip: Run 'make data-convert' to generate the YAML data files")
+        sys.exit(1)
+    except Exception as e:
+        print(f"❌ Error loading the YAML data files: {e}")
+        sys.exit(1)
+
+    for problem in problems:
+        print(f"❌ {problem}")
+
+    if problems:
+        counts: Dict[str, int] = {}
+        for problem in problems:
+            counts[problem.kind] = counts.get(problem.kind, 0) + 1
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.items())
+        print(f"\n⚠️  {len(problems)} reference problem(s): {summary}")
+        sys.exit(1)
+
+    print("✅ All references resolve")
+
+
+if __name__ == "__main__":
+    import doctest
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    main()
@@ -0,0 +1,407 @@
+"""
+Stream sheets out of an XLSX workbook export as CSV.
+
+framework-sync.py --workbook downloads the whole spreadsheet once with
+/export?format=xlsx and uses this module to split it locally into the same
+per-sheet CSV files that the per-GID CSV exports produce.
+
+Only the standard library is used: the workbook is read with zipfile and each
+worksheet is parsed with xml.etree.ElementTree.iterparse, one row at a time,
+so a sheet never sits in memory as a whole. Only the shared strings table
+(the workbook's deduplicated cell texts) and the number format of each cell
+style are held in memory, read once per workbook by WorkbookReader.
+
+The CSV output mirrors Google's CSV export: minimal quoting, CRLF line
+endings, no newline after the last row and every row padded to the width
+of the sheet.
+
+Number formats are not applied. A numeric cell is written as its stored
+value, which is what the CSV export shows only while the cell has no number
+format: a date, percentage or currency is exported as it is displayed
+("2024-03-01", "15%"), but stored as a serial number or fraction. A sheet
+with such a cell cannot be split from the workbook: ValueError is raised,
+and framework-sync.py downloads that sheet's CSV export instead.
+"""
+
+import csv
+import io
+import posixpath
+import re
+import zipfile
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Sequence, Union
+from xml.etree.ElementTree import iterparse
+
+MAIN_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+CELL_REFERENCE_RE = re.compile(r"^([A-Z]+)(\d+)$")
+
+# Number formats that show a stored number as it is: General and Text (@)
+PLAIN_NUMBER_FORMATS = {0, 49}
+
+
+def column_index(reference: str) -> int:
+    """
+    Convert a cell reference (or bare column letters) to a 0-based column index.
+
+    Examples:
+        >>> column_index("A1")
+        0
+        >>> column_index("H204")
+        7
+        >>> column_index("AB")
+        27
+    """
+    letters = reference.rstrip("0123456789")
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord("A") + 1)
+    return index - 1
+
+
+def parse_dimension(reference: str) -> Optional[int]:
+    """
+    Return the number of columns described by a worksheet dimension.
+
+    Examples:
+        >>> parse_dimension("A1:H204")
+        8
+        >>> parse_dimension("A1") is None
+        True
+    """
+    if ":" not in reference:
+        return None
+    return column_index(reference.split(":")[1]) + 1
+
+
+def list_worksheets(workbook: zipfile.ZipFile) -> Dict[str, str]:
+    """
+    Map each worksheet name to its part name inside the workbook archive.
+
+    Examples:
+        >>> with zipfile.ZipFile(build_example_workbook()) as workbook:
+        ...     list_worksheets(workbook)
+        {'Assets': 'xl/worksheets/sheet1.xml', 'Coverage': 'xl/worksheets/sheet2.xml'}
+    """
+    targets: Dict[str, str] = {}
+    with workbook.open("xl/_rels/workbook.xml.rels") as rels:
+        for _, element in iterparse(rels):
+            if element.tag == f"{PACKAGE_REL_NS}Relationship":
+                target = element.get("Target", "")
+                if target.startswith("/"):
+                    target = target.lstrip("/")
+                else:
+                    target = posixpath.normpath(posixpath.join("xl", target))
+                targets[element.get("Id", "")] = target
+
+    worksheets: Dict[str, str] = {}
+    with workbook.open("xl/workbook.xml") as workbook_part:
+        for _, element in iterparse(workbook_part):
+            if element.tag == f"{MAIN_NS}sheet":
+                relationship_id = element.get(f"{REL_NS}id", "")
+                if relationship_id in targets:
+                    worksheets[element.get("name", "")] = targets[relationship_id]
+    return worksheets
+
+
+def read_shared_strings(workbook: zipfile.ZipFile) -> List[str]:
+    """
+    Read the shared strings table, joining rich-text runs.
+
+    Examples:
+        >>> with zipfile.ZipFile(build_example_workbook()) as workbook:
+        ...     read_shared_strings(workbook)
+        ['Asset', 'Description', 'Users', 'People with access']
+    """
+    if "xl/sharedStrings.xml" not in workbook.namelist():
+        return []
+
+    strings: List[str] = []
+    with workbook.open("xl/sharedStrings.xml") as part:
+        for _, element in iterparse(part):
+            if element.tag == f"{MAIN_NS}si":
+                # Phonetic runs (rPh) are annotations, not part of the text
+                texts = [
+                    text.text or ""
+                    for child in element
+                    if child.tag != f"{MAIN_NS}rPh"
+                    for text in child.iter(f"{MAIN_NS}t")
+                ]
+                strings.append("".join(texts))
+                element.clear()
+    return strings
+
+
+def read_number_formats(workbook: zipfile.ZipFile) -> List[Optional[str]]:
+    """
+    Return the number format of each cell style, or None where it shows numbers as stored.
+
+    Examples:
+        >>> with zipfile.ZipFile(build_example_workbook()) as workbook:
+        ...     read_number_formats(workbook)
+        [None, '0.0%']
+    """
+    if "xl/styles.xml" not in workbook.namelist():
+        return []
+
+    custom_formats: Dict[int, str] = {}
+    formats: List[Optional[str]] = []
+    in_cell_styles = False
+    with workbook.open("xl/styles.xml") as part:
+        for event, element in iterparse(part, events=("start", "end")):
+            if element.tag == f"{MAIN_NS}cellXfs":
+                in_cell_styles = event == "start"
+            elif event != "end":
+                continue
+            elif element.tag == f"{MAIN_NS}numFmt":
+                custom_formats[int(element.get("numFmtId", "0"))] = element.get("formatCode", "")
+            elif element.tag == f"{MAIN_NS}xf" and in_cell_styles:
+                format_id = int(element.get("numFmtId", "0"))
+                if format_id in PLAIN_NUMBER_FORMATS:
+                    formats.append(None)
+                else:
+                    formats.append(custom_formats.get(format_id, f"built-in format {format_id}"))
+    return formats
+
+
+def cell_value(cell: Any, shared_strings: List[str], number_formats: Sequence[Optional[str]] = ()) -> str:
+    """
+    Return the text of a <c> element as it would appear in a CSV export.
+
+    Raises:
+        ValueError: If the cell is a number shown with a number format, or a
+            date, whose CSV text would differ from its stored value
+    """
+    cell_type = cell.get("t", "n")
+    if cell_type == "inlineStr":
+        return "".join(text.text or "" for text in cell.iter(f"{MAIN_NS}t"))
+
+    value_element = cell.find(f"{MAIN_NS}v")
+    value = value_element.text if value_element is not None and value_element.text else ""
+    if cell_type == "s":
+        return shared_strings[int(value)] if value else ""
+    if cell_type == "b":
+        return "TRUE" if value == "1" else "FALSE"
+    if value and cell_type in ("n", "d"):
+        style = int(cell.get("s", "0"))
+        number_format = number_formats[style] if style < len(number_formats) else None
+        if cell_type == "d" or number_format is not None:
+            raise ValueError(
+                f"cell {cell.get('r', '?')} is shown with number format "
+                f"'{number_format or 'date'}', which is not applied"
+            )
+    return value
+
+
+def iter_sheet_rows(
+    workbook: zipfile.ZipFile,
+    part_name: str,
+    shared_strings: List[str],
+    number_formats: Sequence[Optional[str]] = (),
+) -> Iterator[List[str]]:
+    """
+    Yield the rows of a worksheet, padded to the width of the sheet.
+
+    Rows missing from the worksheet (empty rows) are yielded as empty rows so
+    the CSV keeps the same row positions as the spreadsheet.
+
+    Raises:
+        ValueError: At the first cell shown with a number format (see cell_value)
+
+    Examples:
+        >>> with zipfile.ZipFile(build_example_workbook()) as workbook:
+        ...     strings = read_shared_strings(workbook)
+        ...     formats = read_number_formats(workbook)
+        ...     list(iter_sheet_rows(workbook, "xl/worksheets/sheet1.xml", strings, formats))
+        [['Asset', 'Description', 'Tags'], ['', '', ''], ['Users', 'People with access', '3']]
+        >>> with zipfile.ZipFile(build_example_workbook()) as workbook:
+        ...     list(iter_sheet_rows(workbook, "xl/worksheets/sheet2.xml", [], read_number_formats(workbook)))
+        Traceback (most recent call last):
+        ...
+        ValueError: cell A1 is shown with number format '0.0%', which is not applied
+    """
+    width: Optional[int] = None
+    next_row_number = 1
+
+    with workbook.open(part_name) as part:
+        for _, element in iterparse(part):
+            if element.tag == f"{MAIN_NS}dimension":
+                width = parse_dimension(element.get("ref", ""))
+            elif element.tag == f"{MAIN_NS}row":
+                row_number = int(element.get("r", next_row_number))
+                values: Dict[int, str] = {}
+                position = 0
+                for cell in element.iter(f"{MAIN_NS}c"):
+                    reference = cell.get("r")
+                    if reference and CELL_REFERENCE_RE.match(reference):
+                        position = column_index(reference)
+                    values[position] = cell_value(cell, shared_strings, number_formats)
+                    position += 1
+                element.clear()
+
+                if width is None:
+                    width = max(values) + 1 if values else 0
+                row_width = max(width, max(values) + 1 if values else 0)
+
+                # Emit the empty rows Google's CSV export keeps between data rows
+                for _ in range(next_row_number, row_number):
+                    yield [""] * width
+                yield [values.get(index, "") for index in range(row_width)]
+                next_row_number = row_number + 1
+
+
+def write_csv_rows(rows: Iterator[List[str]], output: BinaryIO) -> None:
+    """
+    Write rows as UTF-8 CSV in the format of Google's CSV export.
+
+    Examples:
+        >>> buffer = io.BytesIO()
+        >>> write_csv_rows(iter([["ID", "Name"], ["A", "Line 1\\nLine 2"]]), buffer)
+        >>> buffer.getvalue()
+        b'ID,Name\\r\\nA,"Line 1\\nLine 2"'
+    """
+    # The terminator also decides which characters force quoting, so keep it
+    # and drop it from each line: the last row must not end with a newline
+    line = io.StringIO()
+    writer = csv.writer(line, lineterminator="\r\n")
+    separator = b""
+    for row in rows:
+        line.seek(0)
+        line.truncate()
+        writer.writerow(row)
+        output.write(separator + line.getvalue()[:-2].encode("utf-8"))
+        separator = b"\r\n"
+
+
+def build_example_workbook() -> io.BytesIO:
+    """Build a minimal in-memory workbook used by the doctests."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as workbook:
+        workbook.writestr(
+            "xl/workbook.xml",
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Assets" sheetId="1" r:id="rId1"/>'
+            '<sheet name="Coverage" sheetId="2" r:id="rId2"/></sheets></workbook>',
+        )
+        workbook.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="worksheet" Target="worksheets/sheet1.xml"/>'
+            '<Relationship Id="rId2" Type="worksheet" Target="worksheets/sheet2.xml"/>'
+            "</Relationships>",
+        )
+        workbook.writestr(
+            "xl/styles.xml",
+            '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<numFmts count="1"><numFmt numFmtId="164" formatCode="0.0%"/></numFmts>'
+            '<cellStyleXfs count="1"><xf numFmtId="0"/></cellStyleXfs>'
+            '<cellXfs count="2"><xf numFmtId="0"/><xf numFmtId="164"/></cellXfs></styleSheet>',
+        )
+        workbook.writestr(
+            "xl/sharedStrings.xml",
+            '<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            "<si><t>Asset</t></si><si><t>Description</t></si><si><t>Users</t></si>"
+            "<si><r><t>People </t></r><r><t>with access</t></r></si></sst>",
+        )
+        workbook.writestr(
+            "xl/worksheets/sheet1.xml",
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<dimension ref="A1:C3"/><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="B1" t="s"><v>1</v></c>'
+            '<c r="C1" t="inlineStr"><is><t>Tags</t></is></c></row>'
+            '<row r="3"><c r="A3" t="s"><v>2</v></c><c r="B3" t="s"><v>3</v></c>'
+            '<c r="C3" s="0"><v>3</v></c></row>'
+            "</sheetData></worksheet>",
+        )
+        workbook.writestr(
+            "xl/worksheets/sheet2.xml",
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetData><row r="1"><c r="A1" s="1"><v>0.25</v></c></row></sheetData></worksheet>',
+        )
+    buffer.seek(0)
+    return buffer
+
+
+class WorkbookReader:
+    """
+    Write worksheets of one workbook file as CSV.
+
+    The archive is opened on first use, and the worksheet list, shared
+    strings and number formats are read once for all the sheets split
+    from it.
+
+    Examples:
+        >>> with WorkbookReader(build_example_workbook()) as reader:
+        ...     output = io.BytesIO()
+        ...     reader.write_sheet("Assets", output), reader.write_sheet("Missing", io.BytesIO())
+        (True, False)
+        >>> output.getvalue()
+        b'Asset,Description,Tags\\r\\n,,\\r\\nUsers,People with access,3'
+    """
+
+    def __init__(self, workbook_file: Union[Path, BinaryIO]) -> None:
+        self.workbook_file = workbook_file
+        self.archive: Optional[zipfile.ZipFile] = None
+        self.worksheets: Dict[str, str] = {}
+        self.shared_strings: Optional[List[str]] = None
+        self.number_formats: List[Optional[str]] = []
+
+    def __enter__(self) -> "WorkbookReader":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.archive is not None:
+            self.archive.close()
+            self.archive = None
+
+    def _open(self) -> zipfile.ZipFile:
+        if self.archive is None:
+            archive = zipfile.ZipFile(self.workbook_file)
+            try:
+                self.worksheets = list_worksheets(archive)
+                self.number_formats = read_number_formats(archive)
+            except BaseException:
+                archive.close()
+                raise
+            self.archive = archive
+        return self.archive
+
+    def write_sheet(self, sheet_name: str, output: BinaryIO) -> bool:
+        """
+        Write one worksheet as CSV.
+
+        Returns:
+            True if the worksheet exists, False otherwise
+
+        Raises:
+            ValueError: If a cell of the sheet is shown with a number format;
+                what was written before it is incomplete
+        """
+        archive = self._open()
+        if sheet_name not in self.worksheets:
+            return False
+        if self.shared_strings is None:
+            self.shared_strings = read_shared_strings(archive)
+        rows = iter_sheet_rows(archive, self.worksheets[sheet_name], self.shared_strings, self.number_formats)
+        write_csv_rows(rows, output)
+        return True
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by framework-sync.py --workbook.")
+    print("Run it with --doctests to verify functionality.")
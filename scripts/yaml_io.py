@@ -0,0 +1,149 @@
+"""
+YAML loading and dumping shared by the data scripts.
+
+csv2yaml.py and the page generators read and write their YAML data through
+this module. It uses libyaml's CSafeLoader/CSafeDumper when PyYAML was built
+with libyaml, and the pure-Python SafeLoader/SafeDumper otherwise.
+
+libyaml's emitter folds and escapes some scalars differently from PyYAML's
+(multi-line strings, strings with non-printable or non-BMP characters, empty
+or very long mapping keys). Documents holding such strings are dumped with
+the pure-Python dumper, so the output is byte-identical on both paths.
+
+Run ./scripts/benchmark-yaml.py to measure the speed-up on this machine.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, List, Optional, TextIO
+
+import yaml
+
+# True when PyYAML was built with libyaml
+LIBYAML = bool(getattr(yaml, "__with_libyaml__", False)) and hasattr(yaml, "CSafeLoader")
+
+# Layout of the generated YAML files
+DUMP_OPTIONS = {
+    "default_flow_style": False,
+    "allow_unicode": True,
+    "sort_keys": False,
+    "indent": 2,
+}
+
+# Characters both emitters write as-is, the same way: printable ASCII and the
+# printable Basic Multilingual Plane, without the byte order mark
+UNSAFE_CHARACTER_RE = re.compile("[^\x20-\x7e\xa0-\ud7ff\ue000-\ufefe\uff00-\ufffd]")
+
+# Keys this long (in UTF-8 bytes) are emitted as complex keys by PyYAML only
+MAX_SIMPLE_KEY_LENGTH = 128
+
+
+def get_loader(pure: bool = False) -> type:
+    """
+    Return the safe loader class to use.
+
+    Examples:
+        >>> get_loader(pure=True) is yaml.SafeLoader
+        True
+        >>> get_loader() is (yaml.CSafeLoader if LIBYAML else yaml.SafeLoader)
+        True
+    """
+    return yaml.CSafeLoader if LIBYAML and not pure else yaml.SafeLoader
+
+
+def get_dumper(pure: bool = False) -> type:
+    """
+    Return the safe dumper class to use.
+
+    Examples:
+        >>> get_dumper(pure=True) is yaml.SafeDumper
+        True
+    """
+    return yaml.CSafeDumper if LIBYAML and not pure else yaml.SafeDumper
+
+
+def load_yaml(stream: Any, pure: bool = False) -> Any:
+    """
+    Parse a YAML document from a string or stream, like yaml.safe_load.
+
+    Examples:
+        >>> load_yaml("controls:\\n- id: C1\\n  name: RBAC\\n")
+        {'controls': [{'id': 'C1', 'name': 'RBAC'}]}
+        >>> load_yaml("a: [1, 2]", pure=True)
+        {'a': [1, 2]}
+    """
+    return yaml.load(stream, Loader=get_loader(pure))
+
+
+def load_yaml_file(path: Path, pure: bool = False) -> Any:
+    """Parse the YAML document of a UTF-8 file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return load_yaml(f, pure)
+
+
+def emits_identically(data: Any) -> bool:
+    """
+    True if libyaml dumps data byte-for-byte like the pure-Python dumper.
+
+    Examples:
+        >>> emits_identically({"assets": [{"name": "Users", "tags": ["iam"], "count": 3}]})
+        True
+        >>> emits_identically({"notes": "line 1\\nline 2"})
+        False
+        >>> emits_identically({"name": "organization\\u00e2\\u0080\\u0099s"})
+        False
+        >>> emits_identically({"": 1})
+        False
+    """
+    pending: List[Any] = [data]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, str):
+            if UNSAFE_CHARACTER_RE.search(value):
+                return False
+        elif isinstance(value, dict):
+            for key in value:
+                if isinstance(key, str) and (
+                    not key or len(key.encode("utf-8")) >= MAX_SIMPLE_KEY_LENGTH
+                ):
+                    return False
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+    return True
+
+
+def dump_yaml(data: Any, stream: Optional[TextIO] = None, pure: bool = False) -> Optional[str]:
+    """
+    Dump data in the layout of the generated YAML files.
+
+    Returns:
+        The YAML text if no stream is given, None otherwise
+
+    Examples:
+        >>> print(dump_yaml({"meta": {"title": "Assets", "count": 2}}), end="")
+        meta:
+          title: Assets
+          count: 2
+        >>> data = {"notes": "line 1\\nline 2", "tag": "\\u00e9t\\u00e9"}
+        >>> dump_yaml(data) == dump_yaml(data, pure=True)
+        True
+    """
+    dumper = get_dumper(pure or not emits_identically(data))
+    return yaml.dump(data, stream, Dumper=dumper, **DUMP_OPTIONS)
+
+
+if __name__ == "__main__":
+    import doctest
+    import sys
+
+    # Run doctests if --doctests flag is provided
+    if "--doctests" in sys.argv:
+        print("Running doctests...")
+        doctest.testmod(verbose=True)
+        sys.exit(0)
+
+    print("This module is used by csv2yaml.py and the page generators.")
+    print(f"libyaml available: {'yes' if LIBYAML else 'no'}")
+    print("Run it with --doctests to verify functionality.")